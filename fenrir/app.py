@@ -1,11 +1,21 @@
 # import the pygame module, so you can use it
 import os
+import time
 
 import pygame
 from fenrir.common.config import *
 from fenrir.game.menu.menu_scene import MainMenuScene
 from fenrir.common.global_game_state import GameState
-from fenrir.data.db_connection import initialize_db
+from fenrir.data.db_connection import initialize_db, close_db
+from fenrir.data.save_writer import save_writer
+from fenrir.common.frame_profiler import FrameProfiler
+
+
+def block_scene_events(scene):
+    """Keeps the event types the scene doesn't use out of the event queue"""
+    pygame.event.set_allowed(None)
+    if scene is not None and scene.blocked_events:
+        pygame.event.set_blocked(scene.blocked_events)
 
 
 def run():
@@ -21,9 +31,39 @@ def run():
     pygame.display.set_caption(GAME_TITLE)
 
     current_scene = MainMenuScene(screen, GameState())
+    block_scene_events(current_scene)
+    # a scene is always drawn once before it can go idle
+    scene_drawn = False
+
+    # frame times are only recorded when asked for, see FRAME_PROFILE_PATH in config
+    profiler = FrameProfiler(DisplaySettings.FPS.value or GameConstants.UPDATE_RATE.value) \
+        if FRAME_PROFILE_PATH else None
+
+    # game logic runs in fixed steps, frames are drawn as often as FPS allows and show the game between two steps
+    update_step = 1 / GameConstants.UPDATE_RATE.value
+    # time the game logic is behind, a new scene is always updated once before it is drawn
+    lag = update_step
+    last_time = time.perf_counter()
 
     # main loop
     while current_scene is not None:
+        # idle scenes look the same until something happens, sleep until the next event instead of drawing
+        if current_scene.idle and scene_drawn and not pygame.event.peek():
+            sleep_start = time.perf_counter()
+            event = pygame.event.wait(current_scene.idle_timeout)
+            if event.type != pygame.NOEVENT:
+                pygame.event.post(event)
+            # time spent sleeping is not game time and not frame time
+            last_time = time.perf_counter()
+            if profiler:
+                profiler.add_idle_time(last_time - sleep_start)
+
+        if profiler:
+            profiler.begin_frame(current_scene)
+
+        now = time.perf_counter()
+        lag += now - last_time
+        last_time = now
 
         # event handling
         for event in pygame.event.get():
@@ -31,13 +71,55 @@ def run():
             #  if the event is of type QUIT terminate game
             if event.type == pygame.QUIT:
                 current_scene.terminate()
-            else:
+            elif not (profiler and profiler.handle_event(event)):
                 current_scene.handle_event(event)
 
-        current_scene.update()
+        if profiler:
+            profiler.mark("events")
+
+        updates = 0
+        while lag >= update_step:
+            current_scene.update()
+            lag -= update_step
+            updates += 1
+            if current_scene.next is not current_scene:
+                break
+            if updates == GameConstants.MAX_UPDATES_PER_FRAME.value:
+                # too far behind to catch up, drop the missed steps
+                lag %= update_step
+                break
+
+        if profiler:
+            profiler.mark("update")
+        current_scene.interpolation = lag / update_step
         current_scene.render()
+        if profiler:
+            profiler.mark("render")
 
+        # scenes that track what they drew only push those areas to the display
+        dirty_rects = current_scene.dirty_rects
+        overlay_rect = profiler.draw_overlay(screen) if profiler else None
+        scene_drawn = True
+        if current_scene.next is not current_scene:
+            # the time spent building the new scene is not game time
+            lag = update_step
+            last_time = time.perf_counter()
+            scene_drawn = False
+            block_scene_events(current_scene.next)
         current_scene = current_scene.next
 
-        pygame.display.flip()
+        if dirty_rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty_rects + [overlay_rect] if overlay_rect else dirty_rects)
+        if profiler:
+            profiler.restore_screen(screen)
+            profiler.mark("display")
         clock.tick(DisplaySettings.FPS.value)
+
+    if profiler:
+        profiler.dump(FRAME_PROFILE_PATH)
+
+    # queued saves are written before the connection is closed
+    save_writer.close()
+    close_db()
@@ -1,6 +1,4 @@
-import pygame
-import os
-from fenrir.common.config import *
+from fenrir.common.asset_manager import assets
 
 
 class TextBox:
@@ -11,47 +9,44 @@ class TextBox:
         # Default TextBox values
         self.text_box = " "
 
+        # when set to a list every rect drawn to the screen is added to it, used for dirty rect rendering
+        self.drawn_rects = None
+
     # Load and scale Text box for dialogue
     def load_image(self, x_pos, y_pos, x_scale, y_scale, image):
 
-        # Load text box png
-        if image.count('/') == 0:
-            self.text_box = pygame.image.load(os.path.join(PATH_TO_RESOURCES, image))
-        elif image.count('/') == 1:
-            path = image.split('/')
-            self.text_box = pygame.image.load(os.path.join(PATH_TO_RESOURCES, path[0], path[1]))
-        elif image.count('/') == 2:
-            path = image.split('/')
-            self.text_box = pygame.image.load(os.path.join(PATH_TO_RESOURCES, path[0], path[1], path[2]))
+        # Load text box png from the asset cache, original size is used for positioning
+        width, height = assets.get_image_size(image)
 
         # Default Text box position on window
-        if x_pos > self.text_box.get_width() and y_pos > self.text_box.get_height():
-            textbox_x_pos = x_pos - self.text_box.get_width()
-            textbox_y_pos = self.text_box.get_height() + y_pos
+        if x_pos > width and y_pos > height:
+            textbox_x_pos = x_pos - width
+            textbox_y_pos = height + y_pos
         else:
             textbox_x_pos = x_pos
             textbox_y_pos = y_pos
 
         # Scale image to a proper size
         if x_scale > 0 and y_scale > 0:
-            self.text_box = pygame.transform.scale(self.text_box, (x_scale, y_scale))
+            self.text_box = assets.get_image(image, (x_scale, y_scale))
+        else:
+            self.text_box = assets.get_image(image)
 
         # Display on window
-        self.screen.blit(self.text_box, (textbox_x_pos, textbox_y_pos))
+        self._track(self.screen.blit(self.text_box, (textbox_x_pos, textbox_y_pos)))
 
     # Draw text
     def draw_dialogue(self, text, size, x, y):
         # The current text box can take 72 characters per line
         chars_per_line = 52
         lines = [text[i:i + chars_per_line] for i in range(0, len(text), chars_per_line)]
-        font = pygame.font.Font(os.path.join(PATH_TO_RESOURCES, "fonts/Peepo.ttf"), size)
 
         # line_height is used to make sure the next line of text goes below the one before it
         line_height = 0
 
         for line in lines:
-            dialogue = font.render(line, True, (0, 0, 0))
-            self.screen.blit(dialogue, (x, y - line_height))
+            dialogue = assets.get_text(line, "fonts/Peepo.ttf", size, (0, 0, 0))
+            self._track(self.screen.blit(dialogue, (x, y - line_height)))
             # Next line of text will be below the line before it
             line_height = line_height - 25
 
@@ -73,3 +68,7 @@ class TextBox:
     def draw_level(self, text, level, size, x, y):
 
         self.draw_dialogue(text + " " + str(level), size, x, y)
+
+    def _track(self, rect):
+        if self.drawn_rects is not None:
+            self.drawn_rects.append(rect)
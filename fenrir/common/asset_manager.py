@@ -0,0 +1,284 @@
+"""
+.. module:: asset_manager
+    :synopsis: process wide cache for images, fonts, sounds and rendered text so scenes do not reload assets from
+               disk or rasterize the same text every frame.
+"""
+
+import os
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import pygame
+from fenrir.common.config import PATH_TO_RESOURCES
+
+# default memory budget for cached image surfaces (bytes)
+DEFAULT_IMAGE_BUDGET = 64 * 1024 * 1024
+# default max number of rendered text surfaces kept in the cache
+DEFAULT_TEXT_CACHE_SIZE = 512
+
+
+class AssetManager:
+    """Class that loads and caches every image, font and sound used by the game. Images are keyed on
+        path + scale + flip + colorkey and are returned already converted to the display format. Images are kept
+        in least recently used order and evicted once the memory budget is exceeded. Fonts and sounds are small
+        and never evicted. Rendered text is keyed on string + font + size + color and the least recently used
+        surfaces are dropped once more than text_cache_size are held.
+
+        Images that will be needed soon can be prefetched, they are decoded and scaled on a worker thread and only
+        converted to the display format once they are requested from the main thread.
+
+        Surfaces returned by the cache are shared, copy them before drawing on them.
+
+        :param image_budget: (int) max number of bytes held by cached image surfaces
+        :param text_cache_size: (int) max number of rendered text surfaces held
+    """
+
+    def __init__(self, image_budget=DEFAULT_IMAGE_BUDGET, text_cache_size=DEFAULT_TEXT_CACHE_SIZE):
+        self._image_budget = image_budget
+        self._image_bytes = 0
+        self._images = OrderedDict()
+        self._text_cache_size = text_cache_size
+        self._texts = OrderedDict()
+        self._fonts = {}
+        self._sounds = {}
+        # image key -> future of a prefetched surface that is not converted yet
+        self._pending = {}
+        self._loader = None
+
+        # counters used for profiling the cache
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def image_budget(self):
+        return self._image_budget
+
+    @image_budget.setter
+    def image_budget(self, budget):
+        self._image_budget = budget
+        self._evict()
+
+    @property
+    def image_bytes(self):
+        return self._image_bytes
+
+    @property
+    def text_cache_size(self):
+        return self._text_cache_size
+
+    @text_cache_size.setter
+    def text_cache_size(self, size):
+        self._text_cache_size = size
+        self._evict_text()
+
+    @staticmethod
+    def resource_path(path):
+        """Turns a resource path like "UI/generic-rpg-ui-text-box.png" into an absolute path inside the
+            resources folder. Absolute paths are returned as is.
+        """
+        if os.path.isabs(path):
+            return path
+        return os.path.join(PATH_TO_RESOURCES, *path.split('/'))
+
+    def get_image(self, path, scale=None, flip_x=False, flip_y=False, colorkey=None, cache=True):
+        """Returns the converted surface for the image, loading and transforming it on the first request.
+
+        :param path: (string) path of the image, relative to the resources folder or absolute
+        :param scale: (tuple) optional (width, height) to scale the image to
+        :param flip_x: (boolean) flip the image horizontally
+        :param flip_y: (boolean) flip the image vertically
+        :param colorkey: (tuple) optional RGB color to treat as transparent
+        :param cache: (boolean) False returns a surface that is not kept in the cache, for callers that keep the
+                      image themselves. It still uses a prefetched image and the caller may change it.
+        """
+        path = self.resource_path(path)
+        scale = tuple(scale) if scale else None
+        key = (path, scale, flip_x, flip_y, colorkey)
+
+        image = self._images.get(key)
+        if image is not None:
+            self.hits += 1
+            self._images.move_to_end(key)
+            # the cached surface is shared, a caller that changes its image gets its own
+            return image if cache else image.copy()
+
+        self.misses += 1
+        future = self._pending.pop(key, None)
+        if future is not None:
+            # waits for the worker if the prefetch is still running
+            image = self._convert(future.result())
+        elif scale or flip_x or flip_y or colorkey:
+            # build variants from the cached original so the file is only decoded once
+            image = self._original(path, cache)
+            if scale:
+                image = pygame.transform.scale(image, scale)
+            if flip_x or flip_y:
+                image = pygame.transform.flip(image, flip_x, flip_y)
+            if colorkey:
+                image = image.copy()
+                image.set_colorkey(colorkey)
+        else:
+            image = self._convert(pygame.image.load(path))
+
+        if cache:
+            self._store(key, image)
+        return image
+
+    def _original(self, path, cache):
+        # original of a variant, the lookup is part of the variant's and not counted in the stats
+        key = (path, None, False, False, None)
+        image = self._images.get(key)
+        if image is not None:
+            self._images.move_to_end(key)
+            return image
+
+        future = self._pending.pop(key, None)
+        image = self._convert(future.result() if future is not None else pygame.image.load(path))
+        if cache:
+            self._store(key, image)
+        return image
+
+    def prefetch_image(self, path, scale=None):
+        """Starts loading the image on a background thread so a later get_image call with the same arguments
+            doesn't have to wait for the disk. Returns the future of the load, which is done once get_image can
+            return without waiting, or None if the image is already cached.
+
+        :param path: (string) path of the image, relative to the resources folder or absolute
+        :param scale: (tuple) optional (width, height) to scale the image to
+        """
+        path = self.resource_path(path)
+        scale = tuple(scale) if scale else None
+        key = (path, scale, False, False, None)
+        if key in self._images:
+            return None
+        if key in self._pending:
+            return self._pending[key]
+
+        if self._loader is None:
+            self._loader = ThreadPoolExecutor(max_workers=1, thread_name_prefix="asset-loader")
+        self._pending[key] = self._loader.submit(self._load_image, path, scale)
+        return self._pending[key]
+
+    def get_image_size(self, path):
+        """Returns the (width, height) of the original image"""
+        return self.get_image(path).get_size()
+
+    def get_font(self, path, size):
+        """Returns a cached font. Pass None as the path to use the pygame default font.
+
+        :param path: (string) path of the .ttf file relative to the resources folder, or None
+        :param size: (int) font size
+        """
+        key = (path, size)
+        font = self._fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            return font
+
+        self.misses += 1
+        font = pygame.font.Font(self.resource_path(path) if path else None, size)
+        self._fonts[key] = font
+        return font
+
+    def get_text(self, text, font_path, size, color, antialias=True):
+        """Returns a surface with the text rendered on it, only rasterizing the glyphs the first time a string is
+            drawn with that font, size and color.
+
+        :param text: (string) text to render
+        :param font_path: (string) path of the .ttf file relative to the resources folder, or None for the default
+        :param size: (int) font size
+        :param color: (tuple) RGB color of the text
+        :param antialias: (boolean) render with smooth edges
+        """
+        color = tuple(color)
+        key = (text, font_path, size, color, antialias)
+
+        surface = self._texts.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._texts.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.get_font(font_path, size).render(text, antialias, color)
+        self._texts[key] = surface
+        self._evict_text()
+        return surface
+
+    def get_sound(self, path):
+        """Returns a cached sound object.
+
+        :param path: (string) path of the sound file relative to the resources folder or absolute
+        """
+        path = self.resource_path(path)
+        sound = self._sounds.get(path)
+        if sound is not None:
+            self.hits += 1
+            return sound
+
+        self.misses += 1
+        sound = pygame.mixer.Sound(path)
+        self._sounds[path] = sound
+        return sound
+
+    def stats(self):
+        """Returns a dict with the cache counters, useful for debugging and profiling"""
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "images": len(self._images), "image_bytes": self._image_bytes, "texts": len(self._texts),
+                "pending": len(self._pending),
+                "fonts": len(self._fonts), "sounds": len(self._sounds)}
+
+    def clear(self):
+        """Drops every cached asset and resets the counters"""
+        self._images.clear()
+        self._pending.clear()
+        self._texts.clear()
+        self._fonts.clear()
+        self._sounds.clear()
+        self._image_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    ###############################################
+    #          Helper functions for cache         #
+    ###############################################
+    @staticmethod
+    def _convert(image):
+        # surfaces can only be converted once a display mode is set
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            return image.convert_alpha()
+        return image
+
+    @staticmethod
+    def _load_image(path, scale):
+        # runs on the loader thread, converting is left to the main thread
+        image = pygame.image.load(path)
+        if scale:
+            image = pygame.transform.scale(image, scale)
+        return image
+
+    @staticmethod
+    def _surface_bytes(image):
+        return image.get_width() * image.get_height() * image.get_bytesize()
+
+    def _store(self, key, image):
+        self._images[key] = image
+        self._image_bytes += self._surface_bytes(image)
+        self._evict()
+
+    def _evict(self):
+        # always keep the most recently used image even if it is bigger than the budget
+        while self._image_bytes > self._image_budget and len(self._images) > 1:
+            _, image = self._images.popitem(last=False)
+            self._image_bytes -= self._surface_bytes(image)
+            self.evictions += 1
+
+    def _evict_text(self):
+        while len(self._texts) > max(self._text_cache_size, 1):
+            self._texts.popitem(last=False)
+            self.evictions += 1
+
+
+# shared instance used by every scene
+assets = AssetManager()
@@ -24,6 +24,10 @@ abs_path = find_abs_file_path()
 PATH_TO_RESOURCES = os.path.join(abs_path, "fenrir", "resources")
 PATH_TO_DATABASE = os.path.join(abs_path, "db", "fenrir.db")
 
+# set FENRIR_PROFILE to a .csv or .json file to record frame times, they are written there when the game closes.
+# Press F3 in game to show them
+FRAME_PROFILE_PATH = os.environ.get("FENRIR_PROFILE")
+
 
 # screen resolution for game to be displayed, set in app.py
 class DisplaySettings(Enum):
@@ -34,7 +38,8 @@ class DisplaySettings(Enum):
     """
 
     SCREEN_RESOLUTION = (960, 540)
-    FPS = 30
+    # max frames drawn per second, 0 draws as fast as possible. Game speed does not depend on it, see UPDATE_RATE
+    FPS = 60
     CENTER_WIDTH = SCREEN_RESOLUTION[0] / 2  # center x value of screen
     CENTER_HEIGHT = SCREEN_RESOLUTION[1] / 2  # center y value of screen
 
@@ -63,3 +68,7 @@ class GameConstants(Enum):
 
     # the current max level any player can reach in the game
     MAX_LEVEL = 6
+    # game logic updates per second, scenes are updated in fixed steps of 1 / UPDATE_RATE seconds
+    UPDATE_RATE = 30
+    # most updates run to catch up after a slow frame, the game slows down instead of freezing past this
+    MAX_UPDATES_PER_FRAME = 5
@@ -0,0 +1,232 @@
+"""
+.. module:: frame_profiler
+    :synopsis: opt in timing of every phase of the main loop, kept per scene in a fixed size ring buffer, with an
+               on screen overlay of the percentiles and a csv/json dump when the game closes.
+"""
+
+import csv
+import json
+import time
+from array import array
+from collections import Counter
+import pygame
+from fenrir.common.asset_manager import assets
+
+# phases of a frame in the order the main loop runs them
+PHASES = ("events", "update", "render", "display")
+# number of frames kept, older frames are overwritten
+DEFAULT_CAPACITY = 4096
+# a frame that takes this many times the frame budget is counted as dropped
+DROPPED_FRAME_FACTOR = 1.5
+PERCENTILES = (50, 95, 99)
+
+OVERLAY_KEY = pygame.K_F3
+OVERLAY_FONT_SIZE = 18
+OVERLAY_POSITION = (4, 4)
+OVERLAY_COLOR = (255, 255, 0)
+OVERLAY_BACKGROUND = (0, 0, 0, 190)
+# seconds between updates of the overlay text, rendering it every frame would show up in the numbers
+OVERLAY_REFRESH = 0.5
+
+
+def percentile(sorted_values, percent):
+    """Returns the nearest rank percentile of an already sorted list, 0 for an empty list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+class FrameProfiler:
+    """Class that records how long each phase of the main loop takes. The loop calls begin_frame with the current
+        scene and mark after each phase, a frame ends when the next one begins. Times are stored in preallocated
+        arrays used as a ring buffer so recording never allocates, only the last capacity frames are kept.
+
+        The frame time is the time from the start of one frame to the start of the next, so it includes waiting on
+        the clock but not the time idle scenes sleep waiting for an event. Frames that take longer than
+        DROPPED_FRAME_FACTOR times the budget of the target fps are counted as dropped, those counts are kept for the
+        whole run and not only for the frames in the buffer.
+
+        :param fps: (int) target frames per second of the main loop
+        :param capacity: (int) number of frames kept
+    """
+
+    def __init__(self, fps, capacity=DEFAULT_CAPACITY):
+        self._budget = 1.0 / fps
+        self._capacity = capacity
+        self._scenes = [None] * capacity
+        self._frame_numbers = array('q', [0]) * capacity
+        self._frame_times = array('d', [0.0]) * capacity
+        self._phase_times = {phase: array('d', [0.0]) * capacity for phase in PHASES}
+
+        # total frames seen and index of the frame being recorded
+        self._frames = 0
+        self._index = -1
+        self._frame_start = None
+        self._mark_time = None
+        self._idle_time = 0.0
+        self.dropped = Counter()
+
+        self._show_overlay = False
+        self._overlay = None
+        self._overlay_time = 0.0
+        self._under_overlay = None
+        self._overlay_rect = None
+
+    @property
+    def frames(self):
+        return self._frames
+
+    @property
+    def show_overlay(self):
+        return self._show_overlay
+
+    @show_overlay.setter
+    def show_overlay(self, show):
+        self._show_overlay = show
+        self._overlay = None
+
+    ###############################################
+    #                  Recording                  #
+    ###############################################
+    def begin_frame(self, scene):
+        now = time.perf_counter()
+        # the frame that just ended is complete once the next one starts
+        if self._frame_start is not None:
+            frame_time = now - self._frame_start - self._idle_time
+            self._frame_times[self._index] = frame_time
+            if frame_time > self._budget * DROPPED_FRAME_FACTOR:
+                self.dropped[self._scenes[self._index]] += 1
+
+        self._index = (self._index + 1) % self._capacity
+        self._scenes[self._index] = type(scene).__name__
+        self._frame_numbers[self._index] = self._frames
+        self._frame_times[self._index] = 0.0
+        self._frames += 1
+        self._frame_start = self._mark_time = now
+        self._idle_time = 0.0
+
+    def add_idle_time(self, seconds):
+        """Time the loop slept waiting for events since the frame began, it is left out of the frame time"""
+        self._idle_time += seconds
+
+    def mark(self, phase):
+        """Stores the time since the last mark (or the start of the frame) as the duration of the phase"""
+        now = time.perf_counter()
+        self._phase_times[phase][self._index] = now - self._mark_time
+        self._mark_time = now
+
+    def recorded_frames(self):
+        """Returns the indexes of the finished frames in the buffer from oldest to newest"""
+        count = min(self._frames, self._capacity)
+        start = self._index - count + 1
+        # the newest frame is still running until the next begin_frame
+        return [(start + offset) % self._capacity for offset in range(count - 1)]
+
+    def summary(self, scene=None):
+        """Returns {phase: {percentile: seconds}} over the frames in the buffer, phases are the main loop phases and
+        "frame" for the whole frame. Only frames of the scene class name are used when one is given.
+        """
+        indexes = [index for index in self.recorded_frames() if scene is None or self._scenes[index] == scene]
+        columns = dict(self._phase_times, frame=self._frame_times)
+        summary = {}
+        for phase, times in columns.items():
+            values = sorted(times[index] for index in indexes)
+            summary[phase] = {p: percentile(values, p) for p in PERCENTILES}
+        return summary
+
+    ###############################################
+    #                   Overlay                   #
+    ###############################################
+    def handle_event(self, event):
+        """Toggles the overlay with the overlay key. Returns True if the event was used"""
+        if event.type == pygame.KEYDOWN and event.key == OVERLAY_KEY:
+            self.show_overlay = not self._show_overlay
+            return True
+        return False
+
+    def draw_overlay(self, screen):
+        """Draws the overlay on the screen and returns the rect it covers, None if the overlay is hidden. The pixels
+        under the overlay are kept so restore_screen can put them back once the display was updated, scenes that
+        only redraw what changed never see the overlay on their screen. The frame after the overlay was hidden
+        gets its old rect back so the scene below is put on the display again.
+        """
+        if not self._show_overlay:
+            rect, self._overlay_rect = self._overlay_rect, None
+            return rect
+
+        now = time.perf_counter()
+        if self._overlay is None or now - self._overlay_time >= OVERLAY_REFRESH:
+            self._overlay = self._render_overlay(self._scenes[self._index])
+            self._overlay_time = now
+
+        rect = self._overlay.get_rect(topleft=OVERLAY_POSITION).clip(screen.get_rect())
+        self._under_overlay = (screen.subsurface(rect).copy(), rect)
+        screen.blit(self._overlay, rect)
+        self._overlay_rect = rect
+        return rect
+
+    def restore_screen(self, screen):
+        if self._under_overlay is not None:
+            surface, rect = self._under_overlay
+            screen.blit(surface, rect)
+            self._under_overlay = None
+
+    def _render_overlay(self, scene):
+        summary = self.summary(scene)
+        lines = ["{}  dropped {} (all scenes {})".format(scene, self.dropped[scene], sum(self.dropped.values())),
+                 "{:8} {:>7} {:>7} {:>7}".format("ms", *("p{}".format(p) for p in PERCENTILES))]
+        for phase in PHASES + ("frame",):
+            lines.append("{:8} {:7.2f} {:7.2f} {:7.2f}".format(phase, *(summary[phase][p] * 1000 for p in PERCENTILES)))
+
+        font = assets.get_font(None, OVERLAY_FONT_SIZE)
+        rendered = [font.render(line, True, OVERLAY_COLOR) for line in lines]
+        width = max(line.get_width() for line in rendered) + 8
+        height = sum(line.get_height() for line in rendered) + 8
+        overlay = pygame.Surface((width, height), pygame.SRCALPHA)
+        overlay.fill(OVERLAY_BACKGROUND)
+        y = 4
+        for line in rendered:
+            overlay.blit(line, (4, y))
+            y += line.get_height()
+        return overlay
+
+    ###############################################
+    #                     Dump                    #
+    ###############################################
+    def rows(self):
+        """Returns one dict per finished frame in the buffer, times in milliseconds"""
+        rows = []
+        for index in self.recorded_frames():
+            row = {"frame": self._frame_numbers[index], "scene": self._scenes[index]}
+            for phase in PHASES:
+                row[phase + "_ms"] = round(self._phase_times[phase][index] * 1000, 3)
+            row["frame_ms"] = round(self._frame_times[index] * 1000, 3)
+            row["dropped"] = int(self._frame_times[index] > self._budget * DROPPED_FRAME_FACTOR)
+            rows.append(row)
+        return rows
+
+    def dump(self, path):
+        """Writes the frames in the buffer to path, as json if the path ends with .json and as csv otherwise. The
+        json file also holds the per scene percentiles and dropped frame counts.
+        """
+        rows = self.rows()
+        if path.lower().endswith(".json"):
+            scenes = sorted({row["scene"] for row in rows})
+            data = {
+                "target_fps": round(1.0 / self._budget),
+                "frames_seen": self._frames,
+                "dropped": dict(self.dropped),
+                "summary_ms": {scene: {phase: {"p{}".format(p): round(value * 1000, 3) for p, value in values.items()}
+                                       for phase, values in self.summary(scene).items()}
+                               for scene in scenes},
+                "frames": rows,
+            }
+            with open(path, "w") as out_file:
+                json.dump(data, out_file, indent=2)
+        else:
+            with open(path, "w", newline="") as out_file:
+                writer = csv.DictWriter(out_file, fieldnames=["frame", "scene"] + [phase + "_ms" for phase in PHASES]
+                                        + ["frame_ms", "dropped"])
+                writer.writeheader()
+                writer.writerows(rows)
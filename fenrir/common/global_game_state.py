@@ -46,6 +46,10 @@ class GameState:
     def player_id(self):
         return self._player_id
 
+    @player_id.setter
+    def player_id(self, player_id: int):
+        self._player_id = player_id
+
     @property
     def last_save(self):
         return self._last_save
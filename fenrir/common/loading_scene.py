@@ -0,0 +1,68 @@
+"""
+.. module:: loading_scene
+    :synopsis: transition scene shown while the assets of the next scene are decoded on the asset loader thread.
+"""
+
+import time
+import pygame
+from fenrir.common.scene import Scene
+from fenrir.common.asset_manager import assets
+from fenrir.common.config import Colors, DisplaySettings
+
+# seconds the last frame of the old scene takes to fade to black
+FADE_TIME = 0.3
+# darkest the old frame gets (0 - 255)
+FADE_ALPHA = 200
+LOADING_TEXT_SIZE = 40
+
+
+class LoadingScene(Scene):
+    """Scene that keeps drawing while the next scene gets ready. The next scene class tells what it will read from
+        disk through its prefetch(game_state) static method, which starts the loads on the asset loader thread and
+        returns their futures. Once every future is done the scene is built on the main thread, where converting
+        the decoded images is all that is left, and the game switches to it.
+
+        The transition fades the last frame of the old scene to black, if the loads finish right away (everything
+        was cached) the new scene shows up on the next frame.
+
+        :param screen: screen object used for rendering content
+        :param game_state: game state passed to the next scene
+        :param scene_class: class of the next scene, called as scene_class(screen, game_state)
+    """
+
+    def __init__(self, screen, game_state, scene_class):
+        super().__init__(screen, game_state)
+        self._scene_class = scene_class
+        # the screen still holds the last frame drawn by the old scene
+        self._last_frame = screen.copy()
+        self._fade = pygame.Surface(screen.get_size())
+        self._fade.fill(Colors.BLACK.value)
+        self._start_time = time.perf_counter()
+
+        self._futures = [future for future in scene_class.prefetch(game_state) if future is not None]
+
+    @property
+    def ready(self):
+        return all(future.done() for future in self._futures)
+
+    def handle_event(self, event):
+        # input is ignored until the next scene is up
+        pass
+
+    def update(self):
+        if self.next is self and self.ready:
+            # raises any error hit while loading on the main thread, like loading there would have
+            for future in self._futures:
+                future.result()
+            self.switch_to_scene(self._scene_class(self.screen, self.game_state))
+
+    def render(self):
+        progress = min((time.perf_counter() - self._start_time) / FADE_TIME, 1.0)
+        self.screen.blit(self._last_frame, (0, 0))
+        self._fade.set_alpha(int(FADE_ALPHA * progress))
+        self.screen.blit(self._fade, (0, 0))
+
+        if progress == 1.0:
+            text = assets.get_text("Loading...", None, LOADING_TEXT_SIZE, Colors.WHITE.value)
+            width, height = DisplaySettings.SCREEN_RESOLUTION.value
+            self.screen.blit(text, text.get_rect(bottomright=(width - 20, height - 20)))
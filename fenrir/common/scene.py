@@ -11,12 +11,31 @@ class Scene:
 
 
         :param screen: screen object used for rendering content. A reference is passed to each scene.
+
+        :dirty_rects: list of screen rects changed by the last render. The main loop only updates those areas of
+                      the display, when None (default) the whole display is updated.
+        :interpolation: (float) set by the main loop before each render, how far (0 to 1) the game is between the
+                        last update and the next one. Update runs at a fixed rate while frames can be drawn more
+                        often, scenes use it to draw moving things between their last two positions.
+
+        :idle: (boolean) True while the scene only changes when it gets an event. The main loop then sleeps until
+               the next event arrives instead of drawing the same frame again.
+        :idle_timeout: (int) max milliseconds an idle scene sleeps, so things that change with time (e.g. a blinking
+                       cursor) still get drawn. 0 sleeps until the next event.
+        :blocked_events: (tuple) event types the scene never uses, they are kept out of the event queue while the
+                         scene runs so they don't wake it up.
     """
 
+    idle = False
+    idle_timeout = 0
+    blocked_events = ()
+
     def __init__(self, screen, game_state):
         self.screen = screen
         self.next = self
         self._game_state = game_state
+        self.dirty_rects = None
+        self.interpolation = 0.0
 
     def handle_event(self, event):
         """This is an abstract method that will handle all events in the queue. This will be
@@ -30,7 +49,8 @@ class Scene:
 
     def update(self):
         """This is an abstract method that must be implemented and will be where game
-        logic is handled. This will update each time in the game loop. For example in
+        logic is handled. This is called GameConstants.UPDATE_RATE times a second, so it can be called none
+        or several times between two renders. For example in
         here you will update the player or players positions on the map here which will
         be an attribute of your scene class. Then the render function will update that
         location to the screen this separates the logic from the rendering. Complex logic
@@ -48,6 +68,13 @@ class Scene:
 
         raise NotImplementedError
 
+    @staticmethod
+    def prefetch(game_state):
+        """Starts loading what the scene reads from disk when it is built for the game state, on the asset loader
+        thread. Returns the futures of the loads, LoadingScene waits for them before it builds the scene.
+        """
+        return []
+
     def switch_to_scene(self, next_scene):
         """This is the main driver behind the switching scenes. When called it will set
         itself to the next scene and the game loop will render that scene. This can be
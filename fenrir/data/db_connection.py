@@ -1,31 +1,91 @@
 import sqlite3
+import threading
+from datetime import datetime
 from fenrir.common.config import PATH_TO_DATABASE
 
-""" This function will initialize the database on the users local hard drive. It will 
-    create the tables needed. This will be run at start up.
+""" This module owns the single connection used by the game. The connection is opened the first time it is
+    needed and reused by every save and load until close_db is called, so queries don't pay for opening the file,
+    reading the schema and preparing statements each time. Statements use ? parameters so sqlite can reuse the
+    prepared statements from its cache.
 
 """
 
+# number of prepared statements sqlite keeps per connection
+STATEMENT_CACHE_SIZE = 64
+
+# pragmas applied every time the connection is opened
+PRAGMAS = (
+    "PRAGMA journal_mode=WAL",  # readers don't block the writer and commits only append to the log
+    "PRAGMA synchronous=NORMAL",  # safe with WAL, skips an fsync on every commit
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-2000",  # 2MB page cache
+    "PRAGMA foreign_keys=ON",
+)
+
+_connection = None
+# the connection can be shared with other threads, the lock keeps their statements from interleaving
+db_lock = threading.RLock()
+
 
 def initialize_db():
-    conn = sqlite3.connect(PATH_TO_DATABASE)
-    cursor = conn.cursor()
+    """ This function will initialize the database on the users local hard drive. It will
+        create the tables needed. This will be run at start up.
+    """
+    with db_lock:
+        conn = connect_to_db()
+        with conn:
+            conn.execute("""CREATE TABLE IF NOT EXISTS game_save (
+                            id INTEGER PRIMARY KEY AUTOINCREMENT,
+                            player_name text,
+                            last_save text,
+                            player_level integer,
+                            x_location integer,
+                            y_location integer,
+                            player_party text,
+                            current_map text,
+                            boss_victory integer,
+                            saved_at integer
+                            )""")
+            # databases created before saved_at existed get the column and their timestamps filled in
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(game_save)")]
+            if "saved_at" not in columns:
+                conn.execute("ALTER TABLE game_save ADD COLUMN saved_at integer")
+                rows = conn.execute("SELECT id, last_save FROM game_save").fetchall()
+                conn.executemany("UPDATE game_save SET saved_at = ? WHERE id = ?",
+                                 [(parse_last_save(last_save), save_id) for save_id, last_save in rows])
+            # used to list the newest saves first one page at a time
+            conn.execute("CREATE INDEX IF NOT EXISTS game_save_saved_at ON game_save (saved_at DESC, id DESC)")
 
-    cursor.execute("""CREATE TABLE IF NOT EXISTS game_save (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    player_name text,
-                    last_save text,
-                    player_level integer,
-                    x_location integer,
-                    y_location integer,
-                    player_party text,
-                    current_map text,
-                    boss_victory integer    
-                    )""")
 
-    conn.commit()
-    conn.close()
+def parse_last_save(last_save):
+    """Turns the last_save text of old saves into a unix timestamp, 0 if it can't be read"""
+    try:
+        return int(datetime.strptime(last_save, "%b %d, %Y %I:%M %p").timestamp())
+    except (TypeError, ValueError):
+        return 0
 
 
 def connect_to_db():
-    return sqlite3.connect(PATH_TO_DATABASE)
+    """Returns the shared connection, opening it the first time"""
+    global _connection
+
+    with db_lock:
+        if _connection is None:
+            conn = sqlite3.connect(PATH_TO_DATABASE, check_same_thread=False,
+                                   cached_statements=STATEMENT_CACHE_SIZE)
+            for pragma in PRAGMAS:
+                conn.execute(pragma)
+            _connection = conn
+        return _connection
+
+
+def close_db():
+    """Closes the shared connection, the next query opens a new one"""
+    global _connection
+
+    with db_lock:
+        if _connection is not None:
+            # closing the last connection also copies the write ahead log back into the database file
+            _connection.execute("PRAGMA optimize")
+            _connection.close()
+            _connection = None
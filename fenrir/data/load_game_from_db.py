@@ -1,32 +1,46 @@
 import fenrir.data.db_connection as db
 from fenrir.common.global_game_state import GameState
 
+SELECT_SAVE_TITLES = "SELECT id, player_name, last_save FROM game_save ORDER BY saved_at DESC, id DESC"
+COUNT_SAVES = "SELECT COUNT(*) FROM game_save"
+# pages are read newest first and continue after the (saved_at, id) of the last row of the previous page,
+# the game_save_saved_at index lets sqlite jump straight to it instead of skipping rows with an OFFSET
+SELECT_FIRST_PAGE = """SELECT id, player_name, last_save, saved_at FROM game_save
+                       ORDER BY saved_at DESC, id DESC LIMIT ?"""
+SELECT_PAGE_AFTER = """SELECT id, player_name, last_save, saved_at FROM game_save
+                       WHERE (saved_at, id) < (?, ?)
+                       ORDER BY saved_at DESC, id DESC LIMIT ?"""
+SELECT_SAVE_BY_ID = """SELECT id, player_name, last_save, player_level, x_location, y_location,
+                              player_party, current_map, boss_victory
+                       FROM game_save WHERE id = ?"""
+
 
 def load_game_save_titles():
-    save_list = []
+    with db.db_lock:
+        return db.connect_to_db().execute(SELECT_SAVE_TITLES).fetchall()
 
-    # connect to the database - close when finished
-    conn = db.connect_to_db()
-    curs = conn.cursor()
 
-    for row in curs.execute("SELECT id, player_name, last_save FROM game_save"):
-        save_list.append(row)
+def count_game_saves():
+    with db.db_lock:
+        return db.connect_to_db().execute(COUNT_SAVES).fetchone()[0]
 
-    conn.commit()
-    conn.close()
 
-    return save_list
+def load_game_save_page(page_size, after=None):
+    """Returns up to page_size (id, player_name, last_save, saved_at) rows, newest save first
 
+    :param page_size: (int) max number of rows to return
+    :param after: (tuple) (saved_at, id) of the last row of the previous page, None for the first page
+    """
+    with db.db_lock:
+        conn = db.connect_to_db()
+        if after is None:
+            return conn.execute(SELECT_FIRST_PAGE, (page_size,)).fetchall()
+        return conn.execute(SELECT_PAGE_AFTER, (after[0], after[1], page_size)).fetchall()
 
-def load_game_save_by_id(player_id: int):
-    conn = db.connect_to_db()
-    curs = conn.cursor()
 
-    curs.execute(f"SELECT * FROM game_save WHERE id={player_id}")
-    data = curs.fetchone()
+def load_game_save_by_id(player_id: int):
+    with db.db_lock:
+        data = db.connect_to_db().execute(SELECT_SAVE_BY_ID, (player_id,)).fetchone()
 
     player_party = data[6].split(':')
     return GameState(data[0], data[1], data[2], data[3], data[4], data[5], player_party, data[7], data[8])
-
-    conn.commit()
-    conn.close()
@@ -1,42 +1,54 @@
 import fenrir.data.db_connection as db
 from datetime import datetime
 
+UPDATE_SAVE = """UPDATE game_save SET
+                        player_name = ?,
+                        last_save = ?,
+                        player_level = ?,
+                        x_location = ?,
+                        y_location = ?,
+                        player_party = ?,
+                        current_map = ?,
+                        boss_victory = ?,
+                        saved_at = ?
+                 WHERE id = ?"""
+
+INSERT_SAVE = """INSERT INTO game_save (player_name, last_save, player_level, x_location,
+                                       y_location, player_party, current_map, boss_victory, saved_at)
+                 VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
 
 def save_game(state_obj):
-    conn = db.connect_to_db()
-    curs = conn.cursor()
+    write_save(state_obj.player_id, save_values(state_obj))
+
 
+def save_values(state_obj):
+    """Returns a tuple with the column values of the save, taken from the game state at the time of the call"""
     date = datetime.now()
     formatted_date = date.strftime("%b %d, %Y %I:%M %p")
     formatted_player_party = ':'.join(state_obj.player_party)
 
-    # if state object has id then update values in db
-    if state_obj.player_id:
-        statement = f"""UPDATE game_save SET
-                                player_name='{state_obj.player_name}',
-                                last_save='{formatted_date}',
-                                player_level={state_obj.player_level},
-                                x_location={state_obj.game_state_location_x},
-                                y_location={state_obj.game_state_location_y},
-                                player_party='{formatted_player_party}',
-                                current_map='{state_obj.game_state_current_map}',
-                                boss_victory='{state_obj.final_victory}'
-                        WHERE id = {state_obj.player_id}"""
-    else:
-        # if state obj has no id then it is a new save and db will create id
-        statement = f"""INSERT INTO game_save (player_name, last_save, player_level, x_location,
-                                                y_location, player_party, current_map, boss_victory) 
-                        VALUES ('{state_obj.player_name}',
-                                '{formatted_date}',
-                                 {state_obj.player_level},
-                                 {state_obj.game_state_location_x},
-                                 {state_obj.game_state_location_y},
-                                 '{formatted_player_party}',
-                                 '{state_obj.game_state_current_map}',
-                                 '{state_obj.final_victory}')
-                                 """
-
-    curs.execute(statement)
-
-    conn.commit()
-    conn.close()
+    return (state_obj.player_name,
+            formatted_date,
+            state_obj.player_level,
+            state_obj.game_state_location_x,
+            state_obj.game_state_location_y,
+            formatted_player_party,
+            state_obj.game_state_current_map,
+            state_obj.final_victory,
+            int(date.timestamp()))
+
+
+def write_save(player_id, values):
+    """Writes the save values to the database, returns the id of the save row"""
+    with db.db_lock:
+        conn = db.connect_to_db()
+        # commits when the block ends, rolls back if the statement fails
+        with conn:
+            # if state object has id then update values in db
+            if player_id:
+                conn.execute(UPDATE_SAVE, values + (player_id,))
+                return player_id
+            else:
+                # if state obj has no id then it is a new save and db will create id
+                return conn.execute(INSERT_SAVE, values).lastrowid
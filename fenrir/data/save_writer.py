@@ -0,0 +1,111 @@
+"""
+.. module:: save_writer
+  :synopsis: writes game saves to the database on a background thread so the game loop never waits on sqlite.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from concurrent.futures import Future
+from fenrir.data.save_game_to_db import save_values, write_save
+
+logger = logging.getLogger(__name__)
+
+# put on the queue to stop the writer thread
+_STOP = object()
+
+
+class SaveWriter:
+    """Class that owns a writer thread and the queue of saves waiting to be written. The game state is copied when
+        the save is submitted, so the scene can keep changing it right away. If a slot is saved again before the
+        writer got to it, only the newest values are written and every future of that slot gets the same result.
+
+        Futures are resolved on the writer thread, callbacks added to them should only store the result.
+    """
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        # slot -> [player id, values, futures] for saves that are queued but not written yet
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def submit(self, state_obj, callback=None):
+        """Queues a save of the game state and returns a Future that holds the id of the save row once it is
+            written, or the exception if the write failed.
+
+        :param state_obj: (GameState) state to save
+        :param callback: (function) optional, called with the future once the save is done
+        """
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        values = save_values(state_obj)
+        # saves that are not in the database yet don't have an id, they are a slot of their own
+        slot = state_obj.player_id or ("new", id(state_obj))
+
+        with self._lock:
+            self._start()
+            pending = self._pending.get(slot)
+            if pending is not None:
+                # the older values were never written, replace them
+                pending[1] = values
+                pending[2].append(future)
+            else:
+                # the state is kept in the entry so its id can't be reused by another state while queued
+                self._pending[slot] = [state_obj.player_id, values, [future], state_obj]
+                self._queue.put(slot)
+
+        return future
+
+    def flush(self):
+        """Blocks until every queued save is written"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        """Writes the saves that are still queued and stops the writer thread"""
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+            if thread is None:
+                return
+            self._queue.put(_STOP)
+        thread.join()
+
+    def _start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            slot = self._queue.get()
+            try:
+                if slot is _STOP:
+                    return
+                with self._lock:
+                    player_id, values, futures, _ = self._pending.pop(slot)
+                self._write(player_id, values, futures)
+            finally:
+                self._queue.task_done()
+
+    @staticmethod
+    def _write(player_id, values, futures):
+        try:
+            save_id = write_save(player_id, values)
+        except Exception as error:
+            logger.exception("saving the game failed")
+            for future in futures:
+                future.set_exception(error)
+        else:
+            for future in futures:
+                future.set_result(save_id)
+
+
+# shared instance used by the scenes
+save_writer = SaveWriter()
+# queued saves are still written if the game exits without closing the writer
+atexit.register(save_writer.close)
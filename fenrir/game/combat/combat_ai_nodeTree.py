@@ -29,6 +29,7 @@ class Node:
         self._totalDistance = 0
         self._neighbors = []
         self._myParent = None
+        self._searchId = 0
 
     def get_xPos(self):
         return self._xPos
@@ -93,6 +94,16 @@ class Node:
         self._finalCost = 0
         self._myParent = None
 
+    def start_search(self, searchId):
+        """Clears data left over from an older search the first time a search reaches this node, so the whole tree
+        doesn't need to be reset before each search. Returns True if this is the first visit for the search.
+        """
+        if self._searchId == searchId:
+            return False
+        self._searchId = searchId
+        self.clear_data()
+        return True
+
 
 class CombatAINodeTree:
     """Class that holds and builds the AI NodeTree. Takes in the width and height of the battle map (tiles)
@@ -103,9 +114,15 @@ class CombatAINodeTree:
 
     Other non-param values:
     :AINodeTree: (list of Node objects) the NodeTree object that has all the Nodes for the battle scene
+    :nodeIndex: (dict) (x, y) tile coordinate -> Node, used for constant time lookups
     """
+
+    # offsets of the (max 4) neighbors, in the order they are added to each node
+    NEIGHBOR_OFFSETS = ((-1, 0), (0, -1), (0, 1), (1, 0))
+
     def __init__(self, widthInTiles, heightInTiles, mapData):
         self.AINodeTree = []
+        self._nodeIndex = {}
         self._copyOfMapData = mapData
         # create all the nodes that are accessible
         for x in range(widthInTiles):
@@ -113,28 +130,22 @@ class CombatAINodeTree:
                 if self.is_tile_accessible(x, y):
                     newNode = Node(x, y)
                     self.AINodeTree.append(newNode)
+                    self._nodeIndex[(x, y)] = newNode
 
-        # set the neighbors for each node
+        # set the neighbors for each node by looking up the 4 surrounding tiles
         for node in self.AINodeTree:
-            counter = 0
-            for otherNode in self.AINodeTree:
-                x = otherNode.get_xPos()
-                y = otherNode.get_yPos()
-                # if the 1 coordinate matches and the other is +-1 then it must be a neighbor
-                if x == node.get_xPos() and (y == (node.get_yPos() - 1) or y == (node.get_yPos() + 1)):
-                    node.set_neighbors(otherNode)
-                    counter += 1
-                elif y == node.get_yPos() and (x == (node.get_xPos() - 1) or x == (node.get_xPos() + 1)):
-                    node.set_neighbors(otherNode)
-                    counter += 1
-                # max of 4 neighbors possible
-                if counter == 4:
-                    break
+            for offsetX, offsetY in self.NEIGHBOR_OFFSETS:
+                neighbor = self._nodeIndex.get((node.get_xPos() + offsetX, node.get_yPos() + offsetY))
+                if neighbor is not None:
+                    node.set_neighbors(neighbor)
 
     def is_tile_accessible(self, x, y):
-        if not self._copyOfMapData.tilemap[y][x].is_blocking and not self._copyOfMapData.tilemap[y][x].is_wall:
-            return True
-        return False
+        # walls are always blocking so only the blocking flag needs checking
+        return not self._copyOfMapData.is_blocking(x, y)
 
     def get_ai_node_tree(self):
         return self.AINodeTree
+
+    def get_node(self, x, y):
+        """Returns the node at the x, y tile coordinate or None if the tile is not accessible"""
+        return self._nodeIndex.get((x, y))
@@ -4,6 +4,7 @@
 """
 
 import math
+from fenrir.game.combat.combat_pathfinding import a_star_search
 
 
 class CombatAISystem:
@@ -11,7 +12,7 @@ class CombatAISystem:
 
     :param participants: (list of character objects) list of all characters in the combat scene.
     :param currentParticipant: (character object) the character object for the current ai that is making decisions.
-    :param nodeTree: (list of Node objects) the list of all nodes for the battle scene.
+    :param nodeTree: (CombatAINodeTree) the node tree holding all nodes for the battle scene.
     :param mapData: (obj) holds all the map information in the round
 
     Other non-param values:
@@ -29,8 +30,6 @@ class CombatAISystem:
     :targetDistance: (int) the distance from the ai to the targetNode.
     :targetNextToMe: (boolean) true if any non-enemy is directly next to the ai.
     :targetLessThanTheTargetPosition: (boolean) if the ai is moving to a node that is not next to the target character.
-    :openList: (list of Node objects) list of Nodes to check for pathing
-    :closedList: (list of Node objects) list of Nodes already checked for pathing
     """
 
     def __init__(self, participants, currentParticipant, nodeTree, mapData):
@@ -50,7 +49,6 @@ class CombatAISystem:
         self.startNode = None
         self.endNode = None
         self.closestNode = None
-        self.listToSearch = None
         self._goalX = None
         self._goalY = None
         self.distanceToFar = False
@@ -59,7 +57,8 @@ class CombatAISystem:
         """Uses distance from each target and type checking to decide which target should be the focus this turn.
         """
         for potentialTarget in self.list_of_characters:
-            if not potentialTarget.get_is_enemy() and potentialTarget.hp > 0:
+            # targets are the units on the other side, players for enemies and enemies for players
+            if potentialTarget.get_is_enemy() != self.me.get_is_enemy() and potentialTarget.hp > 0:
                 # Estimate the distance to this target
                 potentialTargetX = ((potentialTarget.xpos - 30) / 60)
                 potentialTargetY = ((potentialTarget.ypos - 30) / 60)
@@ -98,64 +97,15 @@ class CombatAISystem:
         """Function to decide where to move the ai on the map. Returns x Coord to move to, y Coord to move to, target id
         to attack this turn. based on A*
         """
-        self.listToSearch = []
-        # Reset all the nodes and add the start node to the list
-        for node in self._nodeTree:
-            node.clear_data()
-            if node.get_xPos() == self.myX and node.get_yPos() == self.myY:
-                self.startNode = node
-                self.startNode.set_distanceToGoal(self.enemyX, self.enemyY)
-                self.listToSearch.append(node)
-
-        self.closestNode = self.startNode
-
-        while len(self.listToSearch) > 0:
-            currentNode = self.listToSearch[0]
-            currentNodeIndex = 0
-            counter = 0
-
-            # Find the node with the smallest distance to the goal
-            for tile in self.listToSearch:
-                if tile.get_finalCost() < currentNode.get_finalCost():
-                    currentNode = tile
-                    currentNodeIndex = counter
-                counter += 1
-            self.listToSearch.pop(currentNodeIndex)
-
-            if currentNode.get_distanceToGoal() < self.closestNode.get_distanceToGoal():
-                self.closestNode = currentNode
-
-            # Found the enemy position in the nodeTree
-            if currentNode.get_xPos() == self.enemyX and currentNode.get_yPos() == self.enemyY:
-                self.endNode = currentNode
-                self.set_enemy_path_distance()
-                return
-
-            if currentNode.get_distanceToGoal() <= self.me.attack_range:
-                self.endNode = currentNode
-                self.set_enemy_path_distance()
-                return
-
-            # check if the node neighbors have been seen before if so check best path, if not add to list
-            for neighbor in currentNode.get_neighbors():
-                # TODO determine what to do about occupied spaces
-                if self._copyOfMapData.tilemap[neighbor.get_yPos()][neighbor.get_xPos()].is_occupied:
-                    if neighbor.get_xPos() != self.enemyX or neighbor.get_yPos() != self.enemyY:
-                        continue
-                nodeGivenCost = neighbor.calculate_givenCost(currentNode.get_givenCost())
-                if neighbor.get_parent() is None and neighbor != self.startNode:
-                    neighbor.set_parent(currentNode)
-                    neighbor.set_givenCost(nodeGivenCost)
-                    neighbor.set_distanceToGoal(self.enemyX, self.enemyY)
-                    neighbor.set_finalCost()
-                    self.listToSearch.append(neighbor)
-                elif neighbor.get_parent() is not None:
-                    if nodeGivenCost < neighbor.get_givenCost():
-                        neighbor.set_givenCost(nodeGivenCost)
-                        neighbor.set_parent(currentNode)
-                        neighbor.set_finalCost()
-
-        if self.endNode is None:
+        self.startNode = self._nodeTree.get_node(self.myX, self.myY)
+        endNode, self.closestNode = a_star_search(self.startNode, self.enemyX, self.enemyY, self._copyOfMapData,
+                                                  goalRange=self.me.attack_range, heuristicWeight=1.2,
+                                                  canEnterGoal=True)
+
+        if endNode is not None:
+            self.endNode = endNode
+            self.set_enemy_path_distance()
+        else:
             self.endNode = self.closestNode
             self.distanceToFar = True
 
@@ -17,8 +17,8 @@ class CombatCharacterData:
 
     Other non-param values:
     :alive: (boolean) for checking if character died.
-    :xpos: (int) x pixel coordinate of unit on battlefield.
-    :ypos: (int) y pixel coordinate of unit on battlefield.
+    :xpos: (int) x pixel coordinate of the center of the tile the unit is on.
+    :ypos: (int) y pixel coordinate of the center of the tile the unit is on.
     :move_range: (int) the distance the unit can move in a battle turn.
     :attack_range: (int) the distance the unit can hit other units from.
     :luck: (int) value provided to the combat system for a chance of an incoming attack to miss.
@@ -47,6 +47,10 @@ class CombatCharacterData:
         self._movable_tiles = []
         self._attackable_tiles = []
 
+        # position on the battlefield, sprites may still be animating towards it
+        self._xpos = 0
+        self._ypos = 0
+
         # type specific traits
         self._mana = 0
         self._magic_attack = 0
@@ -171,11 +175,19 @@ class CombatCharacterData:
 
     @property
     def xpos(self):
-        return self.rect.centerx
+        return self._xpos
 
     @property
     def ypos(self):
-        return self.rect.centery
+        return self._ypos
+
+    def set_position(self, x, y):
+        """Sets the pixel center of the tile the unit is on"""
+        self._xpos = x
+        self._ypos = y
+
+    def set_player_loc(self, x, y):
+        self.set_position(x, y)
 
     def character_class_setup_by_type(self):
         """function sets all stats based on given level when character is constructed.
@@ -1,14 +1,113 @@
 import os
 import pygame
-from fenrir.common.config import PATH_TO_RESOURCES, Colors
+from fenrir.common.asset_manager import assets
+from fenrir.common.config import PATH_TO_RESOURCES, Colors, GameConstants
 from fenrir.game.combat.combat_character_data import CombatCharacterData
 
+# speeds are in seconds and turned into update steps, so sprites move the same no matter the update rate
+# pixels a walking unit moves each second
+MOVE_SPEED = 120
+# seconds each image of an animation is shown
+ANIMATION_FRAME_TIME = 0.1
+# seconds a unit stays tinted red after taking damage
+DAMAGE_FLASH_TIME = 5 / 3
+
+
+def to_steps(seconds):
+    """Returns the number of update steps that last the given time, at least one"""
+    return max(1, round(seconds * GameConstants.UPDATE_RATE.value))
+
+
+class CombatCharFrames:
+    """Class holds the preconverted animation frames for a single unit type. Frames are decoded once per process
+        and shared by every character of that type. Each animation also keeps a horizontally flipped, a damage
+        tinted and a flipped damage tinted copy of every frame so nothing has to be transformed while animating.
+        Frames can be prefetched so they are decoded on the asset loader thread before the type is first used.
+
+        :param char_type: (string) unit type, also the folder name inside resources/chars
+        :param frame_counts: (dict) animation name -> number of frames, e.g. {"idle": 6}
+    """
+
+    # index of each frame variant in the list returned by get_variants
+    NORMAL = 0
+    FLIPPED = 1
+    DAMAGED = 2
+    FLIPPED_DAMAGED = 3
+
+    # frame bank shared by all characters, keyed by unit type
+    _bank = {}
+
+    def __init__(self, char_type, frame_counts):
+        self._char_type = char_type
+        self._animations = {}
+
+        for name, count in frame_counts.items():
+            images = []
+            for path in self.frame_paths(char_type, name, count):
+                # the bank keeps the frames, the asset cache doesn't need a second copy
+                img = assets.get_image(path, cache=False)
+                img.set_colorkey(Colors.ALPHA.value)
+                images.append(img)
+
+            flipped = [pygame.transform.flip(img, True, False) for img in images]
+            self._animations[name] = [images, flipped,
+                                      [self.tint_damage(img) for img in images],
+                                      [self.tint_damage(img) for img in flipped]]
+
+    @staticmethod
+    def frame_paths(char_type, name, count):
+        return [os.path.join(PATH_TO_RESOURCES, 'chars', char_type, name + " (" + str(i) + ").png")
+                for i in range(1, count + 1)]
+
+    @classmethod
+    def prefetch(cls, char_type, frame_counts):
+        """Starts decoding the frames of a unit type that is not loaded yet, returns the futures of the loads"""
+        if char_type in cls._bank:
+            return []
+        futures = []
+        for name, count in frame_counts.items():
+            futures.extend(assets.prefetch_image(path) for path in cls.frame_paths(char_type, name, count))
+        return futures
+
+    @classmethod
+    def get_frames(cls, char_type, frame_counts):
+        """Returns the shared frames for the unit type, loading them the first time the type is requested
+        """
+        if char_type not in cls._bank:
+            cls._bank[char_type] = CombatCharFrames(char_type, frame_counts)
+        return cls._bank[char_type]
+
+    @staticmethod
+    def tint_damage(image):
+        colorImage = pygame.Surface(image.get_size()).convert_alpha()
+        colorImage.set_alpha(0)
+        colorImage.fill(Colors.RED.value)
+        redImage = image.copy()
+        redImage.blit(colorImage, (0, 0), special_flags=pygame.BLEND_RGB_MIN)
+        return redImage
+
+    @property
+    def char_type(self):
+        return self._char_type
+
+    def get_images(self, name):
+        return self._animations[name][self.NORMAL]
+
+    def get_variants(self, name):
+        return self._animations[name]
+
+
 """ Base class for combat char, functions will be implemented in sub class
 """
 
 
 class CombatCharSprite(CombatCharacterData, pygame.sprite.Sprite):
 
+    # animation name -> number of frames, set in each sub class
+    _frame_counts = {}
+    # true if the source images are drawn facing left
+    _sprite_faces_left = False
+
     def __init__(self, char_id, char_type, level, enemy):
         # attrs used for sprite and animation
         super().__init__(char_id, char_type, level, enemy)
@@ -17,16 +116,20 @@ class CombatCharSprite(CombatCharacterData, pygame.sprite.Sprite):
         self._move_x = 0  # amount char sprite needs to move on x-axis
         self._move_y = 0  # value char sprite needs to move on y-axis
         self._frame = 0  # value used for changing images in frames
-        self._animation_speed = 3  # number of frames to show image
+        self._animation_speed = to_steps(ANIMATION_FRAME_TIME)  # number of update steps to show image
         self._face_left = False
         self._animating = False
         self._player_died = False
-        self._move_speed = 4
+        self._move_speed = MOVE_SPEED / GameConstants.UPDATE_RATE.value  # pixels per update step
+        self._move_remainder = 0.0  # part of a pixel left over from the last steps
         self._took_damage = False
         self._damage_animation_counter = 0
+        self._damage_flash_steps = to_steps(DAMAGE_FLASH_TIME)
         self.image = None
         self.rect = pygame.Rect(0, 0, 0, 0)
+        self._last_topleft = (0, 0)  # rect position before the last update
         self._health_bar_rects = [pygame.Rect(0, 0, 50, 5), pygame.Rect(0, 0, 50, 5)]
+        self._frames = None
         self.get_health_bar_location()  # implemented in each char class
 
     @property
@@ -62,19 +165,97 @@ class CombatCharSprite(CombatCharacterData, pygame.sprite.Sprite):
     def update(self):
         raise NotImplementedError
 
-    def animate(self, images):
-        raise NotImplementedError
-
-    def load_assets(self):
-        raise NotImplementedError
-
     ###############################################
     #      Helper functions for char classes      #
     ###############################################
+    def load_assets(self):
+        # frames come from the shared bank so each unit type is only decoded once
+        self._frames = CombatCharFrames.get_frames(self.get_type(), self._frame_counts)
+        for name in self._frame_counts:
+            setattr(self, name + "_images", self._frames.get_images(name))
+
+    def animate(self, animation):
+        images = self._frames.get_images(animation)
+
+        if self._frame > (len(images) - 1) * self._animation_speed:  # num of animations in idle
+            self._frame = 0  # reset to first frame
+        else:
+            self._frame += 1
+
+        # flipped and damage tinted frames are baked at load time, only pick the right variant here
+        if self._face_left != self._sprite_faces_left:
+            variant = CombatCharFrames.FLIPPED
+        else:
+            variant = CombatCharFrames.NORMAL
+
+        if self._took_damage:
+            if self._damage_animation_counter < self._damage_flash_steps:
+                variant += CombatCharFrames.DAMAGED
+                self._damage_animation_counter += 1
+            else:
+                self._took_damage = False
+
+        self.image = self._frames.get_variants(animation)[variant][self._frame // self._animation_speed]
+
     def stop_movement(self):
         self.move_x = 0
         self.move_y = 0
 
+    def step_distance(self):
+        """Returns the whole pixels to walk this update step, fractions are carried over to the next steps"""
+        self._move_remainder += self._move_speed
+        distance = int(self._move_remainder)
+        self._move_remainder -= distance
+        return distance
+
+    # animates sprite while moving, returns to idle animation when complete
+    def move_sprite(self):
+
+        if self.move_x != 0 or self.move_y != 0:
+            self.animation_state = "walk"
+        else:
+            self.animation_state = "idle"
+            self._move_remainder = 0.0
+            if not self.attacking:
+                self._animating = False
+            return
+
+        distance = self.step_distance()
+
+        if self.move_x > 0:
+            self._face_left = False
+            step = min(self.move_x, distance)
+            self.rect.x += step
+            self.move_x -= step
+        elif self.move_x < 0:
+            self._face_left = True
+            step = max(self.move_x, -distance)
+            self.rect.x += step
+            self.move_x -= step
+
+        # y axis movements will only start when x-movements are done
+        if self.move_y > 0 and self.move_x == 0:
+            step = min(self.move_y, distance)
+            self.rect.y += step
+            self.move_y -= step
+        elif self.move_y < 0 and self.move_x == 0:
+            step = max(self.move_y, -distance)
+            self.rect.y += step
+            self.move_y -= step
+
+    def save_position(self):
+        """Remembers where the sprite is before an update so it can be drawn between two updates"""
+        self._last_topleft = self.rect.topleft
+
+    def draw_rect(self, alpha):
+        """Returns the rect the sprite is drawn at. Walking sprites are drawn alpha (0 to 1) of the way from where
+        they were before the last update to where they are now, everything else snaps to its rect.
+        """
+        if self.animation_state != "walk" or not alpha:
+            return self.rect
+        last_x, last_y = self._last_topleft
+        return self.rect.move(round((last_x - self.rect.x) * (1 - alpha)), round((last_y - self.rect.y) * (1 - alpha)))
+
     # function to move to a specified location on screen
     def move_to(self, x_target, y_target):
         delta_x = x_target - self.rect.centerx
@@ -93,32 +274,29 @@ class CombatCharSprite(CombatCharacterData, pygame.sprite.Sprite):
         y = int((self.ypos - 30) // 60)
         return x, y
 
+    # sub classes place their sprite on the tile and call set_position
     def set_player_loc(self, x, y):
         raise NotImplementedError
 
-    def get_damage_image(self):
-        colorImage = pygame.Surface(self.image.get_size()).convert_alpha()
-        colorImage.set_alpha(0)
-        colorImage.fill(Colors.RED.value)
-        redImage = self.image.copy()
-        redImage.blit(colorImage, (0, 0), special_flags=pygame.BLEND_RGB_MIN)
-        return redImage
-
     def animate_damage(self):
         self._took_damage = True
         self._damage_animation_counter = 0
 
-    def draw_health_bar(self, screen):
+    def draw_health_bar(self, screen, alpha=0.0):
+        # the bar follows the sprite when it is drawn between two updates
+        draw_rect = self.draw_rect(alpha)
         for rect in self._health_bar_rects:
             rect.midbottom = self.get_health_bar_location()
+            rect.move_ip(draw_rect.x - self.rect.x, draw_rect.y - self.rect.y)
 
         percent_health = int((self.hp / self.max_hp) * 50)
         # bg color red
-        pygame.draw.rect(screen, Colors.RED.value, self._health_bar_rects[0])
+        drawn_rect = pygame.draw.rect(screen, Colors.RED.value, self._health_bar_rects[0])
         # remaining health bar
         self._health_bar_rects[1].width = percent_health
         self._health_bar_rects[1].left = self._health_bar_rects[0].left
         pygame.draw.rect(screen, Colors.GREEN.value, self._health_bar_rects[1])
+        return drawn_rect
 
     def get_health_bar_location(self):
         raise NotImplementedError
@@ -132,7 +310,7 @@ class CombatCharSprite(CombatCharacterData, pygame.sprite.Sprite):
     def animate_death(self):
 
         if self._frame < (len(self.death_images) - 1) * self._animation_speed:
-            self.animate(self.death_images)
+            self.animate("death")
         else:
             self._animating = False
             self.kill()
@@ -140,6 +318,8 @@ class CombatCharSprite(CombatCharacterData, pygame.sprite.Sprite):
 
 class MageChar(CombatCharSprite):
 
+    _frame_counts = {"idle": 6, "attack": 10, "death": 17}
+
     def __init__(self, char_id, level, enemy):
         super().__init__(char_id, "mage", level, enemy)
 
@@ -160,64 +340,21 @@ class MageChar(CombatCharSprite):
         if enemy:
             self._face_left = True
 
-    # this method needs to override the method in the combat char data because images havet to be shifted 35 pixels down
-    @property
-    def ypos(self):
-        return self.rect.centery + 35
-
     def move_to(self, x_target, y_target):
         delta_x = x_target - self.rect.centerx
         delta_y = y_target - self.rect.centery - 35
         self.move(delta_x, delta_y)
 
     def set_player_loc(self, x, y):
+        # images are shifted 35 pixels up from the center of the tile
+        self.set_position(x, y)
         self.rect.centerx = x
         self.rect.centery = y - 35
 
-    def load_assets(self):
-        # load idle images
-        for i in range(1, 7):
-            img = pygame.image.load(
-                os.path.join(PATH_TO_RESOURCES, 'chars', 'mage', "idle (" + str(i) + ").png")).convert_alpha()
-            img.set_colorkey(Colors.ALPHA.value)
-            self.idle_images.append(img)
-
-        # load attack images
-        for i in range(1, 11):
-            img = pygame.image.load(
-                os.path.join(PATH_TO_RESOURCES, 'chars', 'mage', 'attack (' + str(i) + ').png')).convert_alpha()
-            img.set_colorkey(Colors.ALPHA.value)
-            self.attack_images.append(img)
-
-        # load death images
-        for i in range(1, 18):
-            img = pygame.image.load(
-                os.path.join(PATH_TO_RESOURCES, 'chars', 'mage', 'death (' + str(i) + ').png')).convert_alpha()
-            img.set_colorkey(Colors.ALPHA.value)
-            self.death_images.append(img)
-
-    def animate(self, images):
-
-        if self._frame > (len(images) - 1) * self._animation_speed:  # num of animations in idle
-            self._frame = 0  # reset to first frame
-        else:
-            self._frame += 1
-
-        if self._face_left:
-            self.image = pygame.transform.flip(images[self._frame // self._animation_speed], True, False)
-        else:
-            self.image = images[self._frame // self._animation_speed]
-
-        if self._took_damage:
-            if self._damage_animation_counter < 50:
-                self.image = self.get_damage_image()
-                self._damage_animation_counter += 1
-            else:
-                self._took_damage = False
-
     def animate_teleport(self):
-        if self._frame < len(self.death_images):
-            self.animate(self.death_images)
+        # teleporting plays the first third of the death animation at double speed
+        if self._frame < len(self.death_images) * self._animation_speed / 3:
+            self.animate("death")
             self._frame += 1
         else:
             self.rect.centerx += self.move_x
@@ -241,7 +378,7 @@ class MageChar(CombatCharSprite):
             self._face_left = left
 
         if self._frame < (len(self.attack_images) - 1) * self._animation_speed:
-            self.animate(self.attack_images)
+            self.animate("attack")
         else:
             self.animation_state = "idle"
             self.attacking = False
@@ -249,15 +386,13 @@ class MageChar(CombatCharSprite):
 
     def update(self):
         if self.animation_state == "idle":
-            images = self.idle_images
+            animation = "idle"
         elif self.animation_state == "attack":
-            images = self.attack_images
+            animation = "attack"
         elif self.animation_state == "death":
-            images = self.death_images
-        elif self.animation_state == "damage":
-            images = self.damage_images
+            animation = "death"
         else:
-            images = self.idle_images
+            animation = "idle"
 
         if self.move_x != 0 or self.move_y != 0:
             self.teleporting = True
@@ -275,11 +410,11 @@ class MageChar(CombatCharSprite):
         elif self._player_died:
             self.animate_death()
         else:
-            self.animate(images)
+            self.animate(animation)
 
     def get_health_bar_location(self):
         x, y = self.rect.midtop
-        if self.ypos < 45:
+        if self.rect.centery + 35 < 45:
             y = 5
         else:
 
@@ -289,6 +424,9 @@ class MageChar(CombatCharSprite):
 
 class KnightChar(CombatCharSprite):
 
+    _frame_counts = {"idle": 11, "walk": 10, "attack": 10, "death": 9}
+    _sprite_faces_left = True
+
     def __init__(self, char_id, level, enemy):
         super().__init__(char_id, "knight", level, enemy)
 
@@ -308,58 +446,6 @@ class KnightChar(CombatCharSprite):
         if enemy:
             self._face_left = True
 
-    @property
-    def ypos(self):
-        return self.rect.centery + 5
-
-    def load_assets(self):
-        # load idle images
-        for i in range(1, 12):
-            img = pygame.image.load(
-                os.path.join(PATH_TO_RESOURCES, 'chars', 'knight', "idle (" + str(i) + ").png")).convert_alpha()
-            img.set_colorkey(Colors.ALPHA.value)
-            self.idle_images.append(img)
-
-        # load run images
-        for i in range(1, 11):
-            img = pygame.image.load(
-                os.path.join(PATH_TO_RESOURCES, 'chars', 'knight', "walk (" + str(i) + ").png")).convert_alpha()
-            img.set_colorkey(Colors.ALPHA.value)
-            self.walk_images.append(img)
-
-        # load attack images
-        for i in range(1, 11):
-            img = pygame.image.load(
-                os.path.join(PATH_TO_RESOURCES, 'chars', 'knight', 'attack (' + str(i) + ').png')).convert_alpha()
-            img.set_colorkey(Colors.ALPHA.value)
-            self.attack_images.append(img)
-
-        # load death images
-        for i in range(1, 10):
-            img = pygame.image.load(
-                os.path.join(PATH_TO_RESOURCES, 'chars', 'knight', 'death (' + str(i) + ').png')).convert_alpha()
-            img.set_colorkey(Colors.ALPHA.value)
-            self.death_images.append(img)
-
-    def animate(self, images):
-
-        if self._frame > (len(images) - 1) * self._animation_speed:  # num of animations in idle
-            self._frame = 0  # reset to first frame
-        else:
-            self._frame += 1
-
-        if not self._face_left:
-            self.image = pygame.transform.flip(images[self._frame // self._animation_speed], True, False)
-        else:
-            self.image = images[self._frame // self._animation_speed]
-
-        if self._took_damage:
-            if self._damage_animation_counter < 50:
-                self.image = self.get_damage_image()
-                self._damage_animation_counter += 1
-            else:
-                self._took_damage = False
-
     def attack_enemy(self, left=None):
 
         if left is not None:
@@ -377,7 +463,7 @@ class KnightChar(CombatCharSprite):
             self._face_left = left
 
         if self._frame < (len(self.attack_images) - 1) * self._animation_speed:
-            self.animate(self.attack_images)
+            self.animate("attack")
         else:
             self.animation_state = "idle"
             self.rect.centerx += 5
@@ -385,61 +471,18 @@ class KnightChar(CombatCharSprite):
             self.attacking = False
             self._animating = False
 
-    # animates sprite while moving, returns to idle animation when complete
-    def move_sprite(self):
-
-        if self.move_x != 0 or self.move_y != 0:
-            self.animation_state = "walk"
-        else:
-            self.animation_state = "idle"
-            if not self.attacking:
-                self._animating = False
-
-        if self.move_x > 0:
-            self._face_left = False
-            if self.move_x < self._move_speed:
-                self.rect.x += self.move_x
-                self.move_x = self._move_speed
-            else:
-                self.rect.x += self._move_speed
-                self.move_x -= self._move_speed
-        elif self.move_x < 0:
-            self._face_left = True
-            if self.move_x > -self._move_speed:
-                self.rect.x += self.move_x
-                self.move_x = 0
-            else:
-                self.rect.x += -self._move_speed
-                self.move_x -= -self._move_speed
-
-        # y axis movements will only start when x-movements are done
-        if self.move_y > 0 and self.move_x == 0:
-            if self.move_y < self._move_speed:
-                self.rect.y += self.move_x
-                self.move_y = 0
-            else:
-                self.rect.y += self._move_speed
-                self.move_y -= self._move_speed
-        elif self.move_y < 0 and self.move_x == 0:
-            if self.move_y > -self._move_speed:
-                self.rect.y += self.move_y
-                self.move_y = 0
-            else:
-                self.rect.y += -self._move_speed
-                self.move_y -= -self._move_speed
-
     def update(self):
 
         if self.animation_state == "idle":
-            images = self.idle_images
+            animation = "idle"
         elif self.animation_state == "walk":
-            images = self.walk_images
+            animation = "walk"
         elif self.animation_state == "attack":
-            images = self.attack_images
+            animation = "attack"
         elif self.animation_state == "death":
-            images = self.death_images
+            animation = "death"
         else:
-            images = self.idle_images  # idle images as default
+            animation = "idle"  # idle animation as default
 
         self.move_sprite()
 
@@ -451,9 +494,11 @@ class KnightChar(CombatCharSprite):
                 self.started_death_animation = True
             self.animate_death()
         else:
-            self.animate(images)
+            self.animate(animation)
 
     def set_player_loc(self, x, y):
+        # images are shifted 5 pixels up from the center of the tile
+        self.set_position(x, y)
         self.rect.centerx = x
         self.rect.centery = y - 5
 
@@ -465,7 +510,7 @@ class KnightChar(CombatCharSprite):
     def get_health_bar_location(self):
         x, y = self.rect.midtop
 
-        if self.ypos < 45:
+        if self.rect.centery + 5 < 45:
             y = 5
 
         return x, y
@@ -473,6 +518,8 @@ class KnightChar(CombatCharSprite):
 
 class ArcherChar(CombatCharSprite):
 
+    _frame_counts = {"idle": 10, "walk": 10, "attack": 10, "death": 10}
+
     def __init__(self, char_id, level, enemy):
         super().__init__(char_id, "archer", level, enemy)
 
@@ -491,58 +538,6 @@ class ArcherChar(CombatCharSprite):
         if enemy:
             self._face_left = True
 
-    @property
-    def ypos(self):
-        return self.rect.centery + 10
-
-    def load_assets(self):
-        # load idle images
-        for i in range(1, 11):
-            img = pygame.image.load(
-                os.path.join(PATH_TO_RESOURCES, 'chars', 'archer', "idle (" + str(i) + ").png")).convert_alpha()
-            img.set_colorkey(Colors.ALPHA.value)
-            self.idle_images.append(img)
-
-        # load run images
-        for i in range(1, 11):
-            img = pygame.image.load(
-                os.path.join(PATH_TO_RESOURCES, 'chars', 'archer', "walk (" + str(i) + ").png")).convert_alpha()
-            img.set_colorkey(Colors.ALPHA.value)
-            self.walk_images.append(img)
-
-        # load attack images
-        for i in range(1, 11):
-            img = pygame.image.load(
-                os.path.join(PATH_TO_RESOURCES, 'chars', 'archer', 'attack (' + str(i) + ').png')).convert_alpha()
-            img.set_colorkey(Colors.ALPHA.value)
-            self.attack_images.append(img)
-
-        # load death images
-        for i in range(1, 11):
-            img = pygame.image.load(
-                os.path.join(PATH_TO_RESOURCES, 'chars', 'archer', 'death (' + str(i) + ').png')).convert_alpha()
-            img.set_colorkey(Colors.ALPHA.value)
-            self.death_images.append(img)
-
-    def animate(self, images):
-
-        if self._frame > (len(images) - 1) * self._animation_speed:  # num of animations in idle
-            self._frame = 0  # reset to first frame
-        else:
-            self._frame += 1
-
-        if self._face_left:
-            self.image = pygame.transform.flip(images[self._frame // self._animation_speed], True, False)
-        else:
-            self.image = images[self._frame // self._animation_speed]
-
-        if self._took_damage:
-            if self._damage_animation_counter < 50:
-                self.image = self.get_damage_image()
-                self._damage_animation_counter += 1
-            else:
-                self._took_damage = False
-
     def attack_enemy(self, left=None):
 
         if left is not None:
@@ -557,67 +552,24 @@ class ArcherChar(CombatCharSprite):
             self._face_left = left
 
         if self._frame < (len(self.attack_images) - 1) * self._animation_speed:
-            self.animate(self.attack_images)
+            self.animate("attack")
         else:
             self.animation_state = "idle"
             self.attacking = False
             self._animating = False
 
-    # animates sprite while moving, returns to idle animation when complete
-    def move_sprite(self):
-
-        if self.move_x != 0 or self.move_y != 0:
-            self.animation_state = "walk"
-        else:
-            self.animation_state = "idle"
-            if not self.attacking:
-                self._animating = False
-
-        if self.move_x > 0:
-            self._face_left = False
-            if self.move_x < self._move_speed:
-                self.rect.x += self.move_x
-                self.move_x = 0
-            else:
-                self.rect.x += self._move_speed
-                self.move_x -= self._move_speed
-        elif self.move_x < 0:
-            self._face_left = True
-            if self.move_x > -self._move_speed:
-                self.rect.x += self.move_x
-                self.move_x = 0
-            else:
-                self.rect.x += -self._move_speed
-                self.move_x -= -self._move_speed
-
-        # y axis movements will only start when x-movements are done
-        if self.move_y > 0 and self.move_x == 0:
-            if self.move_y < self._move_speed:
-                self.rect.y += self.move_y
-                self.move_y = 0
-            else:
-                self.rect.y += self._move_speed
-                self.move_y -= self._move_speed
-        elif self.move_y < 0 and self.move_x == 0:
-            if self.move_y > -self._move_speed:
-                self.rect.y += self.move_y
-                self.move_y = 0
-            else:
-                self.rect.y += -self._move_speed
-                self.move_y -= -self._move_speed
-
     def update(self):
 
         if self.animation_state == "idle":
-            images = self.idle_images
+            animation = "idle"
         elif self.animation_state == "walk":
-            images = self.walk_images
+            animation = "walk"
         elif self.animation_state == "attack":
-            images = self.attack_images
+            animation = "attack"
         elif self.animation_state == "death":
-            images = self.death_images
+            animation = "death"
         else:
-            images = self.idle_images  # idle images as default
+            animation = "idle"  # idle animation as default
 
         self.move_sprite()
 
@@ -626,9 +578,11 @@ class ArcherChar(CombatCharSprite):
         elif self._player_died:
             self.animate_death()
         else:
-            self.animate(images)
+            self.animate(animation)
 
     def set_player_loc(self, x, y):
+        # images are shifted 10 pixels up from the center of the tile
+        self.set_position(x, y)
         self.rect.centerx = x
         self.rect.centery = y - 10
 
@@ -640,8 +594,20 @@ class ArcherChar(CombatCharSprite):
     def get_health_bar_location(self):
         x, y = self.rect.midtop
 
-        if self.ypos < 45:
+        if self.rect.centery + 10 < 45:
             y = 5
         else:
             y += 38
         return x, y
+
+
+# unit type -> sprite class used for it in the combat scene
+UNIT_CLASSES = {"knight": KnightChar, "archer": ArcherChar, "mage": MageChar}
+
+
+def prefetch_unit_frames(unit_types):
+    """Starts decoding the frames of every unit type in the list on the asset loader thread, returns the futures"""
+    futures = []
+    for unit_type in set(unit_types):
+        futures.extend(CombatCharFrames.prefetch(unit_type, UNIT_CLASSES[unit_type]._frame_counts))
+    return futures
@@ -0,0 +1,278 @@
+"""
+.. module:: combat_engine
+  :synopsis: rules of a battle without any drawing or sound. Used by the combat scene and to simulate battles
+             headless, nothing in here imports pygame.
+"""
+
+from fenrir.game.combat.combat_map_data import MAP_TILE_W, MAP_TILE_H
+from fenrir.game.combat.combat_ai_nodeTree import CombatAINodeTree
+from fenrir.game.combat.combat_ai_system import CombatAISystem
+from fenrir.game.combat.combat_initiative_system import CombatInitiativeSystem
+from fenrir.game.combat.combat_move_list import combat_move_list
+from fenrir.game.combat.combat_query_cache import CombatQueryCache
+from fenrir.game.combat.combat_reachability import CombatReachability
+
+# number of choices (move or attack) a player unit gets each turn, only one of them can be an attack
+ACTIONS_PER_TURN = 2
+# battles that go on longer than this are stopped by run_battle without a winner
+DEFAULT_MAX_TURNS = 1000
+
+
+class CombatEngine:
+    """Class holds the state of one battle and applies the combat rules to it: spawning, initiative order, movement,
+        attacks, ai decisions, removing dead units and deciding the winner. Every change happens at once, callers that
+        animate the battle (the combat scene) play the animations after calling the engine.
+
+        Units are CombatCharacterData objects (or sub classes) and keep their position as the pixel center of their
+        tile, positions given to and returned by the engine are tile coordinates.
+
+        :param mapData: (MapData) map the battle is played on
+        :param participants: (list) units in the battle, players and enemies
+    """
+
+    def __init__(self, mapData, participants):
+        self._map = mapData
+        self._participants = list(participants)
+        self._ai_Tree = CombatAINodeTree(mapData.columns, mapData.rows, mapData)
+        self._reachability = CombatReachability(mapData)
+        # paths between two tiles, kept while the units stay where they were
+        self._paths = CombatQueryCache(mapData)
+        self._initiative_system = CombatInitiativeSystem(self._participants)
+
+        # turn info
+        self.turn_counter = 0
+        self.actions_left = ACTIONS_PER_TURN
+        self.used_attack = False
+        # ai turns skipped by run_battle because the ai raised
+        self.failed_turns = 0
+
+        # game won info
+        self.game_over = False
+        self.player_won = False
+
+    @property
+    def map_data(self):
+        return self._map
+
+    @property
+    def participants(self):
+        """Living units, dead units are removed by remove_dead_units"""
+        return self._participants
+
+    @property
+    def current_unit(self):
+        return self._initiative_system.get_current_player()
+
+    @property
+    def next_unit(self):
+        return self._initiative_system.get_next_player_up()
+
+    def upcoming_units(self, count):
+        """Returns the units that will act in the next count turns after the current one, in order"""
+        return self._initiative_system.get_upcoming_players(count)
+
+    ###############################################
+    #               Map and positions             #
+    ###############################################
+    def spawn_participants(self):
+        """Places every unit on the first free spawn tile of its side"""
+        for unit in self._participants:
+            spawn = self._map.enemyspawn if unit.get_is_enemy() else self._map.playerspawn
+            for tile in spawn:
+                if not tile.is_occupied:
+                    unit.set_player_loc(tile.x_coord + MAP_TILE_W // 2, tile.y_coord + MAP_TILE_H // 2)
+                    tile.occupy(unit.get_id())
+                    break
+
+    @staticmethod
+    def tile_of(unit):
+        """Returns the x, y tile coordinate of the unit"""
+        return (unit.xpos - MAP_TILE_W // 2) // MAP_TILE_W, (unit.ypos - MAP_TILE_H // 2) // MAP_TILE_H
+
+    @staticmethod
+    def tile_center(x, y):
+        """Returns the pixel center of the x, y tile"""
+        return x * MAP_TILE_W + MAP_TILE_W // 2, y * MAP_TILE_H + MAP_TILE_H // 2
+
+    def unit_at(self, x, y):
+        """Returns the living unit on the x, y tile, None if the tile is empty"""
+        unit_id = self._map.tilemap[y][x].unit
+        for unit in self._participants:
+            if unit.get_id() == unit_id:
+                return unit
+        return None
+
+    def find_path(self, start_x, start_y, x, y):
+        """Returns the (x, y) tiles of the shortest free path from the start tile to the x, y tile in walking order,
+        the start tile is not included. Empty if there is no path. The list is shared with later calls, don't change it.
+        """
+        key = (start_x, start_y, x, y)
+        path = self._paths.get(key)
+        if path is None:
+            path = self._paths.store(key, [(node.get_xPos(), node.get_yPos()) for node in
+                                           reversed(combat_move_list(start_x, start_y, x, y, self._ai_Tree, self._map))])
+        return path
+
+    def movement_tiles(self, unit):
+        """Returns the tiles the unit can walk to this turn"""
+        x, y = self.tile_of(unit)
+        return self._reachability.movement_tiles(unit.get_id(), x, y, unit.move_range)
+
+    def attack_tiles(self, unit):
+        """Returns the tiles the unit can attack this turn"""
+        x, y = self.tile_of(unit)
+        enemy_ids = {other.get_id() for other in self._participants if other.get_is_enemy() != unit.get_is_enemy()}
+        return self._reachability.attack_tiles(unit.get_id(), x, y, unit.attack_range, enemy_ids)
+
+    ###############################################
+    #                   Actions                   #
+    ###############################################
+    def move_unit(self, unit, x, y, teleport=False):
+        """Moves the unit to the x, y tile and returns the tiles it goes through in order (the start tile is not
+        included). Walking units follow the shortest free path and don't move at all if there is none, teleporting
+        units go straight to the tile.
+        """
+        start_x, start_y = self.tile_of(unit)
+        if teleport:
+            path = [(x, y)]
+        else:
+            # the caller walks the path off the list, the cached one is left alone
+            path = list(self.find_path(start_x, start_y, x, y))
+            if not path:
+                return path
+
+        self._map.unoccupy(start_x, start_y)
+        self._map.occupy(x, y, unit.get_id())
+        unit.set_position(*self.tile_center(x, y))
+        return path
+
+    def attack_unit(self, unit, target):
+        """The unit attacks the target, mages do magic damage and everyone else physical damage"""
+        if unit.get_type() == 'mage':
+            target.take_damage(unit.magic_attack, 'magic')
+        else:
+            target.take_damage(unit.attack, 'physical')
+
+    def player_move(self, x, y):
+        """Uses one of the current unit's choices to walk to the x, y tile, which must be one of its movement tiles.
+        Returns the path walked.
+        """
+        self.actions_left -= 1
+        return self.move_unit(self.current_unit, x, y)
+
+    def player_attack(self, x, y):
+        """Uses one of the current unit's choices to attack the x, y tile, which must be one of its attack tiles.
+        Returns the unit that was hit, None if the tile was empty.
+        """
+        self.actions_left -= 1
+        self.used_attack = True
+        target = self.unit_at(x, y)
+        if target is not None:
+            self.attack_unit(self.current_unit, target)
+        return target
+
+    ###############################################
+    #                      AI                     #
+    ###############################################
+    @staticmethod
+    def ai_teleports(unit):
+        """AI mages teleport to their goal instead of walking"""
+        return unit.get_type() == "mage"
+
+    def decide_ai_action(self, unit):
+        """Asks the ai what the unit should do. Returns the x, y tile to move to (None, None to stay) and the unit to
+        attack (None to not attack). All None means there is no one left to attack.
+        """
+        ai_brain = CombatAISystem(self._participants, unit, self._ai_Tree, self._map)
+        goal_x, goal_y, target_id = ai_brain.decide_ai_action()
+
+        x = y = target = None
+        if goal_x is not None and goal_y is not None:
+            x = (goal_x - MAP_TILE_W // 2) // MAP_TILE_W
+            y = (goal_y - MAP_TILE_H // 2) // MAP_TILE_H
+        if target_id is not None:
+            target = next((other for other in self._participants if other.get_id() == target_id), None)
+        return x, y, target
+
+    def play_ai_turn(self, unit=None):
+        """Decides and applies the whole turn of an ai unit (the current unit by default). Returns the path it moved
+        through and the unit it attacked (None if it didn't attack).
+        """
+        unit = unit or self.current_unit
+        x, y, target = self.decide_ai_action(unit)
+
+        # if there is no movement and no target then game is over
+        if x is None and target is None:
+            self.game_over = True
+            return [], None
+
+        path = []
+        if x is not None:
+            path = self.move_unit(unit, x, y, self.ai_teleports(unit))
+            # a walking unit that can't find a path skips the whole turn
+            if not path:
+                return path, None
+
+        if target is not None:
+            self.attack_unit(unit, target)
+        return path, target
+
+    ###############################################
+    #                 Turn handling               #
+    ###############################################
+    def remove_dead_units(self):
+        """Takes units without hp off the map and out of the initiative order, then checks for a winner. Returns the
+        list of units that were removed.
+        """
+        dead = [unit for unit in self._participants if unit.hp <= 0]
+        for unit in dead:
+            self._map.unoccupy(*self.tile_of(unit))
+            self._participants.remove(unit)
+            self._initiative_system.remove_player(unit.get_id())
+
+        if dead:
+            self.check_for_winner()
+        return dead
+
+    def check_for_winner(self):
+        player_alive = any(not unit.get_is_enemy() for unit in self._participants)
+        enemy_alive = any(unit.get_is_enemy() for unit in self._participants)
+
+        if not player_alive:
+            self.player_won = False
+            self.game_over = True
+        elif not enemy_alive:
+            self.player_won = True
+            self.game_over = True
+
+    def change_speed(self, unit, amount):
+        """Buffs (positive amount) or debuffs (negative amount) the speed of the unit, the initiative order follows
+        right away for the turns it has left this round
+        """
+        self._initiative_system.set_speed(unit.get_id(), unit.speed + amount)
+
+    def end_turn(self):
+        """Moves the initiative order to the next unit and gives it a fresh set of choices"""
+        self.turn_counter += 1
+        self.actions_left = ACTIONS_PER_TURN
+        self.used_attack = False
+        self._initiative_system.update_system()
+
+    def run_battle(self, max_turns=DEFAULT_MAX_TURNS, strict=True):
+        """Plays the battle to the end with the ai controlling both sides. Returns True if the players won, use
+        game_over to tell a loss from a battle that was stopped after max_turns.
+
+        An error raised by the ai stops the battle when strict, otherwise the unit skips its turn like in the combat
+        scene and the skipped turn is counted in failed_turns.
+        """
+        while not self.game_over and self.turn_counter < max_turns:
+            try:
+                self.play_ai_turn()
+            except Exception:
+                if strict:
+                    raise
+                self.failed_turns += 1
+            self.remove_dead_units()
+            self.end_turn()
+
+        return self.player_won
@@ -18,6 +18,8 @@ class CombatGridSystem:
         self._create_grid_rects()
         self._highlight_color = Colors.BLUE.value
         self._highlighted_tiles = []
+        self._grid_overlay = None
+        self._tile_surfaces = {}
 
     @property
     def rows(self):
@@ -39,24 +41,52 @@ class CombatGridSystem:
                 temp_list.append(grid)
             self._grid.append(temp_list)
 
+    def draw_grid_lines(self, surface):
+        """Draws the grid lines on the surface. The lines never change so the combat scene bakes them into its
+        background once instead of drawing every rect each frame.
+        """
+        surface.blit(self._get_grid_overlay(), (0, 0))
+
     def draw_grid(self, mouse_x, mouse_y, player_x, player_y, highlighting_player):
-        for i in range(0, self._rows):
-            for j in range(0, self.cols):
-                pygame.draw.rect(self._screen, Colors.GRID_GRAY.value, self._grid[i][j], 1)
+        self.draw_grid_lines(self._screen)
+        return self.draw_highlights(mouse_x, mouse_y, player_x, player_y, highlighting_player)
 
+    def draw_highlights(self, mouse_x, mouse_y, player_x, player_y, highlighting_player):
+        """Draws highlighted tiles, mouse hover and current player highlight. Returns list of rects drawn to screen
+        """
+        drawn_rects = []
         for tile in self._highlighted_tiles:
-            self._highlight_tile_by_index(tile, self._highlight_color)
+            drawn_rects.append(self._highlight_tile_by_index(tile, self._highlight_color))
 
         if self._highlighted_tiles:
-            self.mouse_hover_highlight(mouse_x, mouse_y)
+            drawn_rects.append(self.mouse_hover_highlight(mouse_x, mouse_y))
         if highlighting_player:
-            self._highlight_current_player(player_x, player_y)
+            drawn_rects.append(self._highlight_current_player(player_x, player_y))
+
+        return drawn_rects
+
+    def _get_grid_overlay(self):
+        # grid lines are drawn once on a transparent surface the size of the grid
+        if self._grid_overlay is None:
+            self._grid_overlay = pygame.Surface((self._cols * 60, self._rows * 60), pygame.SRCALPHA)
+            for i in range(0, self._rows):
+                for j in range(0, self.cols):
+                    pygame.draw.rect(self._grid_overlay, Colors.GRID_GRAY.value, self._grid[i][j], 1)
+        return self._grid_overlay
+
+    def _get_tile_surface(self, color, alpha):
+        # translucent tile surfaces are built once per color and alpha and reused
+        key = (color, alpha)
+        shape_surf = self._tile_surfaces.get(key)
+        if shape_surf is None:
+            shape_surf = pygame.Surface((60, 60), pygame.SRCALPHA)
+            shape_surf.set_alpha(alpha)
+            pygame.draw.rect(shape_surf, color, shape_surf.get_rect())
+            self._tile_surfaces[key] = shape_surf
+        return shape_surf
 
     def _highlight_tile_by_index(self, tile, color):
-        shape_surf = pygame.Surface((60, 60), pygame.SRCALPHA)
-        shape_surf.set_alpha(90)
-        pygame.draw.rect(shape_surf, color, shape_surf.get_rect())
-        self._screen.blit(shape_surf, tile)
+        return self._screen.blit(self._get_tile_surface(color, 90), tile)
 
     def highlight_tiles(self, tile_list, color):
         self._highlighted_tiles = []
@@ -77,14 +107,8 @@ class CombatGridSystem:
         else:
             color = Colors.RED.value
 
-        shape_surf = pygame.Surface((60, 60), pygame.SRCALPHA)
-        shape_surf.set_alpha(190)
-        pygame.draw.rect(shape_surf, color, shape_surf.get_rect())
-        self._screen.blit(shape_surf, tile)
+        return self._screen.blit(self._get_tile_surface(color, 190), tile)
 
     def _highlight_current_player(self, x, y):
         tile = self._grid[int(y // 60)][int(x // 60)]
-        shape_surf = pygame.Surface((60, 60), pygame.SRCALPHA)
-        shape_surf.set_alpha(180)
-        pygame.draw.rect(shape_surf, Colors.WHITE.value, shape_surf.get_rect())
-        self._screen.blit(shape_surf, tile)
+        return self._screen.blit(self._get_tile_surface(Colors.WHITE.value, 180), tile)
@@ -3,63 +3,111 @@
   :synopsis: module that determines the order of units in turn based combat mode.
 """
 
+import heapq
+
 
 class CombatInitiativeSystem:
     """Class represents the initiative system that will be deployed in each combat instance and will determine
         the order of battle.
 
+        Battles are played in rounds, every unit acts once per round from the fastest to the slowest, units with the
+        same speed keep their order in the participants list. The units yet to act this round are kept in a heap keyed
+        by (-speed, position in participants). Removing a unit or changing its speed only drops its entry from the
+        lookup table, the stale entry is skipped when it reaches the top of the heap, so both are O(log n). A unit whose
+        speed changes after it acted this round moves with the new speed from the next round on.
+
         :param participants: list of combat character objects in combat instance
     """
 
     def __init__(self, participants):
         """Constructor method
         """
-        self._ordered_initiative_list = sorted(list(participants), key=lambda p: p.speed, reverse=True)
-        self._current_position = 0
-        self._player_killed = False
-        self._last_player_killed = False
-        self._popped_prior_index = False
+        # id -> (position in participants, character) of the units still in the battle
+        self._players = {player.get_id(): (position, player) for position, player in enumerate(participants)}
+        # id -> heap entry of the units yet to act this round, entries not found here are stale
+        self._entries = {}
+        self._round = []
+        self._start_round()
+        self._current_player = self._pop_next()
+
+    def _entry(self, player_id):
+        position, player = self._players[player_id]
+        return [-player.speed, position, player_id]
+
+    def _start_round(self):
+        self._entries = {player_id: self._entry(player_id) for player_id in self._players}
+        self._round = list(self._entries.values())
+        heapq.heapify(self._round)
+
+    def _pop_next(self):
+        # pops the next unit yet to act this round, None once every unit acted
+        while self._round:
+            entry = heapq.heappop(self._round)
+            player_id = entry[-1]
+            if self._entries.get(player_id) is entry:
+                del self._entries[player_id]
+                return self._players[player_id][1]
+        return None
 
     def get_current_player(self):
         """Gets the character that is up for turn in combat
 
         :returns: CombatCharacterData object
         """
-        return self._ordered_initiative_list[self._current_position]
+        return self._current_player
 
     def get_next_player_up(self):
         """Gets the character that is up next after the current turn is complete
 
             :returns: CombatCharacterData object
         """
-        index = self._current_position + 1 if self._current_position + 1 < len(
-            self._ordered_initiative_list) else 0
-        return self._ordered_initiative_list[index]
+        upcoming = self.get_upcoming_players(1)
+        return upcoming[0] if upcoming else None
+
+    def get_upcoming_players(self, count):
+        """Gets the characters that will be up for turn after the current one, in order. Rounds repeat until count
+            characters are found, a unit can show up more than once if there are fewer than count of them. Only sorts
+            the units yet to act this round and, if count reaches past it, the whole roster once.
+
+            :param count: (int) number of turns to look ahead
+            :returns: list of CombatCharacterData objects
+        """
+        if not self._players:
+            return []
+        entries = [entry for entry in self._round if self._entries.get(entry[-1]) is entry]
+        upcoming = [self._players[entry[-1]][1] for entry in heapq.nsmallest(count, entries)]
+        if len(upcoming) < count:
+            next_rounds = [self._players[entry[-1]][1] for entry in sorted(map(self._entry, self._players))]
+            while len(upcoming) < count:
+                upcoming.extend(next_rounds[:count - len(upcoming)])
+        return upcoming
 
     def update_system(self):
-        """Updates the combat initiative system by updating current position in list. Operates as a cycle and will move
-            to position 0 when reaching last participant. Must be called after each turn is completed.
+        """Updates the combat initiative system by moving to the next unit yet to act this round, starts a new round
+            once every unit acted. Must be called after each turn is completed.
         """
-        if not self._popped_prior_index:
-            self._current_position += 1
+        self._current_player = self._pop_next()
+        if self._current_player is None:
+            self._start_round()
+            self._current_player = self._pop_next()
+
+    def remove_player(self, player_id):
+        """Takes the unit out of the initiative order. The current player stays up until update_system is called.
 
-        if self._last_player_killed:
-            if self._current_position >= len(self._ordered_initiative_list):
-                self._current_position = 0
-        elif self._player_killed and self._current_position == len(self._ordered_initiative_list):
-            self._current_position -= 1
-        elif self._current_position >= len(self._ordered_initiative_list):
-            self._current_position = 0
+            :param player_id: id of the removed character
+        """
+        self._players.pop(player_id, None)
+        self._entries.pop(player_id, None)
 
-        self._player_killed = False
-        self._last_player_killed = False
-        self._popped_prior_index = False
+    def set_speed(self, player_id, speed):
+        """Changes the speed of the unit mid battle. If it hasn't acted this round yet it moves to its new place in
+            this round, otherwise the new speed counts from the next round.
 
-    def remove_player(self, player_id):
-        self._player_killed = True
-        for i in range(0, len(self._ordered_initiative_list)):
-            if self._ordered_initiative_list[i].get_id() == player_id:
-                if i == len(self._ordered_initiative_list) - 1:
-                    self._last_player_killed = True
-                self._ordered_initiative_list.pop(i)
-                break
+            :param player_id: id of the character
+            :param speed: (int) new speed of the character
+        """
+        self._players[player_id][1].speed = speed
+        if player_id in self._entries:
+            entry = self._entry(player_id)
+            self._entries[player_id] = entry
+            heapq.heappush(self._round, entry)
@@ -4,103 +4,159 @@
 """
 
 import os
+import random
+from array import array
 from fenrir.common.config import PATH_TO_RESOURCES
 
 """
 :MAP_TILE_W: (int) holds standard width of tiles
 :MAP_TILE_H: (int) holds standard height of tiles
+:TILE_TYPES: (tuple) tile type names, the index is the code stored in the map arrays
+:TILE_CHARS: (dict) char used in the map .txt files -> tile type code
+:NO_UNIT: (int) occupant id stored for tiles without a unit
 """
 MAP_TILE_W = 60
 MAP_TILE_H = 60
 
+TILE_TYPES = ("ground", "wall", "blocking", "player_spawn", "enemy_spawn")
+GROUND, WALL, BLOCKING, PLAYER_SPAWN, ENEMY_SPAWN = range(len(TILE_TYPES))
+TILE_CHARS = {".": GROUND, "#": WALL, "~": BLOCKING, "a": PLAYER_SPAWN, "e": ENEMY_SPAWN}
+
+NO_UNIT = -1
+# seed of the random keys used for occupancy_hash, fixed so the hashes are the same every run
+OCCUPANCY_HASH_SEED = 0x5EED
+
+
 class MapTile:
     """
-    Class represents tiles that will be used to populate combat map lists
+    Class is a light view of a single tile stored in the MapData arrays. Tiles don't hold any data themselves,
+    every attribute is read from (and written to) the map so views can be created whenever they are needed.
 
-    :param t_type: (string) tells us what kind of tile it is, used to determine other attributes
-    :param x_coord, y_coord: (int) tells us the top left corner of the tile in x and y coordinates
+    :param map_data: (MapData) map the tile belongs to
+    :param index: (int) position of the tile in the flat map arrays (y * columns + x)
 
+    :t_type: (string) tells us what kind of tile it is
+    :x_coord, y_coord: (int) tells us the top left corner of the tile in x and y coordinates
     :wall: (boolean) tells us if the tile is a wall, if true also sets blocking to true
     :blocking: (boolean) tells us if the tile blocks movement
     :occupied: (boolean) tells us if there is a unit on the tile
-    :unit: (string) tells us the name/ID of the unit occupying the tile
+    :unit: (int) tells us the ID of the unit occupying the tile, empty string if there is none
     """
 
-    def __init__(self, t_type, x_coord, y_coord):
-        # Standard Types: ground, wall, blocking
-        self._t_type = t_type
-        # Coordinates are in increments of 60, top left corner of each tile
-        self._x_coord = x_coord
-        self._y_coord = y_coord
-        self._id = (x_coord, y_coord)
-        self._occupied = False
-        self._unit = ""
-        self._adjacent = []
-        # Wall and blocking attributes to determine movement
-        if self._t_type == "wall":
-            self._wall = True
-            self._blocking = True
-        elif self._t_type == "blocking":
-            self._wall = False
-            self._blocking = True
-        else:
-            self._wall = False
-            self._blocking = False
+    __slots__ = ("_map", "_index")
+
+    def __init__(self, map_data, index):
+        self._map = map_data
+        self._index = index
+
+    def __eq__(self, other):
+        return isinstance(other, MapTile) and self._map is other._map and self._index == other._index
+
+    def __hash__(self):
+        return hash((id(self._map), self._index))
+
+    @property
+    def index(self):
+        return self._index
 
     @property
     def t_type(self):
-        return self._t_type
+        return TILE_TYPES[self._map.tile_types[self._index]]
 
     @property
     def id(self):
-        return self._id
+        return self.x_coord, self.y_coord
 
     @property
     def is_wall(self):
-        return self._wall
+        return bool(self._map.walls[self._index])
 
     @property
     def is_blocking(self):
-        return self._blocking
+        return bool(self._map.blocking[self._index])
 
     @property
     def is_occupied(self):
-        return self._occupied
+        return bool(self._map.occupied[self._index])
 
     @property
     def adjacencies(self):
-        return self._adjacent
-
-    def set_adjacency(self, adjacency):
-        self._adjacent.append(adjacency)
+        return self._map.get_adjacent_tiles(self._index % self._map.columns, self._index // self._map.columns)
 
     def occupy(self, unit):
-        self._occupied = True
-        self._unit = unit
+        self._map.occupy(self._index % self._map.columns, self._index // self._map.columns, unit)
 
     def unoccupy(self):
-        self._occupied = False
-        self._unit = ""
+        self._map.unoccupy(self._index % self._map.columns, self._index // self._map.columns)
 
     @property
     def unit(self):
-        return self._unit
+        unit = self._map.occupants[self._index]
+        return "" if unit == NO_UNIT else unit
 
     @property
     def x_coord(self):
-        return self._x_coord
-
-    @x_coord.setter
-    def x_coord(self, value):
-        self._x_coord = value
+        return (self._index % self._map.columns) * MAP_TILE_W
 
     @property
     def y_coord(self):
-        return self._y_coord
+        return (self._index // self._map.columns) * MAP_TILE_H
+
+
+class MapTileRow:
+    """
+    Class is a view of one row of the map so tiles can still be accessed with tilemap[y][x]
+
+    :param map_data: (MapData) map the row belongs to
+    :param y: (int) y tile coordinate of the row
+    """
+
+    __slots__ = ("_map", "_start")
+
+    def __init__(self, map_data, y):
+        self._map = map_data
+        self._start = y * map_data.columns
+
+    def __len__(self):
+        return self._map.columns
+
+    def __getitem__(self, x):
+        if x < 0:
+            x += self._map.columns
+        if not 0 <= x < self._map.columns:
+            raise IndexError("map column out of range")
+        return MapTile(self._map, self._start + x)
+
+    def __iter__(self):
+        for x in range(self._map.columns):
+            yield MapTile(self._map, self._start + x)
+
+
+class MapTileGrid:
+    """
+    Class is a view of the whole map that behaves like the old 2D list of tiles, index is [y][x]
+
+    :param map_data: (MapData) map the grid belongs to
+    """
+
+    __slots__ = ("_map",)
+
+    def __init__(self, map_data):
+        self._map = map_data
+
+    def __len__(self):
+        return self._map.rows
 
-    @y_coord.setter
-    def y_coord(self, value):
-        self._y_coord = value
+    def __getitem__(self, y):
+        if y < 0:
+            y += self._map.rows
+        if not 0 <= y < self._map.rows:
+            raise IndexError("map row out of range")
+        return MapTileRow(self._map, y)
+
+    def __iter__(self):
+        for y in range(self._map.rows):
+            yield MapTileRow(self._map, y)
 
 
 class MapData:
@@ -117,7 +173,13 @@ class MapData:
                         (we use files associated with map images to populate this)
         :height: (int) height of the map .png (should be a multiple of 60)
         :width: (int) width of the map .png (should be a multiple of 60)
-        :tilemap: (MapTile) 2D list of all the tiles on the map
+        :tilemap: (MapTileGrid) 2D view of all the tiles on the map, index is [y][x]
+        :tile_types, walls, blocking, occupied: (bytearray) flat per tile data, index is y * columns + x
+        :occupants: (array) flat list of unit ids occupying each tile, NO_UNIT if empty
+        :occupancy_version: (int) increases every time a tile is occupied or freed
+        :occupancy_hash: (int) Zobrist hash of which unit is on which tile, the same units on the same tiles always
+                         give the same hash. Used to key cached searches, they can be reused when the units go back
+                         to where they were
         :player_spawn: (MapTile) list of all tiles where a player can spawn
         :enemy_spawn: (MapTile) list of all tiles where an enemy can spawn
 
@@ -138,38 +200,36 @@ class MapData:
         # Dimensions based off of tile numbers
         self._height = self._rows * MAP_TILE_H
         self._width = self._columns * MAP_TILE_W
-        # Tilemap population and definition
+        # Tile data is stored in flat arrays, one entry per tile, index is y * columns + x
         # Tilemap PNG MUST be 960 x 540!
-        # Tilemap index is [y][x], it has to be backwards
-        self._tilemap = []
+        size = self._rows * self._columns
+        self._tile_types = bytearray(size)
+        self._walls = bytearray(size)
+        self._blocking = bytearray(size)
+        self._occupied = bytearray(size)
+        self._occupants = array('i', [NO_UNIT]) * size
+        self._occupancy_version = 0
+        self._occupancy_hash = 0
+        # (tile index, unit id) -> random 64 bit key, made the first time the unit stands on the tile
+        self._occupancy_keys = {}
+        self._occupancy_random = random.Random(OCCUPANCY_HASH_SEED)
         for i in range(self._rows):
-            # Create a temp list to append to our first list so we can make it 2D
-            _temp_list = []
-            # Redundant, can be removed if necessary, but makes sure temp list is EMPTY before appending
-            _temp_list.clear()
             for j in range(self._columns):
-                if self._char_map[i][j] == ".":
-                    _temp_list.append(MapTile("ground", j * MAP_TILE_W, i * MAP_TILE_H))
-                elif self._char_map[i][j] == "#":
-                    _temp_list.append(MapTile("wall", j * MAP_TILE_W, i * MAP_TILE_H))
-                elif self._char_map[i][j] == "~":
-                    _temp_list.append(MapTile("blocking", j * MAP_TILE_W, i * MAP_TILE_H))
-                elif self._char_map[i][j] == "a":
-                    _temp_list.append(MapTile("player_spawn", j * MAP_TILE_W, i * MAP_TILE_H))
-                elif self._char_map[i][j] == "e":
-                    _temp_list.append(MapTile("enemy_spawn", j * MAP_TILE_W, i * MAP_TILE_H))
-            # Append our columns to each row
-            self._tilemap.append(_temp_list)
-        self.set_tile_adj()
+                index = i * self._columns + j
+                tile_type = TILE_CHARS.get(self._char_map[i][j], GROUND)
+                self._tile_types[index] = tile_type
+                # Wall and blocking attributes to determine movement
+                self._walls[index] = tile_type == WALL
+                self._blocking[index] = tile_type == WALL or tile_type == BLOCKING
+        self._tilemap = MapTileGrid(self)
         # Create spawn lists
         self._playerspawn = []
         self._enemyspawn = []
-        for i in range(self._rows):
-            for j in range(self._columns):
-                if self._tilemap[i][j].t_type == "player_spawn":
-                    self._playerspawn.append(self._tilemap[i][j])
-                elif self._tilemap[i][j].t_type == "enemy_spawn":
-                    self._enemyspawn.append(self._tilemap[i][j])
+        for index in range(size):
+            if self._tile_types[index] == PLAYER_SPAWN:
+                self._playerspawn.append(MapTile(self, index))
+            elif self._tile_types[index] == ENEMY_SPAWN:
+                self._enemyspawn.append(MapTile(self, index))
 
     @property
     def name(self):
@@ -195,6 +255,40 @@ class MapData:
     def tilemap(self):
         return self._tilemap
 
+    @property
+    def tile_types(self):
+        return self._tile_types
+
+    @property
+    def walls(self):
+        return self._walls
+
+    @property
+    def blocking(self):
+        return self._blocking
+
+    @property
+    def occupied(self):
+        return self._occupied
+
+    @property
+    def occupants(self):
+        return self._occupants
+
+    @property
+    def occupancy_version(self):
+        return self._occupancy_version
+
+    @property
+    def occupancy_hash(self):
+        return self._occupancy_hash
+
+    def _occupancy_key(self, index, unit):
+        key = self._occupancy_keys.get((index, unit))
+        if key is None:
+            key = self._occupancy_keys[(index, unit)] = self._occupancy_random.getrandbits(64)
+        return key
+
     def load_charmap(self):
         filename = os.path.join(PATH_TO_RESOURCES, "combat_maps", self._name)
         __in_file = open(filename + ".txt", "r")
@@ -206,45 +300,42 @@ class MapData:
             __char_map.append(line_split)
         return __char_map
 
-    def set_tile_adj(self):
-        for i in range(self._rows):
-            for j in range(self._columns):
-                if i == 0:
-                    if j == 0:
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i][j + 1])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i + 1][j])
-                    elif j == len(self._tilemap[i]) - 1:
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i][j - 1])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i + 1][j])
-                    else:
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i][j + 1])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i][j - 1])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i + 1][j])
-                elif i == len(self._tilemap) - 1:
-                    if j == 0:
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i][j + 1])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i - 1][j])
-                    elif j == len(self._tilemap[i]) - 1:
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i][j - 1])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i - 1][j])
-                    else:
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i][j + 1])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i][j - 1])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i - 1][j])
-                else:
-                    if j == 0:
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i][j + 1])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i - 1][j])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i + 1][j])
-                    elif j == len(self._tilemap[i]) - 1:
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i][j - 1])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i - 1][j])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i + 1][j])
-                    else:
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i][j + 1])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i][j - 1])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i - 1][j])
-                        self._tilemap[i][j].set_adjacency(self._tilemap[i + 1][j])
+    def is_occupied(self, x, y):
+        return self._occupied[y * self._columns + x] == 1
+
+    def is_blocking(self, x, y):
+        return self._blocking[y * self._columns + x] == 1
+
+    def occupy(self, x, y, unit):
+        index = y * self._columns + x
+        if self._occupied[index]:
+            self._occupancy_hash ^= self._occupancy_key(index, self._occupants[index])
+        self._occupied[index] = 1
+        self._occupants[index] = unit
+        self._occupancy_hash ^= self._occupancy_key(index, unit)
+        self._occupancy_version += 1
+
+    def unoccupy(self, x, y):
+        index = y * self._columns + x
+        if self._occupied[index]:
+            self._occupancy_hash ^= self._occupancy_key(index, self._occupants[index])
+        self._occupied[index] = 0
+        self._occupants[index] = NO_UNIT
+        self._occupancy_version += 1
+
+    def get_adjacent_tiles(self, x, y):
+        """Returns the tiles to the right, left, above and below the x, y tile coordinate that are on the map"""
+        index = y * self._columns + x
+        adjacent = []
+        if x < self._columns - 1:
+            adjacent.append(MapTile(self, index + 1))
+        if x > 0:
+            adjacent.append(MapTile(self, index - 1))
+        if y > 0:
+            adjacent.append(MapTile(self, index - self._columns))
+        if y < self._rows - 1:
+            adjacent.append(MapTile(self, index + self._columns))
+        return adjacent
 
     @property
     def enemyspawn(self):
@@ -252,4 +343,4 @@ class MapData:
 
     @property
     def playerspawn(self):
-        return self._playerspawn
\ No newline at end of file
+        return self._playerspawn
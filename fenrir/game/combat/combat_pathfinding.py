@@ -0,0 +1,88 @@
+"""
+.. module:: combat_pathfinding
+  :synopsis: binary heap A* search over the ai node tree, shared by player movement and the ai
+"""
+
+import heapq
+import itertools
+
+# every search gets a new id, nodes stamped with an older id are treated as cleared
+_search_ids = itertools.count(1)
+
+
+def a_star_search(startNode, goalX, goalY, mapData, goalRange=0, heuristicWeight=1, canEnterGoal=False):
+    """Runs A* from the start node towards the goal tile using a binary heap for the open list. Occupied tiles
+    can't be walked through. The search stops on the goal tile or, when a goal range is given, on the first tile
+    that is within that many tiles of the goal (used by the ai to stop once the target is in attack range).
+
+    :param startNode: (Node) node the search starts from
+    :param goalX: (int) x tile coordinate of the goal
+    :param goalY: (int) y tile coordinate of the goal
+    :param mapData: (obj) holds all the map information in the round, used for occupied tiles
+    :param goalRange: (int) distance from the goal that finishes the search, 0 means the goal must be reached
+    :param heuristicWeight: (float) weight of the distance to goal in the cost, values over 1 search less nodes
+    :param canEnterGoal: (boolean) allows the goal tile to be entered when it is occupied (ai target)
+
+    :returns: (Node, Node) the node the search finished on (None if it was not reached) and the node that got closest
+              to the goal. Paths are read by following get_parent() back to the start node.
+    """
+    searchId = next(_search_ids)
+
+    startNode.start_search(searchId)
+    startNode.set_distanceToGoal(goalX, goalY)
+    closestNode = startNode
+
+    # heap entries are (cost, order added, given cost, node), order breaks ties without comparing nodes
+    counter = itertools.count()
+    openHeap = [(startNode.get_distanceToGoal() * heuristicWeight, next(counter), 0, startNode)]
+    closedSet = set()
+
+    while openHeap:
+        _, _, givenCost, currentNode = heapq.heappop(openHeap)
+        x = currentNode.get_xPos()
+        y = currentNode.get_yPos()
+
+        # skip nodes already expanded and entries left behind when a cheaper path was found
+        if (x, y) in closedSet or givenCost != currentNode.get_givenCost():
+            continue
+        closedSet.add((x, y))
+
+        distanceToGoal = currentNode.get_distanceToGoal()
+        if distanceToGoal < closestNode.get_distanceToGoal():
+            closestNode = currentNode
+
+        if distanceToGoal <= goalRange:
+            return currentNode, closestNode
+
+        nodeGivenCost = givenCost + 1
+        for neighbor in currentNode.get_neighbors():
+            neighborX = neighbor.get_xPos()
+            neighborY = neighbor.get_yPos()
+            if (neighborX, neighborY) in closedSet:
+                continue
+            if mapData.is_occupied(neighborX, neighborY):
+                if not canEnterGoal or neighborX != goalX or neighborY != goalY:
+                    continue
+
+            if neighbor.start_search(searchId):
+                neighbor.set_distanceToGoal(goalX, goalY)
+            elif nodeGivenCost >= neighbor.get_givenCost():
+                continue
+
+            neighbor.set_parent(currentNode)
+            neighbor.set_givenCost(nodeGivenCost)
+            heapq.heappush(openHeap, (nodeGivenCost + neighbor.get_distanceToGoal() * heuristicWeight,
+                                      next(counter), nodeGivenCost, neighbor))
+
+    return None, closestNode
+
+
+def build_move_list(endNode):
+    """Builds the list of nodes to move through in reverse order (end node first), the start node is not included
+    """
+    moveList = []
+    currentNode = endNode
+    while currentNode.get_parent() is not None:
+        moveList.append(currentNode)
+        currentNode = currentNode.get_parent()
+    return moveList
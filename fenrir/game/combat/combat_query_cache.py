@@ -0,0 +1,55 @@
+"""
+.. module:: combat_query_cache
+  :synopsis: least recently used cache of combat searches keyed on where the units stand on the map
+"""
+
+from collections import OrderedDict
+
+# default max number of results kept
+DEFAULT_CACHE_SIZE = 256
+
+
+class CombatQueryCache:
+    """Class keeps the results of searches that depend on which tiles are occupied (paths, reachable tiles). Every
+        key is stored together with the occupancy hash of the map, so a result is only found again while the units
+        stand where they stood when it was stored, and again once they are back there. The least recently used
+        results are dropped once more than size are held.
+
+        :param mapData: (MapData) map the searches run on
+        :param size: (int) max number of results held
+    """
+
+    def __init__(self, mapData, size=DEFAULT_CACHE_SIZE):
+        self._map = mapData
+        self._size = size
+        self._results = OrderedDict()
+
+        # counters used for profiling the cache
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._results)
+
+    def get(self, key):
+        """Returns the result stored for the key with the current occupancy, None if there is none"""
+        full_key = (self._map.occupancy_hash, key)
+        result = self._results.get(full_key)
+        if result is None:
+            self.misses += 1
+        else:
+            self._results.move_to_end(full_key)
+            self.hits += 1
+        return result
+
+    def store(self, key, result):
+        """Stores the result for the key with the current occupancy and returns it"""
+        self._results[(self._map.occupancy_hash, key)] = result
+        while len(self._results) > self._size:
+            self._results.popitem(last=False)
+            self.evictions += 1
+        return result
+
+    def clear(self):
+        self._results.clear()
@@ -0,0 +1,105 @@
+"""
+.. module:: combat_reachability
+  :synopsis: breadth first search used to find the tiles a unit can move to or attack in the combat scene
+"""
+
+from fenrir.game.combat.combat_map_data import MapTile
+from fenrir.game.combat.combat_query_cache import CombatQueryCache, DEFAULT_CACHE_SIZE
+
+
+class CombatReachability:
+    """Class finds the tiles within range of a unit with a breadth first flood fill over the map arrays. Results are
+        cached per unit, position, range and map occupancy, so asking again while nothing moved (e.g. every frame
+        while the player picks a tile) doesn't search the map again.
+
+        :param mapData: (MapData) map the search runs on
+        :param cache_size: (int) max number of results kept
+    """
+
+    def __init__(self, mapData, cache_size=DEFAULT_CACHE_SIZE):
+        self._map = mapData
+        self._cache = CombatQueryCache(mapData, cache_size)
+
+    @property
+    def hits(self):
+        return self._cache.hits
+
+    @property
+    def misses(self):
+        return self._cache.misses
+
+    def movement_tiles(self, unit_id, x, y, move_range):
+        """Returns the tiles the unit can walk to, moving through tiles that are not blocking or occupied
+
+        :param unit_id: (int) id of the unit that is moving
+        :param x: (int) x tile coordinate of the unit
+        :param y: (int) y tile coordinate of the unit
+        :param move_range: (int) max number of tiles the unit can move
+        """
+        key = (unit_id, "movement", x, y, move_range)
+        tiles = self._cache.get(key)
+        if tiles is None:
+            blocking = self._map.blocking
+            occupied = self._map.occupied
+            indexes = self.flood_fill(x, y, move_range, lambda index: not blocking[index] and not occupied[index])
+            tiles = self._cache.store(key, [MapTile(self._map, index) for index in indexes])
+        return tiles
+
+    def attack_tiles(self, unit_id, x, y, attack_range, enemy_ids):
+        """Returns the tiles the unit can attack. Attacks go over anything but walls and can only land on empty
+        tiles or tiles holding an enemy
+
+        :param unit_id: (int) id of the unit that is attacking
+        :param x: (int) x tile coordinate of the unit
+        :param y: (int) y tile coordinate of the unit
+        :param attack_range: (int) max distance of the attack in tiles
+        :param enemy_ids: (set) ids of the units that can be attacked
+        """
+        key = (unit_id, "attack", x, y, attack_range)
+        tiles = self._cache.get(key)
+        if tiles is None:
+            walls = self._map.walls
+            occupied = self._map.occupied
+            occupants = self._map.occupants
+            indexes = [index for index in self.flood_fill(x, y, attack_range, lambda index: not walls[index])
+                       if not occupied[index] or occupants[index] in enemy_ids]
+            tiles = self._cache.store(key, [MapTile(self._map, index) for index in indexes])
+        return tiles
+
+    def flood_fill(self, x, y, max_range, passable):
+        """Returns the flat indexes of every tile reachable from x, y in at most max_range steps, moving only
+        through tiles where passable(index) is True. The start tile is not included.
+        """
+        columns = self._map.columns
+        rows = self._map.rows
+        start = y * columns + x
+        seen = {start}
+        frontier = [start]
+        reached = []
+
+        for _ in range(max_range):
+            next_frontier = []
+            for index in frontier:
+                tile_x = index % columns
+                # same neighbor order as MapData.get_adjacent_tiles (right, left, up, down)
+                if tile_x < columns - 1:
+                    self._visit(index + 1, seen, passable, next_frontier)
+                if tile_x > 0:
+                    self._visit(index - 1, seen, passable, next_frontier)
+                if index >= columns:
+                    self._visit(index - columns, seen, passable, next_frontier)
+                if index < (rows - 1) * columns:
+                    self._visit(index + columns, seen, passable, next_frontier)
+            if not next_frontier:
+                break
+            reached.extend(next_frontier)
+            frontier = next_frontier
+
+        return reached
+
+    @staticmethod
+    def _visit(index, seen, passable, next_frontier):
+        if index not in seen:
+            seen.add(index)
+            if passable(index):
+                next_frontier.append(index)
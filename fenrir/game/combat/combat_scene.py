@@ -1,20 +1,20 @@
 """ .. module:: scene
-    :synopsis: Module will load combat mode into game
+    :synopsis: Module will load combat mode into game. The rules of the battle are in CombatEngine, this scene
+               handles input, prompts, animations and sounds.
 """
 
 import os
 import pygame
 from fenrir.common.scene import Scene
+from fenrir.common.loading_scene import LoadingScene
 from fenrir.common.TextBox import TextBox
+from fenrir.common.asset_manager import assets
 import fenrir.game.overworld.overworld_scene_hub as overscene
-from fenrir.game.combat.combat_chars import ArcherChar, KnightChar, MageChar
+from fenrir.game.combat.combat_chars import ArcherChar, KnightChar, MageChar, prefetch_unit_frames
 import fenrir.game.combat.combat_map_data as md
 from fenrir.common.config import Colors, DisplaySettings, PATH_TO_RESOURCES, GameConstants
-from fenrir.game.combat.combat_initiative_system import CombatInitiativeSystem
 from fenrir.game.combat.combat_grid_system import CombatGridSystem
-from fenrir.game.combat.combat_move_list import combat_move_list
-from fenrir.game.combat.combat_ai_system import CombatAISystem
-from fenrir.game.combat.combat_ai_nodeTree import CombatAINodeTree
+from fenrir.game.combat.combat_engine import CombatEngine
 
 
 class CombatScene(Scene):
@@ -23,15 +23,17 @@ class CombatScene(Scene):
         super().__init__(screen, game_state)
         self._map_name = "combat_" + self.game_state.game_state_current_map
         self._map = md.MapData(self._map_name, 16, 9)
-        self._ai_Tree_init = CombatAINodeTree(16, 9, self._map)
-        self._ai_Tree = self._ai_Tree_init.get_ai_node_tree()
-        self._background = pygame.image.load(
-            os.path.join(PATH_TO_RESOURCES, "combat_maps", str(self._map_name + ".png")))
-        self._participants = self.add_participants()
+        self._background = assets.get_image(self.background_path(self.game_state))
+        # the engine owns the battle state, _participants is its list of living units
+        self._engine = CombatEngine(self._map, self.add_participants())
+        self._participants = self._engine.participants
         self._player_list = pygame.sprite.Group()
         self._combat_grid_system = CombatGridSystem(9, 16, self.screen)
 
         self._textbox = TextBox(self.screen)
+        # used for dirty rect rendering, static layer holds the background with the grid baked in
+        self._static_layer = None
+        self._drawn_rects = []
         # used to hide large prompt in middle of screen
         self._hide_prompt = False
 
@@ -40,16 +42,14 @@ class CombatScene(Scene):
         pygame.mixer.music.load(os.path.join(PATH_TO_RESOURCES, "soundtrack", "The Arrival (BATTLE II).wav"))
         pygame.mixer.music.set_volume(.4)
         pygame.mixer.music.play(-1)
-        self._sound_effects = {}
 
         # used for displaying on screen surface
         for player in self._participants:
             self._player_list.add(player)
 
-        # starts initiative system and sets current player and next player up
-        self.initiative_system = CombatInitiativeSystem(self._participants)
-        self.curr_player = self.initiative_system.get_current_player()  # first player to go
-        self.next_player = self.initiative_system.get_next_player_up()  # next player in the queue
+        # sets current player and next player up from the initiative order
+        self.curr_player = self._engine.current_unit  # first player to go
+        self.next_player = self._engine.next_unit  # next player in the queue
 
         # key binding values
         self.key_dict = {'SELECT': False, 'BACK': False, '1': False, '2': False,
@@ -57,7 +57,7 @@ class CombatScene(Scene):
         self.mouse_x, self.mouse_y = pygame.mouse.get_pos()
 
         # spawn players to the map
-        self.spawn_participants()
+        self._engine.spawn_participants()
 
         # attrs used for text box
         self.show_text_box = False
@@ -75,8 +75,6 @@ class CombatScene(Scene):
         self.attack_complete = False
         self.player_moving = False
         self.move_complete = False
-        self.move_counter = 2
-        self.player_used_attack = False
         self.ai_thinking = False
         self.ai_completed_decision = True  # this flag will be set when AI is thinking and True when not thinking
         self.enemy_attack_after_move = False
@@ -89,15 +87,11 @@ class CombatScene(Scene):
         self.ai_new_x = None
         self.ai_new_y = None
         self.target_to_attack = None
-        self.ai_brain = None
         self.ai_first_pass = False
         self.ai_turn_finished = False
         self.ai_movement_finished = False
         self.ai_attack_finished = False
 
-        # game won info
-        self.game_over = False
-        self.player_won = False
         # used to only play victory sound once
         self.played_victory_sound = False
 
@@ -120,7 +114,7 @@ class CombatScene(Scene):
         if event.type == pygame.KEYDOWN:
             if self._quit_screen:
                 if event.key == pygame.K_y:
-                    self.switch_to_scene(overscene.OverworldScene(self.screen, self.game_state))
+                    self.switch_to_scene(LoadingScene(self.screen, self.game_state, overscene.OverworldScene))
                 elif event.key == pygame.K_n:
                     self._quit_screen = False
             elif event.key == pygame.K_ESCAPE:
@@ -146,14 +140,29 @@ class CombatScene(Scene):
         self.mouse_x, self.mouse_y = pygame.mouse.get_pos()
 
     def render(self):
-        self.screen.fill(Colors.WHITE.value)
-        self.screen.blit(self._background, (0, 0))
-        self._combat_grid_system.draw_grid(self.mouse_x, self.mouse_y, self.curr_player.xpos, self.curr_player.ypos,
-                                           self._highlight_curr_player)
-        self._player_list.draw(self.screen)
+        if self._static_layer is None:
+            # background and grid never change, bake them once and repaint the whole screen on the first frame
+            self._static_layer = pygame.Surface(self.screen.get_size()).convert()
+            self._static_layer.fill(Colors.WHITE.value)
+            self._static_layer.blit(self._background, (0, 0))
+            self._combat_grid_system.draw_grid_lines(self._static_layer)
+            self.screen.blit(self._static_layer, (0, 0))
+            repaint_all = True
+        else:
+            # only erase what was drawn last frame, the rest of the screen is still the static layer
+            for rect in self._drawn_rects:
+                self.screen.blit(self._static_layer, rect, rect)
+            repaint_all = False
+
+        drawn_rects = self._combat_grid_system.draw_highlights(self.mouse_x, self.mouse_y, self.curr_player.xpos,
+                                                               self.curr_player.ypos, self._highlight_curr_player)
+        drawn_rects.extend(self.screen.blits([(player.image, player.draw_rect(self.interpolation))
+                                              for player in self._player_list]))
 
         for player in self._participants:
-            player.draw_health_bar(self.screen)
+            drawn_rects.append(player.draw_health_bar(self.screen, self.interpolation))
+
+        self._textbox.drawn_rects = drawn_rects
 
         self._combat_grid_system.clear_highlights()
 
@@ -183,13 +192,31 @@ class CombatScene(Scene):
             x, y = 320, 200
             self._textbox.draw_options("Are you sure you want to quit?", options, size, x, y)
 
+        # the display only needs to update areas drawn this frame or last frame
+        self.dirty_rects = None if repaint_all else self._drawn_rects + drawn_rects
+        self._drawn_rects = drawn_rects
+        self._textbox.drawn_rects = None
+
     def update(self):
+        for player in self._player_list:
+            player.save_position()
         self.play_game()
         self._player_list.update()
 
     #########################################
     # Helper functions for combat game play #
     #########################################
+    @staticmethod
+    def background_path(game_state):
+        return "combat_maps/combat_" + game_state.game_state_current_map + ".png"
+
+    @staticmethod
+    def prefetch(game_state):
+        # the background and the frames of every unit type in the battle are the slow part of building the scene
+        futures = [assets.prefetch_image(CombatScene.background_path(game_state))]
+        futures.extend(prefetch_unit_frames(list(game_state.player_party) + list(game_state.enemy_party)))
+        return futures
+
     def add_participants(self):
         participants = []
         unit_id = 0
@@ -215,20 +242,13 @@ class CombatScene(Scene):
 
         return participants
 
-    def spawn_participants(self):
-        for player in self._participants:
-            if player.get_is_enemy():
-                for tile in self._map.enemyspawn:
-                    if not tile.is_occupied:
-                        player.set_player_loc(tile.x_coord + 30, tile.y_coord + 30)
-                        tile.occupy(player.get_id())
-                        break
-            else:
-                for tile in self._map.playerspawn:
-                    if not tile.is_occupied:
-                        player.set_player_loc(tile.x_coord + 30, tile.y_coord + 30)
-                        tile.occupy(player.get_id())
-                        break
+    @property
+    def game_over(self):
+        return self._engine.game_over
+
+    @property
+    def player_won(self):
+        return self._engine.player_won
 
     def reset_keys(self):
         for key in self.key_dict:
@@ -245,10 +265,10 @@ class CombatScene(Scene):
         self.prompt_options = ""
 
     def update_initiative_system(self):
-        # will update initiative system with new list if player was removed
-        self.initiative_system.update_system()
-        self.curr_player = self.initiative_system.get_current_player()
-        self.next_player = self.initiative_system.get_next_player_up()
+        # ends the turn in the engine and picks up the next players from its initiative order
+        self._engine.end_turn()
+        self.curr_player = self._engine.current_unit
+        self.next_player = self._engine.next_unit
 
     def next_move(self):
         # this function resets all the logic needed to move to next turn
@@ -260,8 +280,6 @@ class CombatScene(Scene):
         self.player_moving = False
         self.move_complete = False
         self._move_selected = False
-        self.move_counter = 2
-        self.player_used_attack = False
         self._hide_prompt = False
         self.ai_first_pass = False
         self.ai_turn_finished = False
@@ -270,27 +288,23 @@ class CombatScene(Scene):
         self.update_initiative_system()
 
     def remove_dead_players(self):
-        index = 0
-        for player in self._participants:
-            if player.hp <= 0:
-                self._map.tilemap[(player.ypos - 30) // 60][
-                    (player.xpos - 30) // 60].unoccupy()
-                self.play_death_sound()
-                player.kill_player()
-                self.dead_player = player
-                self._participants.pop(index)
-                self.initiative_system.remove_player(player.get_id())
-                return True
-            else:
-                index += 1
+        # the engine takes dead units off the map and checks for a winner, the scene plays their death
+        dead_players = self._engine.remove_dead_units()
+        for player in dead_players:
+            self.play_death_sound()
+            player.kill_player()
+            self.dead_player = player
 
-        return False
+        return len(dead_players) > 0
+
+    def move_curr_player_to_tile(self, tile):
+        # starts the animation of the current player towards the x, y tile
+        self.curr_player.move_to(*self._engine.tile_center(*tile))
 
     def process_player_move(self):
         self.player_moving = True
 
-        movable_tiles = self.find_tiles_in_range(int(self.curr_player.xpos / 60), int(self.curr_player.ypos / 60),
-                                                 self.curr_player.move_range, self._map.tilemap, "movement")
+        movable_tiles = self._engine.movement_tiles(self.curr_player)
         highlight_tiles = []
         for tile in movable_tiles:
             x = int(tile.id[0] / 60)
@@ -316,21 +330,13 @@ class CombatScene(Scene):
                     if tile.id == end_tile:
                         selectable = True
                 if selectable:
-                    startingX = int((self.curr_player.xpos - 30) // 60)
-                    startingY = int((self.curr_player.ypos - 30) // 60)
                     endingX = int((end_tile[0]) // 60)
                     endingY = int((end_tile[1]) // 60)
-                    self._move_list = combat_move_list(startingX, startingY, endingX, endingY, self._ai_Tree, self._map)
+                    self._move_list = self._engine.player_move(endingX, endingY)
 
                     # initial move starts here
-                    self._map.tilemap[(self.curr_player.ypos - 30) // 60][
-                        (self.curr_player.xpos - 30) // 60].unoccupy()
-                    self._map.tilemap[endingY][endingX].occupy(self.curr_player.get_id)
-                    self.curr_player.move_to((self._move_list[-1].get_xPos() * 60) + 30,
-                                             (self._move_list[-1].get_yPos() * 60) + 30)
-
+                    self.move_curr_player_to_tile(self._move_list.pop(0))
                     self.play_movement_sound()
-                    self._move_list.pop()
                     self._highlight_curr_player = False
                     self._move_selected = True
                     self.wait_for_action = True
@@ -344,14 +350,10 @@ class CombatScene(Scene):
                 self._move_selected = False
                 self.move_complete = False
                 self.wait_for_action = False
-                self.move_counter -= 1
         elif self._move_list:
             if not self.curr_player.is_animating():
-                self.curr_player.move_to((self._move_list[-1].get_xPos() * 60) + 30,
-                                         (self._move_list[-1].get_yPos() * 60) + 30)
-
+                self.move_curr_player_to_tile(self._move_list.pop(0))
                 self.play_movement_sound()
-                self._move_list.pop()
 
             if not self._move_list:
                 self.move_complete = True
@@ -361,8 +363,7 @@ class CombatScene(Scene):
     def process_player_attack(self):
         self.player_attacking = True
 
-        attack_tiles = self.find_tiles_in_range(int(self.curr_player.xpos / 60), int(self.curr_player.ypos / 60),
-                                                self.curr_player.attack_range, self._map.tilemap, "attack")
+        attack_tiles = self._engine.attack_tiles(self.curr_player)
         highlight_tiles = []
         for tile in attack_tiles:
             x = int(tile.id[0] / 60)
@@ -390,16 +391,9 @@ class CombatScene(Scene):
                     # will be used to get player on tile to attack
                     x = int(end_tile[0] / 60)
                     y = int(end_tile[1] / 60)
-                    enemy_id = self._map.tilemap[y][x].unit
-                    for character in self._participants:
-                        if character.get_id() == enemy_id:
-                            if self.curr_player.get_type() == 'mage':
-                                character.take_damage(self.curr_player.magic_attack, 'magic')
-                                character.animate_damage()
-                            else:
-                                character.take_damage(self.curr_player.attack, 'physical')
-                                character.animate_damage()
-                            break
+                    character = self._engine.player_attack(x, y)
+                    if character is not None:
+                        character.animate_damage()
                     if self.curr_player.xpos == end_tile[0] + 30:
                         left = None
                     else:
@@ -420,9 +414,7 @@ class CombatScene(Scene):
             self._combat_grid_system.clear_highlights()
             if not self.curr_player.is_animating():
                 self.player_attacking = False
-                self.player_used_attack = True
                 self.wait_for_action = False
-                self.move_counter -= 1
 
     def process_ai_turn(self):
         # if the ai not done with the turn enter
@@ -440,8 +432,8 @@ class CombatScene(Scene):
             if not self.ai_first_pass:
                 self.show_prompt(f"{self.game_state.enemy_name}'s Turn",
                                  [f"{self.game_state.enemy_name} is deciding..."])
-                self.ai_brain = CombatAISystem(self._participants, self.curr_player, self._ai_Tree, self._map)
-                self.ai_new_x, self.ai_new_y, self.target_to_attack = self.ai_brain.decide_ai_action()
+                # tile to move to and unit to attack, the engine applies them while the scene animates
+                self.ai_new_x, self.ai_new_y, self.target_to_attack = self._engine.decide_ai_action(self.curr_player)
 
                 if self.ai_new_x is not None and self.ai_new_y is not None:
                     self.ai_movement_finished = False
@@ -461,41 +453,27 @@ class CombatScene(Scene):
             if self.ai_new_x is None and self.ai_new_y is None and self.target_to_attack is None:
                 self.ai_turn_finished = True
                 self.ai_completed_decision = True
-                self.game_over = True
+                self._engine.game_over = True
 
             # if there is a movement that needs to be made
             if not self.ai_movement_finished:
                 # if this is a mage they teleport
-                if self.curr_player.get_type() == "mage":
-                    self._map.tilemap[(self.curr_player.ypos - 30) // 60][
-                        (self.curr_player.xpos - 30) // 60].unoccupy()
-                    self._map.tilemap[(self.ai_new_y - 30) // 60][(self.ai_new_x - 30) // 60].occupy(
-                        self.curr_player.get_id())
-                    self.curr_player.move_to(self.ai_new_x, self.ai_new_y)
+                if self._engine.ai_teleports(self.curr_player):
+                    self._engine.move_unit(self.curr_player, self.ai_new_x, self.ai_new_y, teleport=True)
+                    self.move_curr_player_to_tile((self.ai_new_x, self.ai_new_y))
                     self._highlight_curr_player = False
                     self.play_movement_sound()
                     self.ai_first_pass = True
                     self.ai_movement_finished = True
-                elif self.curr_player.get_type() != "mage":
+                else:
                     if not self.ai_first_pass:
-                        # set parameters for building the list of tiles to move through (for knight and archer)
-                        startingX = int((self.curr_player.xpos - 30) / 60)
-                        startingY = int((self.curr_player.ypos - 30) / 60)
-                        endingX = int((self.ai_new_x - 30) / 60)
-                        endingY = int((self.ai_new_y - 30) / 60)
-                        self._move_list = combat_move_list(startingX, startingY, endingX, endingY,
-                                                           self._ai_Tree, self._map)
+                        # knights and archers walk the path through the tiles (empty if there is no path)
+                        self._move_list = self._engine.move_unit(self.curr_player, self.ai_new_x, self.ai_new_y)
                         if len(self._move_list) > 0:
-                            self._map.tilemap[(self.curr_player.ypos - 30) // 60][
-                                (self.curr_player.xpos - 30) // 60].unoccupy()
-                            self.curr_player.move_to((self._move_list[-1].get_xPos() * 60) + 30,
-                                                     (self._move_list[-1].get_yPos() * 60) + 30)
-                            self._map.tilemap[(self.ai_new_y - 30) // 60][(self.ai_new_x - 30) // 60].occupy(
-                                self.curr_player.get_id())
+                            self.move_curr_player_to_tile(self._move_list.pop(0))
                             self._highlight_curr_player = False
                             self.play_movement_sound()
                             self.ai_first_pass = True
-                            self._move_list.pop()
                         else:
                             self.ai_movement_finished = True
                             self.enemy_moved = False
@@ -504,31 +482,23 @@ class CombatScene(Scene):
 
                     if self._move_list:
                         if not self.curr_player.is_animating():
-                            self.curr_player.move_to((self._move_list[-1].get_xPos() * 60) + 30,
-                                                     (self._move_list[-1].get_yPos() * 60) + 30)
+                            self.move_curr_player_to_tile(self._move_list.pop(0))
                             self.play_movement_sound()
-                            self._move_list.pop()
                     else:
                         if not self.curr_player.is_animating():
                             self.ai_movement_finished = True
 
             if self.ai_movement_finished and not self.ai_attack_finished:
-                for character in self._participants:
-                    if character.get_id() == self.target_to_attack:
-                        if self.curr_player.get_type() == 'mage':
-                            character.take_damage(self.curr_player.magic_attack, 'magic')
-                            character.animate_damage()
-                        else:
-                            character.take_damage(self.curr_player.attack, 'physical')
-                            character.animate_damage()
-                        if character.rect.centerx < self.curr_player.xpos:
-                            left = True
-                        else:
-                            left = False
-                        self.curr_player.attack_enemy(left)
-                        self.play_attack_sound()
-                        self.ai_attack_finished = True
-                        break
+                character = self.target_to_attack
+                self._engine.attack_unit(self.curr_player, character)
+                character.animate_damage()
+                if character.rect.centerx < self.curr_player.xpos:
+                    left = True
+                else:
+                    left = False
+                self.curr_player.attack_enemy(left)
+                self.play_attack_sound()
+                self.ai_attack_finished = True
 
             if self.ai_attack_finished and self.ai_movement_finished:
                 self.ai_turn_finished = True
@@ -567,23 +537,6 @@ class CombatScene(Scene):
                     self.enemy_attacked = False
                     self.next_move()
 
-    def check_for_winner(self):
-        player_alive = False
-        enemy_alive = False
-
-        for player in self._participants:
-            if player.get_is_enemy():
-                enemy_alive = True
-            else:
-                player_alive = True
-
-        if not player_alive:
-            self.player_won = False
-            self.game_over = True
-        elif not enemy_alive:
-            self.player_won = True
-            self.game_over = True
-
     ##########################################################################
     # Co Routine that is called each time in the loop and handles game logic #
     ##########################################################################
@@ -591,7 +544,6 @@ class CombatScene(Scene):
     def play_game(self):
 
         if self.remove_dead_players():
-            self.check_for_winner()
             if self.game_over:
                 self.next_move()
 
@@ -625,7 +577,7 @@ class CombatScene(Scene):
                 if self.player_won:
                     self.game_state.increase_player_level()
                 pygame.mixer.stop()
-                self.switch_to_scene(overscene.OverworldScene(self.screen, self.game_state))
+                self.switch_to_scene(LoadingScene(self.screen, self.game_state, overscene.OverworldScene))
 
         elif self.turn_counter == 0:
             self.show_prompt("Welcome to combat", ["Press [Enter] to get started!",
@@ -649,16 +601,16 @@ class CombatScene(Scene):
 
             else:
                 if not self.player_attacking and not self.player_moving:
-                    if self.move_counter:
+                    if self._engine.actions_left:
                         # highlights current player on board
                         self._highlight_curr_player = True
 
                         # options depending on possible moves left
-                        choices = ["[1] Move", "[2] Skip Turn"] if self.player_used_attack else ["[1] Move",
+                        choices = ["[1] Move", "[2] Skip Turn"] if self._engine.used_attack else ["[1] Move",
                                                                                                  "[2] Attack",
                                                                                                  "[3] Skip Turn"]
-                        prompt_text = f"You have {self.move_counter}"
-                        if self.move_counter == 2:
+                        prompt_text = f"You have {self._engine.actions_left}"
+                        if self._engine.actions_left == 2:
                             prompt_text += " choices left"
                         else:
                             prompt_text += " choice left"
@@ -698,68 +650,10 @@ class CombatScene(Scene):
         y_pos = int(mouse_pos[1] / 60) * 60
         return x_pos, y_pos
 
-    def find_tiles_in_range(self, x_pos, y_pos, input_range, combat_map, select_type):
-        selectable_tiles = []
-        for tile in combat_map[y_pos][x_pos].adjacencies:
-            if select_type == "movement":
-                if not tile.is_wall and not tile.is_blocking and not tile.is_occupied:
-                    selectable_tiles.append(tile)
-            elif select_type == "attack":
-                if not tile.is_wall:
-                    selectable_tiles.append(tile)
-        input_range -= 1
-        while input_range > 0:
-            new_tiles = []
-            for i in range(len(selectable_tiles)):
-                for tile in selectable_tiles[i].adjacencies:
-                    _unique = True
-                    for s_tile in selectable_tiles:
-                        if tile.id == s_tile.id:
-                            _unique = False
-                    if _unique:
-                        if select_type == "movement":
-                            if not tile.is_wall and not tile.is_blocking and not tile.is_occupied:
-                                new_tiles.append(tile)
-                        elif select_type == "attack":
-                            if not tile.is_wall:
-                                new_tiles.append(tile)
-            selectable_tiles.extend(new_tiles)
-            input_range -= 1
-        s_tile_ids = []
-        semi_selectable_tiles = []
-        final_selectable_tiles = []
-        for tile in selectable_tiles:
-            if tile.id not in s_tile_ids:
-                s_tile_ids.append(tile.id)
-        for tile_id in s_tile_ids:
-            semi_selectable_tiles.append(combat_map[int(tile_id[1] / 60)][int(tile_id[0] / 60)])
-        for tile in semi_selectable_tiles:
-            if select_type == "movement":
-                final_selectable_tiles = semi_selectable_tiles
-            elif select_type == "attack":
-                if not tile.is_occupied:
-                    final_selectable_tiles.append(tile)
-                elif tile.is_occupied:
-                    occ = "player"
-                    occ_id = tile.unit
-                    for units in self._participants:
-                        if occ_id == units.get_id() and not units.get_is_enemy():
-                            occ = "player"
-                        elif occ_id == units.get_id() and units.get_is_enemy():
-                            occ = "enemy"
-                    if occ == "enemy":
-                        final_selectable_tiles.append(tile)
-        return final_selectable_tiles
-
     def play_sound_effect(self, sound_name, time_lim=None):
-        # function play sound from library or load it if not there yet
+        # function play sound from the shared asset cache, it is loaded on first use
 
-        if sound_name in self._sound_effects.keys():
-            sound = self._sound_effects[sound_name]
-        else:
-            path = os.path.join(PATH_TO_RESOURCES, "soundtrack", "combat_char_sounds", sound_name + ".wav")
-            sound = pygame.mixer.Sound(path)
-            self._sound_effects[sound_name] = sound
+        sound = assets.get_sound("soundtrack/combat_char_sounds/" + sound_name + ".wav")
         sound.set_volume(.7)
 
         # optional time limit for sound effect, currently used for walking to match char pace
@@ -1,16 +1,27 @@
 import pygame
 from fenrir.common.scene import Scene
+from fenrir.common.loading_scene import LoadingScene
 import fenrir.game.overworld.overworld_scene_hub as overscene
 from fenrir.common.config import *
+from fenrir.common.asset_manager import assets
 from fenrir.data.load_game_from_db import *
+from fenrir.data.save_writer import save_writer
 import time
 
+# seconds the input cursor is shown and hidden for
+CURSOR_BLINK_TIME = 0.5
+SAVE_STATUS_TEXT_SIZE = 30
+
 
 ##########################################################
 #   ABSTRACT MENU SCENE - USED CREATE MENUS W/CURSORS    #
 ##########################################################
 class MenuScene(Scene):
 
+    # menus only change on key presses, nothing is drawn while waiting for one and the mouse is not used
+    idle = True
+    blocked_events = (pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP, pygame.MOUSEWHEEL)
+
     def __init__(self, screen, game_state):
         super().__init__(screen, game_state)
         # default variables that will be implemented in subclasses
@@ -39,8 +50,7 @@ class MenuScene(Scene):
         pass
 
     def draw_text_to_screen(self, text, size, x, y, rect_index=None):
-        font = pygame.font.Font(None, size)
-        text_surface = font.render(text, True, Colors.WHITE.value)
+        text_surface = assets.get_text(text, None, size, Colors.WHITE.value)
         text_rect = text_surface.get_rect()
         text_rect.center = (x, y)
 
@@ -80,21 +90,44 @@ class MenuScene(Scene):
 #       MAIN MENU SCENE - LOADED WHEN GAME STARTS        #
 ##########################################################
 class MainMenuScene(MenuScene):
+    """Main menu, also shown after quitting the overworld. If the game was saved on the way out the save is still
+        being written by the save writer, the menu keeps updating until it is done, shows whether it worked and
+        stores the id of the new save row in the game state.
 
-    def __init__(self, screen, game_state):
+        :param save_future: (Future) optional, future returned by save_writer.submit for the game state
+    """
+
+    def __init__(self, screen, game_state, save_future=None):
         super().__init__(screen, game_state)
         self._menu_title = "Project Fenrir"
         self._menu_items = ["New Game", "Load Game", "Credits", "Exit"]
         self._highlighted_items = [False for item in self._menu_items]
 
+        self._save_future = save_future
+        self._save_status = "Saving..." if save_future is not None else ""
+        # nothing wakes an idle scene when the save is done, the menu stays awake until then
+        self.idle = save_future is None
+
     def update(self):
-        pass
+        if self._save_future is not None and self._save_future.done():
+            # read on the main thread so the game state is only ever changed there
+            if self._save_future.exception() is None:
+                self.game_state.player_id = self._save_future.result()
+                self._save_status = "Game saved"
+            else:
+                self._save_status = "Saving the game failed"
+            self._save_future = None
+            self.idle = True
 
     def render(self):
         self.screen.fill(Colors.BLACK.value)
         self.draw_title()
         self.display_menu_items(self.starting_height)
         self.draw_cursor()
+        if self._save_status:
+            text = assets.get_text(self._save_status, None, SAVE_STATUS_TEXT_SIZE, Colors.WHITE.value)
+            width, height = DisplaySettings.SCREEN_RESOLUTION.value
+            self.screen.blit(text, text.get_rect(bottomright=(width - 20, height - 20)))
 
     def select_menu_item(self, index):
         if index == 0:
@@ -115,11 +148,19 @@ class LoadGameScene(MenuScene):
     def __init__(self, screen, game_state):
         super().__init__(screen, game_state)
         self._menu_title = "Saved Games"
-        self._saved_games = sorted(load_game_save_titles(), key=lambda x: x[2], reverse=True)
+        # saves still waiting in the writer queue have to be in the list
+        save_writer.flush()
+        self._saves_per_page = 4
+        # only the saves of the shown page are loaded, _saved_games holds the rows of the current page
+        self._saved_games = load_game_save_page(self._saves_per_page)
+        # (saved_at, id) of the last row of every page before the current one, used to go back
+        self._page_keys = []
+        self._next_page_saves = None
         self._menu_items = []
         self._curr_page_num = 1
-        self._pages = int(len(self._saved_games) / 4 if len(self._saved_games) % 4 == 0
-                          else len(self._saved_games) // 4 + 1)
+        save_count = count_game_saves()
+        self._pages = int(save_count / self._saves_per_page if save_count % self._saves_per_page == 0
+                          else save_count // self._saves_per_page + 1)
         self._prev_page = False
         self._next_page = False
         self.populate_menu_items()
@@ -129,16 +170,7 @@ class LoadGameScene(MenuScene):
         if self._saved_games:
             self.starting_height = DisplaySettings.CENTER_HEIGHT.value - 100
 
-            if self._curr_page_num == self._pages:
-                if len(self._saved_games) % 4 == 0:
-                    stopIndex = 4
-                else:
-                    stopIndex = len(self._saved_games) % 4
-            else:
-                stopIndex = 4
-
-            for i in range(1, stopIndex + 1):
-                save = self._saved_games[i * self._curr_page_num - 1]
+            for save in self._saved_games:
                 self._menu_items.append("Player Name: " + save[1] + "    Last Saved: " + save[2])
         else:
             self.starting_height = DisplaySettings.SCREEN_RESOLUTION.value[1] - 50
@@ -150,6 +182,11 @@ class LoadGameScene(MenuScene):
         if self._curr_page_num < self._pages:
             self._menu_items.append("Next Page")
             self._next_page = True
+            # the next page is read now so turning the page doesn't wait on the database
+            if self._next_page_saves is None:
+                self._next_page_saves = load_game_save_page(self._saves_per_page, self.last_save_key())
+        else:
+            self._next_page_saves = None
 
         self._menu_items.append("Main Menu")
 
@@ -172,20 +209,17 @@ class LoadGameScene(MenuScene):
             elif self._prev_page:
                 self.show_prev_page()
             else:
-                gameIndex = 4 * (self._curr_page_num - 1) + index
-                self.game_state = load_game_save_by_id(self._saved_games[gameIndex][0])
-                self.switch_to_scene(overscene.OverworldScene(self.screen, self.game_state))
+                self.game_state = load_game_save_by_id(self._saved_games[index][0])
+                self.switch_to_scene(LoadingScene(self.screen, self.game_state, overscene.OverworldScene))
         elif index == len(self._menu_items) - 3 and self._next_page:
             if self._prev_page:
                 self.show_prev_page()
             else:
-                gameIndex = 4 * (self._curr_page_num - 1) + index
-                self.game_state = load_game_save_by_id(self._saved_games[gameIndex][0])
-                self.switch_to_scene(overscene.OverworldScene(self.screen, self.game_state))
+                self.game_state = load_game_save_by_id(self._saved_games[index][0])
+                self.switch_to_scene(LoadingScene(self.screen, self.game_state, overscene.OverworldScene))
         else:
-            gameIndex = 4 * (self._curr_page_num - 1) + index
-            self.game_state = load_game_save_by_id(self._saved_games[gameIndex][0])
-            self.switch_to_scene(overscene.OverworldScene(self.screen, self.game_state))
+            self.game_state = load_game_save_by_id(self._saved_games[index][0])
+            self.switch_to_scene(LoadingScene(self.screen, self.game_state, overscene.OverworldScene))
 
     def display_menu_items(self, start_height):
         i = 0
@@ -201,9 +235,17 @@ class LoadGameScene(MenuScene):
             self.draw_text_to_screen("No saved games yet!", 40, DisplaySettings.CENTER_WIDTH.value,
                                      DisplaySettings.CENTER_HEIGHT.value)
 
+    def last_save_key(self):
+        save = self._saved_games[-1]
+        return save[3], save[0]
+
     def show_prev_page(self):
         self.cursor_pos = 0
         self._curr_page_num -= 1
+        self._next_page_saves = self._saved_games
+        self._page_keys.pop()
+        after = self._page_keys[-1] if self._page_keys else None
+        self._saved_games = load_game_save_page(self._saves_per_page, after)
         self.menu_item_rects = []
         self._menu_items = []
         self._next_page = False
@@ -213,6 +255,9 @@ class LoadGameScene(MenuScene):
     def show_next_page(self):
         self.cursor_pos = 0
         self._curr_page_num += 1
+        self._page_keys.append(self.last_save_key())
+        self._saved_games = self._next_page_saves
+        self._next_page_saves = None
         self.menu_item_rects = []
         self._menu_items = []
         self._next_page = False
@@ -274,6 +319,13 @@ class NewGameScene(MenuScene):
         self._input_curs_rect = pygame.Rect(0, 0, 10, 30)
         self.game_state = GameState()
 
+    @property
+    def idle_timeout(self):
+        # wake up when the input cursor blinks, it is shown for the second half of every second
+        if self._inputting_name:
+            return int((CURSOR_BLINK_TIME - time.time() % CURSOR_BLINK_TIME) * 1000) + 1
+        return 0
+
     def render(self):
         self.screen.fill(Colors.BLACK.value)
         self.draw_title()
@@ -290,7 +342,7 @@ class NewGameScene(MenuScene):
         if self._inputting_name:
             if index == 0:
                 self.game_state.player_name = self._input_text
-                self.switch_to_scene(overscene.OverworldScene(self.screen, self.game_state))
+                self.switch_to_scene(LoadingScene(self.screen, self.game_state, overscene.OverworldScene))
             elif index == 1:
                 self.switch_to_scene(NewGameScene(self.screen, self.game_state))
         else:
@@ -306,8 +358,7 @@ class NewGameScene(MenuScene):
         self._input_rect.center = (DisplaySettings.CENTER_WIDTH.value, DisplaySettings.CENTER_HEIGHT.value)
         self.draw_text_to_screen("Enter Player Name", 50, DisplaySettings.CENTER_WIDTH.value,
                                  DisplaySettings.CENTER_HEIGHT.value - self.menu_item_spacer)
-        font = pygame.font.SysFont(None, 40)
-        txt_img = font.render(self._input_text, True, Colors.WHITE.value)
+        txt_img = assets.get_text(self._input_text, None, 40, Colors.WHITE.value)
         rect = txt_img.get_rect()
         rect.size = txt_img.get_size()
         rect.center = self._input_rect.center
@@ -316,7 +367,7 @@ class NewGameScene(MenuScene):
 
         pygame.draw.rect(self.screen, Colors.WHITE.value, self._input_rect, 1)
 
-        if time.time() % 1 > 0.5:
+        if time.time() % (CURSOR_BLINK_TIME * 2) > CURSOR_BLINK_TIME:
             pygame.draw.rect(self.screen, Colors.WHITE.value, self._input_curs_rect)
 
     def handle_event(self, event):
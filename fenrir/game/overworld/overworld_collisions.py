@@ -18,42 +18,64 @@ class Collision:
         obstacle = pygame.Rect(obstacle.x, obstacle.y, obstacle.width, obstacle.height)
         return obstacle
 
-    def npc_collision(self, hero, npc):
+    # The methods below take the spatial hash of a world (see overworld_world_obj) and only test the rects found
+    # near the hero in it
+    def npc_collisions(self, hero, npc_index):
+        """Returns the set of positions of the npcs the hero is colliding with"""
         hero_rect = self.make_character_rect(hero)
-        npc_rect = self.make_character_rect(npc)
 
         self.repulsion = 0
 
-        if self.check_collision(hero_rect, npc_rect):
-            return True
-        else:
-            return False
+        return {index for index in npc_index.query(hero_rect) if self.check_collision(hero_rect, npc_index.rect(index))}
 
-    def barrier_collision(self, hero, obstacles):
+    def barrier_collision(self, hero, obstacle_index):
         hero_rect = self.make_character_rect(hero)
-        obstacle_rects = list()
-        if obstacles:
-            for obstacle in obstacles:
-                obstacle_rects.append(self.make_obstacle_rect(obstacle))
-
-        for obstacle_rect in obstacle_rects:
-            if self.check_collision(hero_rect, obstacle_rect):
+        for index in obstacle_index.query(hero_rect):
+            if self.check_collision(hero_rect, obstacle_index.rect(index)):
                 return True
         return False
 
-    def entry_collision(self, hero, entries):
+    def move_and_slide(self, hero, dx, dy, obstacle_index, boundaries):
+        """Moves the hero rect by dx, dy pixels and returns its new (x, y). Each axis is moved on its own, a move that
+        runs into an obstacle stops at its edge while the other axis keeps going, so the hero slides along walls.
+        Obstacles are looked up over the whole area the move sweeps, a fast move can't skip over a thin one.
+        Obstacles the hero already overlaps are ignored so it can always walk out of them.
+        """
         hero_rect = self.make_character_rect(hero)
-        entry_rects = list()
-        if entries:
-            # There are obstacles to consider
-            for entry in entries:
-                entry_rects.append(self.make_obstacle_rect(entry))
+        if dx:
+            dx = self.sweep(hero_rect, dx, 0, obstacle_index)
+            hero_rect.x += dx
+        if dy:
+            dy = self.sweep(hero_rect, 0, dy, obstacle_index)
+            hero_rect.y += dy
+        hero_rect = boundaries.keep_inside(hero_rect)
+        return hero_rect.x, hero_rect.y
 
-        self.entry_index = 0
-        for entry_rect in entry_rects:
-            if self.check_collision(hero_rect, entry_rect):
+    @staticmethod
+    def sweep(hero_rect, dx, dy, obstacle_index):
+        # returns how far along the axis (dx or dy, the other one is 0) the rect moves before it touches an obstacle
+        swept = hero_rect.union(hero_rect.move(dx, dy))
+        for index in obstacle_index.query(swept):
+            obstacle_rect = obstacle_index.rect(index)
+            if obstacle_rect.colliderect(hero_rect):
+                continue
+            if dx > 0:
+                dx = min(dx, obstacle_rect.left - hero_rect.right)
+            elif dx < 0:
+                dx = max(dx, obstacle_rect.right - hero_rect.left)
+            elif dy > 0:
+                dy = min(dy, obstacle_rect.top - hero_rect.bottom)
+            else:
+                dy = max(dy, obstacle_rect.bottom - hero_rect.top)
+        return dx or dy
+
+    def entry_collision(self, hero, entry_index):
+        hero_rect = self.make_character_rect(hero)
+        for index in entry_index.query(hero_rect):
+            if self.check_collision(hero_rect, entry_index.rect(index)):
+                self.entry_index = index
                 return True
-            self.entry_index = self.entry_index + 1
+        self.entry_index = len(entry_index)
         return False
 
     def get_collided_entry(self):
@@ -1,11 +1,11 @@
-import pygame
+from fenrir.common.asset_manager import assets
 
 class overworld_npc:
     def __init__(self, name, x, y,  filename, level, party, show_interaction, is_choice, dialogue):
         self.__name = name
         self.__x = x
         self.__y = y
-        self.__sprite = pygame.image.load(filename)
+        self.__sprite = assets.get_image(filename)
         self.__level = level
         self.__party = party
         self.__show_interaction = show_interaction
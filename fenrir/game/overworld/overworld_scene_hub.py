@@ -6,208 +6,47 @@ import pygame
 import fenrir.game.menu.menu_scene as menuscene
 import fenrir.game.combat.combat_scene as combscene
 from fenrir.common.scene import Scene
-from fenrir.common.config import Colors, PATH_TO_RESOURCES
+from fenrir.common.loading_scene import LoadingScene
+from fenrir.common.config import Colors, GameConstants, PATH_TO_RESOURCES
 from fenrir.common.TextBox import TextBox
-from fenrir.game.overworld.overworld_npc import overworld_npc as character
+from fenrir.common.asset_manager import assets
 from fenrir.game.overworld.overworld_npc_animated import overworld_npc_animated as character_animated
 from fenrir.game.overworld.overworld_boundaries import Boundaries
 from fenrir.game.overworld.overworld_collisions import Collision
-from fenrir.game.overworld.overworld_obstacle import overworld_obstacle as obstacle
-from fenrir.data.save_game_to_db import save_game
+from fenrir.data.save_writer import save_writer
 from fenrir.game.overworld.inventory import Inventory
-from fenrir.game.overworld.overworld_world_obj import overworld_world_obj as world_obj
+from fenrir.game.overworld.overworld_worlds import get_worlds
+
+# pixels the hero walks per second on each axis
+HERO_SPEED = 300
+# seconds each image of the walk animation is shown
+HERO_FRAME_TIME = 0.1
 
 
 class OverworldScene(Scene):
     def __init__(self, screen, game_state):
         super().__init__(screen, game_state)
 
-        # new world objs
-        self.hub_world = world_obj(
-            map_name="hub_world",
-            obstacles=[
-                obstacle(0, 0, 300, 180),  # Flower_Patch_Barrier
-                obstacle(480, 0, 60, 200),  # Left_House_Barrier
-                obstacle(550, 0, 88, 165),  # Center_house_Barrier
-                obstacle(640, 0, 210, 200),  # House_River_Bridge_Barrier
-                obstacle(736, 350, 130, 60),  # bottom_river_Barrier
-                obstacle(634, 477, 326, 80),  # Bottom_River_Left_Barrier
-                obstacle(0, 410, 180, 139),  # Pond_Barrier
-            ],
-            entries=[
-                obstacle(959, 255, 1, 70),  # World_1_Entry (Dark Dessert/Right Path)
-                obstacle(301, 1, 100, 1),  # World_3_Entry (Dark World/ Top Path)
-            ],
-            entry_dests=[],
-            # FILL in with npc data:
-            # character(npc name, x, y, png name, level, party members[], can you interact with npc? (boolean 1),
-            # is just text or a choice for the player? (boolean 2), dialogue[])
-            npc=[character("Sensei", 220, 320, os.path.join(PATH_TO_RESOURCES, "chars", "sensei", "sensei.png"), 1,
-                           [], False, False,
-                           [
-                               "Gabe, I if you want to defeat the evil lord for tak-ing over the world you will need to become stronger. In order to do that you need to learn how to fight.",
-                               "You'll be giving commands to your party once com-   bat begins. Once it's their turn, choose a command  using the corresponding number."
-                               ,
-                               "Then, if you want them to act you'll have to tell   them which tile to attack or move to.",
-                               "You can test your skill by challenging my apprenti- ces! I sent them all around the world to aid you in your journey. Good luck."]),
-
-                 character("apprentice", 20, 255, os.path.join(PATH_TO_RESOURCES, "chars", "hat-guy", "hat-guy.png"), 1,
-                           [["knight", "chars/knight/knight_menu.png"], ["mage", "chars/mage/mage_menu.png"],
-                            ["archer", "chars/archer/archer_menu.png"], ["knight", "chars/knight/knight_menu.png"]],
-                           False, True,
-                           ["Try to defeat me if you can boy!",
-                            "[1] I am ready!", "[2] J-Just wait a second! I am not ready"]),
-                 character("Mani", 640, 380, os.path.join(PATH_TO_RESOURCES, "chars", "mani", "mani.png"), 1,
-                           [], False, False,
-                           [
-                               "Hello Gabe, I will teach all you need to know about  this world. Press the [Spacebar] if you want me to go on",
-                               "You can move by pressing the [WASD] keys, but you   probably already know that as you had to walk to ta-lk to me"
-                               ,
-                               "Pressing [i] will open the inventory. That is where you will be able to view and manage your party.",
-                               "Your party and your ability to guide them will be   your strongest weapon in the coming trials.",
-                               "If you want review the controls again you can either press [q] or talk to me again.",
-                               "Okay! Now that I finish explaining things you should talk to sensei to learn about combat"]),
-
-                 ],
-            hero_spawn=(self.game_state.game_state_location_x, self.game_state.game_state_location_y),
-            background=pygame.image.load(os.path.join(PATH_TO_RESOURCES, "overworld_maps", "hub_world.png")),
-            music="Windless Slopes"
-        )
-
-        self.ashlands = world_obj(
-            map_name="ashlands",
-            obstacles=[
-                obstacle(0, 0, 280, 170),  # Top left prompts
-                obstacle(281, 0, 180, 70),  # Top left stone wall
-                obstacle(650, 0, 250, 70),  # Top right stone wall
-                obstacle(0, 410, 75, 70),  # Bottom left prompts
-                obstacle(200, 410, 70, 1),  # Bottom left prompts (fallen tree)
-                obstacle(760, 410, 1, 1),  # Bottom tombstone
-                obstacle(740, 280, 1, 1),  # Middle tombstone
-                obstacle(860, 160, 1, 1)  # Top tombstone (looks broken)
-            ],
-            entries=[
-                obstacle(1, 240, 1, 100),  # Hub Entry
-                obstacle(490, 0, 120, 1),  # atlantis
-            ],
-            entry_dests=[],
-            npc=[character("Twin Apprentice", 350, 430,
-                           os.path.join(PATH_TO_RESOURCES, "chars", "hat-guy", "hat-guy.png"), 2,
-                           [], False, False,
-                           ["Oh Gabe! Good to see you here!",
-                            "You can train with my twin brother over there if    you feel like it. "
-                            "I am not much of a fighter myself.",
-                            "I came here because I heard rumors of a mystical    creature living inside the ruins",
-                            "If the rumors are true and something is there, I    am confident it will help you train to defeat the   demon lord.",
-                            "I think it is worth giving it a try"]),
-
-                 character("Apprentice", 850, 240,
-                           os.path.join(PATH_TO_RESOURCES, "chars", "hat-guy", "hat-guy-left.png"), 2,
-                           [["knight", "chars/knight/knight_menu.png"], ["mage", "chars/mage/mage_menu.png"],
-                            ["archer", "chars/archer/archer_menu.png"], ["archer", "chars/archer/archer_menu.png"]],
-                           False, True,
-                           ["Gabe! Lets train for a bit, I am bored of been here doing nothing", "",
-                            "[1] Lets do it!      [2] Sorry, I don't feel like it"])
-                 ],
-            hero_spawn=(self.game_state.game_state_location_x, self.game_state.game_state_location_y),
-            background=pygame.image.load(os.path.join(PATH_TO_RESOURCES, "overworld_maps", "ashlands.png")),
-            music="Windless Slopes"
-        )
-
-        self.atlantis_world = world_obj(
-            map_name="atlantis",
-            obstacles=[
-                obstacle(0, 0, 165, 170),  # Left_Column_Barrier
-                obstacle(189, 0, 60, 60),  # left_Column_Rocks
-                obstacle(350, 0, 20, 60),  # Left_Entry
-                obstacle(560, 0, 50, 60),  # Right_Entry
-                obstacle(860, 0, 110, 120),  # right_column
-                obstacle(730, 0, 70, 20),  # right_column_pebbles
-                obstacle(390, 191, 10, 90),  # left_barricade
-                obstacle(401, 191, 120, 100),  # top_barricade
-                obstacle(550, 191, 10, 90),  # right_barricade
-                obstacle(766, 298, 87, 60),  # anchor_barrier
-                obstacle(0, 350, 60, 40),  # pot_barrier
-                obstacle(0, 430, 100, 20),  # half_column_barrier (bottom right)
-                obstacle(0, 460, 960, 80),  # sea_wall_barrier
-                obstacle(860, 430, 100, 20),  # half_column_barrier (bottom left)
-            ],
-            entries=[
-                obstacle(430, 0, 100, 1)  # ashlands
-            ],
-            entry_dests=[
-                self.ashlands
-            ],
-            npc=[character("Mermaid", 439, 230, os.path.join(PATH_TO_RESOURCES, "chars", "mermaid", "mermaid.png"), 3,
-                           [["knight", "chars/knight/knight_menu.png"], ["knight", "chars/knight/knight_menu.png"],
-                            ["archer", "chars/archer/archer_menu.png"], ["archer", "chars/archer/archer_menu.png"]],
-                           False, True,
-                           [
-                               "I have heard of your mission human boy. If you      beat me you will have enough power to defeat evil.",
-                               "", "[1] I will do my best!      [2] I am not ready yet"])
-                 ],
-            hero_spawn=(400, 25),
-            background=pygame.image.load(os.path.join(PATH_TO_RESOURCES, "overworld_maps", "atlantis.png")),
-            music="Windless Slopes"
-        )
-
-        self.dark_dimension = world_obj(
-            map_name="dark_dimension",
-            obstacles=[
-                obstacle(0, 0, 400, 542),  # Main_barrier_left
-                obstacle(570, 0, 404, 540),  # Main_barrier_right
-
-            ],
-            entries=[
-                obstacle(430, 215, 130, 1),  # boss_den_entry
-                obstacle(417, 539, 138, 1)  # hub
-            ],
-            entry_dests=[],
-            npc="",
-            hero_spawn=(self.game_state.game_state_location_x, self.game_state.game_state_location_y),
-            background=pygame.image.load(os.path.join(PATH_TO_RESOURCES, "overworld_maps", "dark_dimension.png")),
-            music="Windless Slopes"
-        )
-
-        self.dark_dimension_boss = world_obj(
-            map_name="dark_dimension_boss",
-            obstacles=[
-                obstacle(320, 0, 320, 285),  # Boss_den_top_barrier
-                obstacle(0, 0, 330, 540),  # Boss_den_left_barrier
-                obstacle(620, 0, 380, 540),  # Boss_den_right_barrier
-            ],
-            entries=[
-                obstacle(410, 539, 130, 1)  # Dark dimension
-            ],
-            entry_dests=[self.dark_dimension
-                         ],
-            npc=[
-                character("Gargoyle", 377, 100, os.path.join(PATH_TO_RESOURCES, "chars", "gargoyle", "gargoyle.png"), 5,
-                          [["knight", "chars/knight/knight_menu.png"], ["archer", "chars/archer/archer_menu.png"],
-                           ["mage", "chars/mage/mage_menu.png"], ["mage", "chars/mage/mage_menu.png"]], False, True,
-                          ["Another fool who thinks that I can be defeated so   easily. "
-                           "Come at me with all your power you human!",
-                           "",
-                           "       [1] (Fight)                     [2] (Retreat)"])
-            ],
-            hero_spawn=(406, 400),
-            background=pygame.image.load(os.path.join(PATH_TO_RESOURCES, "overworld_maps", "dark_dimension_boss.png")),
-            music="Windless Slopes"
-        )
-
-        self.hub_world.entry_dests = [self.ashlands, self.dark_dimension]
-        self.dark_dimension.entry_dests = [self.dark_dimension_boss, self.hub_world]
-        self.ashlands.entry_dests = [self.hub_world, self.atlantis_world]
+        # world definitions are built once per process and shared by every overworld scene
+        worlds = get_worlds()
+        self.hub_world = worlds["hub_world"]
+        self.ashlands = worlds["ashlands"]
+        self.atlantis_world = worlds["atlantis"]
+        self.dark_dimension = worlds["dark_dimension"]
+        self.dark_dimension_boss = worlds["dark_dimension_boss"]
 
         # Defaults to hub world and hero default position
         self.active_world = self.load_active_world()
         self.active_world.hero_spawn = [self.game_state.game_state_location_x, self.game_state.game_state_location_y]
 
-        self.background = pygame.transform.scale(self.active_world.background, (960, 540))
-        self.control_hud = pygame.image.load(os.path.join(PATH_TO_RESOURCES, "controls_HUD.png"))
+        self.background = self.active_world.background
+        self.prefetch_adjacent_worlds()
+        self.control_hud = assets.get_image("controls_HUD.png")
         self.textbox = TextBox(self.screen)
         self._quit_screen = False
         self.collision = Collision()
+        # Boundaries class prevent the player character to move outside the current window
+        self.boundaries = Boundaries(self.screen)
 
         # used for sound effects
         self.hero_walking = False
@@ -226,22 +65,21 @@ class OverworldScene(Scene):
                                   "gabe_stance_4.png", "gabe_stance_5.png", "gabe_stance_6.png"]
 
         self.hero.party = self.formatted_hero_party()
+        # hero position before the last update, the hero is drawn between it and the current one
+        self.hero_last_position = (self.hero.x, self.hero.y)
+        # part of a pixel each axis still has to move, carried to the next update
+        self.move_remainder = [0.0, 0.0]
+        self.walk_frame_steps = max(1, round(HERO_FRAME_TIME * GameConstants.UPDATE_RATE.value))
+        self.walk_step_counter = 0
         pygame.mixer.init()
         pygame.mixer.music.load(os.path.join(PATH_TO_RESOURCES, "soundtrack", self.active_world.music + ".wav"))
         pygame.mixer.music.set_volume(.4)
         pygame.mixer.music.play(-1)
         self._sound_effects = {}
 
-        # Default npc scale and position
-        if self.active_world.npc:
-            for i in range(len(self.active_world.npc)):
-                if self.active_world == self.dark_dimension_boss:
-                    for t in range(len(self.active_world.npc)):
-                        self.active_world.npc[t].sprite = pygame.transform.scale(self.active_world.npc[t].sprite,
-                                                                                 (200, 200))
-                else:
-                    # Set default size for all npcs
-                    self.active_world.npc[i].sprite = pygame.transform.scale(self.active_world.npc[i].sprite, (75, 75))
+        # Worlds outlive the scene, clear interactions left over from the last visit
+        for npc in self.active_world.npc:
+            npc.show_interaction = False
 
         self.show_controls = False
         self.show_characters = True
@@ -268,127 +106,6 @@ class OverworldScene(Scene):
         if self.game_state.final_victory == 1:
             self.show_textbox = True
 
-        # TRACK MOVEMENT
-        # Boundaries class prevent the player character to move outside the current window
-        boundaries = Boundaries(self.screen, self.hero)
-
-        # Player check player movement for up (w), down (s), left (a), right (d)
-        keys = pygame.key.get_pressed()
-
-        if not self.show_controls and not self.show_textbox and not self.show_inventory \
-                and not self._quit_screen and event.type != pygame.MOUSEMOTION:
-            if keys[pygame.K_w]:
-                self.hero.y = boundaries.collision_up()  # Check if player hits top of window
-                self.hero_walking = True
-
-                if self.collision.barrier_collision(self.hero, self.active_world.obstacles):
-                    self.hero.y += 10
-
-                self.hero.adjust_movement(self.hero_left)
-            if keys[pygame.K_s]:
-                self.hero_walking = True
-                self.hero.y = boundaries.collision_down()  # Check if player hits bottom of window
-
-                if self.collision.barrier_collision(self.hero, self.active_world.obstacles):
-                    self.hero.y -= 10
-
-                self.hero.adjust_movement(self.hero_left)
-            if keys[pygame.K_a]:
-                self.hero_left = True
-                self.hero_walking = True
-                self.hero.x = boundaries.collision_left()  # Check if player hits left of window
-
-                if self.collision.barrier_collision(self.hero, self.active_world.obstacles):
-                    self.hero.x += 10
-
-                self.hero.adjust_movement(self.hero_left)
-            if keys[pygame.K_d]:
-                self.hero_left = False
-                self.hero_walking = True
-                self.hero.x = boundaries.collision_right()  # Check if player hits right of window
-
-                if self.collision.barrier_collision(self.hero, self.active_world.obstacles):
-                    self.hero.x -= 10
-
-                self.hero.adjust_movement(self.hero_left)
-
-            # if these are all
-            if not (keys[pygame.K_d] or keys[pygame.K_a] or keys[pygame.K_w] or keys[pygame.K_s]):
-                self.hero_walking = False
-
-        # If there is an npc in the world
-        if self.active_world.npc:
-            for i in range(len(self.active_world.npc)):
-                if self.collision.npc_collision(self.hero, self.active_world.npc[i]):
-                    # Show exclamation mark
-                    self.active_world.npc[i].show_interaction = True
-                    # self.show_interaction = True
-                else:
-                    self.active_world.npc[i].show_interaction = False
-                    # self.show_interaction = False
-
-        if self.collision.entry_collision(self.hero, self.active_world.entries):
-
-            prev = self.active_world
-            self.active_world = self.active_world.entry_dests[self.collision.get_collided_entry()]
-
-            if self.active_world == self.dark_dimension_boss and self.hero.level < 4:
-                self.active_world = prev
-                self.show_textbox = True
-            elif self.active_world == self.dark_dimension_boss and self.hero.level >= 4:
-                self.boss_closed = False
-
-            # Store the current map name in the game state
-            self.game_state.game_state_current_map = self.active_world.map_name
-            # Update background
-            self.background = pygame.transform.scale(self.active_world.background, (960, 540))
-
-            # Set size for npc and where it will face
-            if self.active_world.npc:
-                if self.active_world == self.dark_dimension_boss:
-                    for i in range(len(self.active_world.npc)):
-                        if self.active_world == self.dark_dimension_boss:
-                            for t in range(len(self.active_world.npc)):
-                                self.active_world.npc[t].sprite = pygame.transform.scale(
-                                    self.active_world.npc[t].sprite, (200, 200))
-                else:
-                    for i in range(len(self.active_world.npc)):
-                        self.active_world.npc[i].sprite = pygame.transform.scale(self.active_world.npc[i].sprite,
-                                                                                 (75, 75))
-
-            # Check current Map and which entry point was collided
-            if self.active_world == self.ashlands:
-                if self.collision.get_collided_entry() == 0 and prev == self.hub_world:  # From hub
-                    self.active_world.hero_spawn = [10, 260]
-
-                elif self.collision.get_collided_entry() == 0 and prev == self.atlantis_world:  # From atlantis
-                    self.active_world.hero_spawn = [500, 100]
-
-            elif self.active_world == self.hub_world:
-                if self.collision.get_collided_entry() == 0:  # From ashland
-                    self.active_world.hero_spawn = [875, 260]
-
-                elif self.collision.get_collided_entry() == 1:  # From dark dimension
-                    self.active_world.hero_spawn = [350, 20]
-
-            elif self.active_world == self.dark_dimension:
-                if self.collision.get_collided_entry() == 0:  # From boss den
-                    self.active_world.hero_spawn = [450, 250]
-
-                if self.collision.get_collided_entry() == 1:  # From hub
-                    self.active_world.hero_spawn = [450, 450]
-
-            elif self.active_world == self.dark_dimension_boss:
-                if self.collision.get_collided_entry() == 0:  # From dark dimension
-                    self.active_world.hero_spawn = [450, 450]
-
-            elif self.active_world == self.atlantis_world:
-                if self.collision.get_collided_entry() == 1:  # From ashlands
-                    self.active_world.hero_spawn = [450, 30]
-
-            self.hero.x = self.active_world.hero_spawn[0]
-            self.hero.y = self.active_world.hero_spawn[1]
-
         # TRACK INTERACTION
         if event.type == pygame.KEYDOWN:  # Press Enter or Esc to go back to the Main Menu
             if event.key == pygame.K_ESCAPE and not self.show_controls and not self.show_textbox \
@@ -397,8 +114,7 @@ class OverworldScene(Scene):
 
             if event.key == pygame.K_q:  # Press q to open/close controls menu
                 if self.show_controls:
-                    original_background = self.active_world.background
-                    self.background = pygame.transform.scale(original_background, (960, 540))
+                    self.background = self.active_world.background
                     self.show_controls = False
                     self.show_characters = True
                     self.show_hud = True
@@ -406,7 +122,7 @@ class OverworldScene(Scene):
                 elif self._quit_screen:
                     self.quit_game(False)
                 elif not self.show_controls and not self.show_textbox and not self.show_inventory:
-                    self.background = pygame.image.load(os.path.join(PATH_TO_RESOURCES, "Simple_Control_menu.png"))
+                    self.background = assets.get_image("Simple_Control_menu.png")
                     self.show_controls = True
                     self.show_characters = False
                     for i in range(len(self.active_world.npc)):
@@ -462,11 +178,10 @@ class OverworldScene(Scene):
             if event.key == pygame.K_SPACE and not self.show_controls and not self.show_inventory \
                     and not self._quit_screen and not self.show_textbox:
 
-                for i in range(len(self.active_world.npc)):
-                    # Check for collision
-                    if self.collision.check_collisions(self.hero, self.active_world.npc[i]):
-                        # if text box is displayed, stop characters movements
-                        self.show_textbox = True
+                # Check for collision
+                if self.collision.npc_collisions(self.hero, self.active_world.npc_index):
+                    # if text box is displayed, stop characters movements
+                    self.show_textbox = True
 
             # Select options from the text box
             if self.show_textbox:
@@ -486,7 +201,7 @@ class OverworldScene(Scene):
                                 if event.key == pygame.K_1:
                                     self.enemy_index = i
                                     self.update_game_state()
-                                    self.switch_to_scene(combscene.CombatScene(self.screen, self.game_state))
+                                    self.switch_to_scene(LoadingScene(self.screen, self.game_state, combscene.CombatScene))
                                 if event.key == pygame.K_2:
                                     self.show_textbox = False
                             else:
@@ -514,7 +229,10 @@ class OverworldScene(Scene):
 
         # Display hero and npcs
         if self.show_characters:
-            self.screen.blit(self.hero.sprite, (self.hero.x, self.hero.y))
+            # drawn between its last two positions, updates run less often than frames are drawn
+            last_x, last_y = self.hero_last_position
+            self.screen.blit(self.hero.sprite, (round(last_x + (self.hero.x - last_x) * self.interpolation),
+                                                round(last_y + (self.hero.y - last_y) * self.interpolation)))
             # If there is an npc on the map
             if self.active_world.npc:
                 for i in range(len(self.active_world.npc)):
@@ -591,6 +309,10 @@ class OverworldScene(Scene):
             self.inventory.display_heroes(self.inventory.party, self.inventory.heroes)
 
     def update(self):
+        self.move_hero()
+        self.update_npc_interactions()
+        self.check_entries()
+
         if self.hero_walking and not self.walk_sound_effect_started:
             self.walk_sound_effect_started = True
             self.walk_sound_effect.play(-1)
@@ -599,6 +321,98 @@ class OverworldScene(Scene):
         elif self.show_textbox or self.show_inventory or self.show_controls:
             self.stop_walk_sound_effect()
 
+    def move_hero(self):
+        # Player check player movement for up (w), down (s), left (a), right (d), the keys held down are read once
+        # per update so the hero walks at the same speed no matter how many events arrive
+        self.hero_last_position = (self.hero.x, self.hero.y)
+        if self.show_controls or self.show_textbox or self.show_inventory or self._quit_screen:
+            return
+
+        keys = pygame.key.get_pressed()
+        direction_x = keys[pygame.K_d] - keys[pygame.K_a]
+        direction_y = keys[pygame.K_s] - keys[pygame.K_w]
+        self.hero_walking = bool(keys[pygame.K_d] or keys[pygame.K_a] or keys[pygame.K_w] or keys[pygame.K_s])
+        if not self.hero_walking:
+            self.move_remainder = [0.0, 0.0]
+            self.walk_step_counter = 0
+            return
+
+        if direction_x:
+            self.hero_left = direction_x < 0
+
+        # velocity times the length of an update step, whole pixels are moved and the rest is carried over
+        step = HERO_SPEED / GameConstants.UPDATE_RATE.value
+        move_x = direction_x * step + self.move_remainder[0]
+        move_y = direction_y * step + self.move_remainder[1]
+        self.move_remainder = [move_x - int(move_x), move_y - int(move_y)]
+        self.hero.x, self.hero.y = self.collision.move_and_slide(self.hero, int(move_x), int(move_y),
+                                                                 self.active_world.obstacle_index, self.boundaries)
+
+        if self.walk_step_counter % self.walk_frame_steps == 0:
+            self.hero.adjust_movement(self.hero_left)
+        self.walk_step_counter += 1
+
+    def update_npc_interactions(self):
+        # If there is an npc in the world
+        if self.active_world.npc:
+            near_npcs = self.collision.npc_collisions(self.hero, self.active_world.npc_index)
+            for i in range(len(self.active_world.npc)):
+                # Show exclamation mark
+                self.active_world.npc[i].show_interaction = i in near_npcs
+
+    def check_entries(self):
+        if self.collision.entry_collision(self.hero, self.active_world.entry_index):
+
+            prev = self.active_world
+            self.active_world = self.active_world.entry_dests[self.collision.get_collided_entry()]
+
+            if self.active_world == self.dark_dimension_boss and self.hero.level < 4:
+                self.active_world = prev
+                self.show_textbox = True
+            elif self.active_world == self.dark_dimension_boss and self.hero.level >= 4:
+                self.boss_closed = False
+
+            # Store the current map name in the game state
+            self.game_state.game_state_current_map = self.active_world.map_name
+            # Update background, the worlds reachable from here start loading in the background
+            self.background = self.active_world.background
+            self.prefetch_adjacent_worlds()
+
+            # Check current Map and which entry point was collided
+            if self.active_world == self.ashlands:
+                if self.collision.get_collided_entry() == 0 and prev == self.hub_world:  # From hub
+                    self.active_world.hero_spawn = [10, 260]
+
+                elif self.collision.get_collided_entry() == 0 and prev == self.atlantis_world:  # From atlantis
+                    self.active_world.hero_spawn = [500, 100]
+
+            elif self.active_world == self.hub_world:
+                if self.collision.get_collided_entry() == 0:  # From ashland
+                    self.active_world.hero_spawn = [875, 260]
+
+                elif self.collision.get_collided_entry() == 1:  # From dark dimension
+                    self.active_world.hero_spawn = [350, 20]
+
+            elif self.active_world == self.dark_dimension:
+                if self.collision.get_collided_entry() == 0:  # From boss den
+                    self.active_world.hero_spawn = [450, 250]
+
+                if self.collision.get_collided_entry() == 1:  # From hub
+                    self.active_world.hero_spawn = [450, 450]
+
+            elif self.active_world == self.dark_dimension_boss:
+                if self.collision.get_collided_entry() == 0:  # From dark dimension
+                    self.active_world.hero_spawn = [450, 450]
+
+            elif self.active_world == self.atlantis_world:
+                if self.collision.get_collided_entry() == 1:  # From ashlands
+                    self.active_world.hero_spawn = [450, 30]
+
+            self.hero.x = self.active_world.hero_spawn[0]
+            self.hero.y = self.active_world.hero_spawn[1]
+            # the hero jumps to the spawn, don't draw it walking there
+            self.hero_last_position = (self.hero.x, self.hero.y)
+
     """NOTE: To switch to another scene like main menu or combat scene you enter the following
         to combat: self.switch_to_scene(CombatScene(self.screen))
         to main menu: self.switch_to_scene(MainMenuScene(self.screen))
@@ -625,13 +439,20 @@ class OverworldScene(Scene):
 
     def quit_game(self, saving):
         # saves game progress to database and stops music
-
+        # the save is written by the writer thread, the main menu shows when it is done or if it failed
+        save_future = None
         if saving:
             self.update_game_state()
-            save_game(self.game_state)
+            save_future = save_writer.submit(self.game_state)
 
         pygame.mixer.music.stop()
-        self.switch_to_scene(menuscene.MainMenuScene(self.screen, self.game_state))
+        self.switch_to_scene(menuscene.MainMenuScene(self.screen, self.game_state, save_future))
+
+    @staticmethod
+    def prefetch(game_state):
+        # background of the world the scene opens on and the hud, the world definitions are already in memory
+        return [get_worlds()[game_state.game_state_current_map].prefetch_background(),
+                assets.prefetch_image("controls_HUD.png")]
 
     def load_active_world(self):
         map_name = self.game_state.game_state_current_map
@@ -647,6 +468,10 @@ class OverworldScene(Scene):
         elif map_name == "dark_dimension_boss":
             return self.dark_dimension_boss
 
+    def prefetch_adjacent_worlds(self):
+        for world in self.active_world.entry_dests:
+            world.prefetch_background()
+
     def formatted_hero_party(self):
         party_list = []
 
@@ -656,8 +481,7 @@ class OverworldScene(Scene):
         return party_list
 
     def get_walk_sound_effect(self):
-        path = os.path.join(PATH_TO_RESOURCES, "soundtrack", "overworld_sounds", "walk" + ".wav")
-        sound = pygame.mixer.Sound(path)
+        sound = assets.get_sound("soundtrack/overworld_sounds/walk.wav")
         sound.set_volume(.7)
         return sound
 
@@ -0,0 +1,59 @@
+"""
+.. module:: overworld_spatial_hash
+  :synopsis: uniform grid of rects used as the broadphase of the overworld collisions.
+"""
+
+# side of a grid cell in pixels, a bit bigger than the hero so it touches at most four cells
+DEFAULT_CELL_SIZE = 128
+
+
+class SpatialHash:
+    """Index of a fixed set of rects bucketed into a uniform grid. Each cell keeps the positions of the rects that
+        touch it, a query only tests the rects found in the cells under the queried rect. Results are positions in
+        the list the index was built from, in list order, so callers can map them back to their obstacles, entries
+        or npcs.
+
+        The rects are copied when the index is built, it has to be rebuilt if the objects they came from move.
+
+        :param rects: iterable of pygame.Rect
+        :param cell_size: (int) side of a grid cell in pixels
+    """
+
+    def __init__(self, rects, cell_size=DEFAULT_CELL_SIZE):
+        self._cell_size = cell_size
+        self._rects = [rect.copy() for rect in rects]
+        self._cells = {}
+        for index, rect in enumerate(self._rects):
+            for cell in self._cells_under(rect):
+                self._cells.setdefault(cell, []).append(index)
+
+    def __len__(self):
+        return len(self._rects)
+
+    def rect(self, index):
+        return self._rects[index]
+
+    def _cells_under(self, rect):
+        size = self._cell_size
+        # rects without width or height (e.g. 1 px entries) still belong to the cell they start in
+        for cell_x in range(rect.left // size, max(rect.right - 1, rect.left) // size + 1):
+            for cell_y in range(rect.top // size, max(rect.bottom - 1, rect.top) // size + 1):
+                yield cell_x, cell_y
+
+    def candidates(self, rect):
+        """Returns the sorted positions of the rects sharing a cell with rect, they may or may not overlap it"""
+        buckets = [self._cells[cell] for cell in self._cells_under(rect) if cell in self._cells]
+        if len(buckets) == 1:
+            # buckets are filled in list order, a single one is already sorted
+            return buckets[0]
+        found = set()
+        for bucket in buckets:
+            found.update(bucket)
+        return sorted(found)
+
+    def query(self, rect):
+        """Returns the positions of the rects overlapping rect in list order"""
+        indexes = self.candidates(rect)
+        if not indexes:
+            return []
+        return [indexes[hit] for hit in rect.collidelistall([self._rects[index] for index in indexes])]
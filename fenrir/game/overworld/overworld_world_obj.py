@@ -1,11 +1,25 @@
 import os
 import pygame
 from fenrir.common.config import Colors, PATH_TO_RESOURCES
+from fenrir.common.asset_manager import assets
 from fenrir.game.overworld.overworld_obstacle import overworld_obstacle as obstacle
 from fenrir.game.overworld.overworld_npc import overworld_npc as character
+from fenrir.game.overworld.overworld_collisions import Collision
+from fenrir.game.overworld.overworld_spatial_hash import SpatialHash
+
+
+# size the world backgrounds are drawn at
+BACKGROUND_SIZE = (960, 540)
 
 
 class overworld_world_obj:
+    """World definition used by the overworld scene. The background is given as a path relative to the
+        resources folder and is only loaded (and scaled to the screen) the first time the world is shown.
+
+        The rects of the obstacles, entries and npcs are put in a spatial hash the first time collisions are checked
+        in the world, setting the lists drops the index so it is built again from the new ones.
+    """
+
     def __init__(self, map_name, obstacles, entries, entry_dests, npc, hero_spawn, background, music, visited=False):
         self.__map_name = map_name
         self.__obstacles = obstacles
@@ -16,6 +30,9 @@ class overworld_world_obj:
         self.__background = background
         self.__music = music
         self.__visited = visited
+        self.__obstacle_index = None
+        self.__entry_index = None
+        self.__npc_index = None
 
     @property
     def map_name(self):
@@ -32,6 +49,7 @@ class overworld_world_obj:
     @obstacles.setter
     def obstacles(self, obstacles):
         self.__obstacles = obstacles
+        self.__obstacle_index = None
 
     @property
     def entries(self):
@@ -40,6 +58,19 @@ class overworld_world_obj:
     @entries.setter
     def entries(self, entries):
         self.__entries = entries
+        self.__entry_index = None
+
+    @property
+    def obstacle_index(self):
+        if self.__obstacle_index is None:
+            self.__obstacle_index = SpatialHash(Collision.make_obstacle_rect(obstacle) for obstacle in self.__obstacles)
+        return self.__obstacle_index
+
+    @property
+    def entry_index(self):
+        if self.__entry_index is None:
+            self.__entry_index = SpatialHash(Collision.make_obstacle_rect(entry) for entry in self.__entries)
+        return self.__entry_index
 
     @property
     def entry_dests(self):
@@ -56,6 +87,14 @@ class overworld_world_obj:
     @npc.setter
     def npc(self, npc):
         self.__npc = npc
+        self.__npc_index = None
+
+    @property
+    def npc_index(self):
+        # npcs stand still, their rects only change when the list is replaced
+        if self.__npc_index is None:
+            self.__npc_index = SpatialHash(Collision.make_character_rect(npc) for npc in self.__npc)
+        return self.__npc_index
 
     @property
     def hero_spawn(self):
@@ -67,12 +106,20 @@ class overworld_world_obj:
 
     @property
     def background(self):
-        return self.__background
+        return assets.get_image(self.__background, BACKGROUND_SIZE)
 
     @background.setter
     def background(self, background):
         self.__background = background
 
+    @property
+    def background_path(self):
+        return self.__background
+
+    def prefetch_background(self):
+        # starts loading the scaled background on the asset loader thread, returns the future (None if loaded)
+        return assets.prefetch_image(self.__background, BACKGROUND_SIZE)
+
     @property
     def music(self):
         return self.__music
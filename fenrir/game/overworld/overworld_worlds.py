@@ -0,0 +1,214 @@
+"""
+.. module:: overworld_worlds
+  :synopsis: definitions of every overworld world, built once per process and shared by all overworld scenes.
+"""
+
+import os
+import pygame
+from fenrir.common.config import PATH_TO_RESOURCES
+from fenrir.game.overworld.overworld_npc import overworld_npc as character
+from fenrir.game.overworld.overworld_obstacle import overworld_obstacle as obstacle
+from fenrir.game.overworld.overworld_world_obj import overworld_world_obj as world_obj
+
+# spawn used until the scene moves the hero into the world
+DEFAULT_HERO_SPAWN = (550, 230)
+
+# map name -> world obj, filled the first time get_worlds is called
+_worlds = {}
+
+
+def get_worlds():
+    """Returns a dict of map name -> world obj. The worlds are only built the first time, later overworld scenes
+    (e.g. coming back from a combat) reuse the same objects, npc sprites and obstacles.
+    """
+    if not _worlds:
+        for world in build_worlds():
+            _worlds[world.map_name] = world
+    return _worlds
+
+
+def build_worlds():
+    """Builds every overworld world and links their entries, backgrounds are not loaded here"""
+    hub_world = world_obj(
+        map_name="hub_world",
+        obstacles=[
+            obstacle(0, 0, 300, 180),  # Flower_Patch_Barrier
+            obstacle(480, 0, 60, 200),  # Left_House_Barrier
+            obstacle(550, 0, 88, 165),  # Center_house_Barrier
+            obstacle(640, 0, 210, 200),  # House_River_Bridge_Barrier
+            obstacle(736, 350, 130, 60),  # bottom_river_Barrier
+            obstacle(634, 477, 326, 80),  # Bottom_River_Left_Barrier
+            obstacle(0, 410, 180, 139),  # Pond_Barrier
+        ],
+        entries=[
+            obstacle(959, 255, 1, 70),  # World_1_Entry (Dark Dessert/Right Path)
+            obstacle(301, 1, 100, 1),  # World_3_Entry (Dark World/ Top Path)
+        ],
+        entry_dests=[],
+        # FILL in with npc data:
+        # character(npc name, x, y, png name, level, party members[], can you interact with npc? (boolean 1),
+        # is just text or a choice for the player? (boolean 2), dialogue[])
+        npc=[character("Sensei", 220, 320, os.path.join(PATH_TO_RESOURCES, "chars", "sensei", "sensei.png"), 1,
+                       [], False, False,
+                       [
+                           "Gabe, I if you want to defeat the evil lord for tak-ing over the world you will need to become stronger. In order to do that you need to learn how to fight.",
+                           "You'll be giving commands to your party once com-   bat begins. Once it's their turn, choose a command  using the corresponding number."
+                           ,
+                           "Then, if you want them to act you'll have to tell   them which tile to attack or move to.",
+                           "You can test your skill by challenging my apprenti- ces! I sent them all around the world to aid you in your journey. Good luck."]),
+
+             character("apprentice", 20, 255, os.path.join(PATH_TO_RESOURCES, "chars", "hat-guy", "hat-guy.png"), 1,
+                       [["knight", "chars/knight/knight_menu.png"], ["mage", "chars/mage/mage_menu.png"],
+                        ["archer", "chars/archer/archer_menu.png"], ["knight", "chars/knight/knight_menu.png"]],
+                       False, True,
+                       ["Try to defeat me if you can boy!",
+                        "[1] I am ready!", "[2] J-Just wait a second! I am not ready"]),
+             character("Mani", 640, 380, os.path.join(PATH_TO_RESOURCES, "chars", "mani", "mani.png"), 1,
+                       [], False, False,
+                       [
+                           "Hello Gabe, I will teach all you need to know about  this world. Press the [Spacebar] if you want me to go on",
+                           "You can move by pressing the [WASD] keys, but you   probably already know that as you had to walk to ta-lk to me"
+                           ,
+                           "Pressing [i] will open the inventory. That is where you will be able to view and manage your party.",
+                           "Your party and your ability to guide them will be   your strongest weapon in the coming trials.",
+                           "If you want review the controls again you can either press [q] or talk to me again.",
+                           "Okay! Now that I finish explaining things you should talk to sensei to learn about combat"]),
+
+             ],
+        hero_spawn=DEFAULT_HERO_SPAWN,
+        background="overworld_maps/hub_world.png",
+        music="Windless Slopes"
+    )
+
+    ashlands = world_obj(
+        map_name="ashlands",
+        obstacles=[
+            obstacle(0, 0, 280, 170),  # Top left prompts
+            obstacle(281, 0, 180, 70),  # Top left stone wall
+            obstacle(650, 0, 250, 70),  # Top right stone wall
+            obstacle(0, 410, 75, 70),  # Bottom left prompts
+            obstacle(200, 410, 70, 1),  # Bottom left prompts (fallen tree)
+            obstacle(760, 410, 1, 1),  # Bottom tombstone
+            obstacle(740, 280, 1, 1),  # Middle tombstone
+            obstacle(860, 160, 1, 1)  # Top tombstone (looks broken)
+        ],
+        entries=[
+            obstacle(1, 240, 1, 100),  # Hub Entry
+            obstacle(490, 0, 120, 1),  # atlantis
+        ],
+        entry_dests=[],
+        npc=[character("Twin Apprentice", 350, 430,
+                       os.path.join(PATH_TO_RESOURCES, "chars", "hat-guy", "hat-guy.png"), 2,
+                       [], False, False,
+                       ["Oh Gabe! Good to see you here!",
+                        "You can train with my twin brother over there if    you feel like it. "
+                        "I am not much of a fighter myself.",
+                        "I came here because I heard rumors of a mystical    creature living inside the ruins",
+                        "If the rumors are true and something is there, I    am confident it will help you train to defeat the   demon lord.",
+                        "I think it is worth giving it a try"]),
+
+             character("Apprentice", 850, 240,
+                       os.path.join(PATH_TO_RESOURCES, "chars", "hat-guy", "hat-guy-left.png"), 2,
+                       [["knight", "chars/knight/knight_menu.png"], ["mage", "chars/mage/mage_menu.png"],
+                        ["archer", "chars/archer/archer_menu.png"], ["archer", "chars/archer/archer_menu.png"]],
+                       False, True,
+                       ["Gabe! Lets train for a bit, I am bored of been here doing nothing", "",
+                        "[1] Lets do it!      [2] Sorry, I don't feel like it"])
+             ],
+        hero_spawn=DEFAULT_HERO_SPAWN,
+        background="overworld_maps/ashlands.png",
+        music="Windless Slopes"
+    )
+
+    atlantis_world = world_obj(
+        map_name="atlantis",
+        obstacles=[
+            obstacle(0, 0, 165, 170),  # Left_Column_Barrier
+            obstacle(189, 0, 60, 60),  # left_Column_Rocks
+            obstacle(350, 0, 20, 60),  # Left_Entry
+            obstacle(560, 0, 50, 60),  # Right_Entry
+            obstacle(860, 0, 110, 120),  # right_column
+            obstacle(730, 0, 70, 20),  # right_column_pebbles
+            obstacle(390, 191, 10, 90),  # left_barricade
+            obstacle(401, 191, 120, 100),  # top_barricade
+            obstacle(550, 191, 10, 90),  # right_barricade
+            obstacle(766, 298, 87, 60),  # anchor_barrier
+            obstacle(0, 350, 60, 40),  # pot_barrier
+            obstacle(0, 430, 100, 20),  # half_column_barrier (bottom right)
+            obstacle(0, 460, 960, 80),  # sea_wall_barrier
+            obstacle(860, 430, 100, 20),  # half_column_barrier (bottom left)
+        ],
+        entries=[
+            obstacle(430, 0, 100, 1)  # ashlands
+        ],
+        entry_dests=[
+            ashlands
+        ],
+        npc=[character("Mermaid", 439, 230, os.path.join(PATH_TO_RESOURCES, "chars", "mermaid", "mermaid.png"), 3,
+                       [["knight", "chars/knight/knight_menu.png"], ["knight", "chars/knight/knight_menu.png"],
+                        ["archer", "chars/archer/archer_menu.png"], ["archer", "chars/archer/archer_menu.png"]],
+                       False, True,
+                       [
+                           "I have heard of your mission human boy. If you      beat me you will have enough power to defeat evil.",
+                           "", "[1] I will do my best!      [2] I am not ready yet"])
+             ],
+        hero_spawn=(400, 25),
+        background="overworld_maps/atlantis.png",
+        music="Windless Slopes"
+    )
+
+    dark_dimension = world_obj(
+        map_name="dark_dimension",
+        obstacles=[
+            obstacle(0, 0, 400, 542),  # Main_barrier_left
+            obstacle(570, 0, 404, 540),  # Main_barrier_right
+
+        ],
+        entries=[
+            obstacle(430, 215, 130, 1),  # boss_den_entry
+            obstacle(417, 539, 138, 1)  # hub
+        ],
+        entry_dests=[],
+        npc="",
+        hero_spawn=DEFAULT_HERO_SPAWN,
+        background="overworld_maps/dark_dimension.png",
+        music="Windless Slopes"
+    )
+
+    dark_dimension_boss = world_obj(
+        map_name="dark_dimension_boss",
+        obstacles=[
+            obstacle(320, 0, 320, 285),  # Boss_den_top_barrier
+            obstacle(0, 0, 330, 540),  # Boss_den_left_barrier
+            obstacle(620, 0, 380, 540),  # Boss_den_right_barrier
+        ],
+        entries=[
+            obstacle(410, 539, 130, 1)  # Dark dimension
+        ],
+        entry_dests=[dark_dimension
+                     ],
+        npc=[
+            character("Gargoyle", 377, 100, os.path.join(PATH_TO_RESOURCES, "chars", "gargoyle", "gargoyle.png"), 5,
+                      [["knight", "chars/knight/knight_menu.png"], ["archer", "chars/archer/archer_menu.png"],
+                       ["mage", "chars/mage/mage_menu.png"], ["mage", "chars/mage/mage_menu.png"]], False, True,
+                      ["Another fool who thinks that I can be defeated so   easily. "
+                       "Come at me with all your power you human!",
+                       "",
+                       "       [1] (Fight)                     [2] (Retreat)"])
+        ],
+        hero_spawn=(406, 400),
+        background="overworld_maps/dark_dimension_boss.png",
+        music="Windless Slopes"
+    )
+
+    hub_world.entry_dests = [ashlands, dark_dimension]
+    dark_dimension.entry_dests = [dark_dimension_boss, hub_world]
+    ashlands.entry_dests = [hub_world, atlantis_world]
+
+    # npc sprites are scaled once here instead of every time a world is entered
+    for world in (hub_world, ashlands, atlantis_world, dark_dimension, dark_dimension_boss):
+        size = (200, 200) if world is dark_dimension_boss else (75, 75)
+        for npc in world.npc:
+            npc.sprite = pygame.transform.scale(npc.sprite, size)
+
+    return hub_world, ashlands, atlantis_world, dark_dimension, dark_dimension_boss
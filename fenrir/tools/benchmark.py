@@ -0,0 +1,316 @@
+"""
+.. module:: benchmark
+  :synopsis: times the combat and map hot paths on the shipped combat maps and on generated maps of growing size,
+             stores the results as json and compares two result files to catch regressions.
+
+Run from the project folder::
+
+    python -m fenrir.tools.benchmark run -o before.json
+    python -m fenrir.tools.benchmark run -o after.json
+    python -m fenrir.tools.benchmark compare before.json after.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import timeit
+from fenrir.game.combat.combat_ai_nodeTree import CombatAINodeTree
+from fenrir.game.combat.combat_ai_system import CombatAISystem
+from fenrir.game.combat.combat_character_data import CombatCharacterData
+from fenrir.game.combat.combat_engine import CombatEngine
+from fenrir.game.combat.combat_map_data import MapData, MAP_TILE_W, MAP_TILE_H
+from fenrir.game.combat.combat_move_list import combat_move_list
+from fenrir.game.combat.combat_reachability import CombatReachability
+
+SHIPPED_MAPS = ("combat_hub_world", "combat_ashlands", "combat_atlantis", "combat_dark_dimension_boss")
+# size of the shipped maps in tiles
+SHIPPED_COLUMNS = 16
+SHIPPED_ROWS = 9
+DEFAULT_SIZES = ("16x9", "32x18", "64x64", "128x128", "256x256")
+
+PLAYER_PARTY = ("knight", "mage", "archer", "archer")
+ENEMY_PARTY = ("knight", "archer", "mage", "knight")
+
+# a result this much slower (as a fraction of the old time) than the one it's compared to is a regression
+DEFAULT_THRESHOLD = 0.10
+# each timing runs the benchmark for at least this many seconds
+MIN_TIME = 0.2
+DEFAULT_REPEAT = 5
+# turns a whole battle benchmark plays at most
+BATTLE_MAX_TURNS = 200
+# whole battles are only played on maps up to this many tiles, bigger ones take seconds per battle
+BATTLE_MAX_TILES = 64 * 64
+
+
+class SyntheticMapData(MapData):
+    """Map with a generated layout instead of a .txt file, used to see how the map code scales with size. Every
+    fourth row and column is left open so all tiles that aren't blocking are connected, the tiles in between are
+    blocking at random. Players spawn on the left edge and enemies on the right edge.
+
+    :param columns: (int) width of the map in tiles
+    :param rows: (int) height of the map in tiles
+    :param seed: (int) seed for the layout, the same seed and size always builds the same map
+    """
+
+    # share of the tiles between the open lines that are blocking
+    BLOCKING_CHANCE = 0.3
+
+    def __init__(self, columns, rows, seed=0):
+        self._seed = seed
+        super().__init__("synthetic_{}x{}".format(columns, rows), columns, rows)
+
+    def load_charmap(self):
+        rng = random.Random(self._seed)
+        char_map = []
+        for y in range(self._rows):
+            line = []
+            for x in range(self._columns):
+                if x % 4 and y % 4 and rng.random() < self.BLOCKING_CHANCE:
+                    line.append("#" if rng.random() < 0.5 else "~")
+                else:
+                    line.append(".")
+            char_map.append(line)
+
+        spawns = min(len(PLAYER_PARTY), self._rows)
+        for y in range(spawns):
+            char_map[y][0] = "a"
+            char_map[self._rows - 1 - y][self._columns - 1] = "e"
+        return char_map
+
+
+def parse_size(size):
+    columns, rows = size.lower().split("x")
+    return int(columns), int(rows)
+
+
+def load_map(name):
+    """Returns the map for a benchmark map name, shipped maps by file name and generated maps by size (e.g. 64x64)"""
+    if name in SHIPPED_MAPS:
+        return MapData(name, SHIPPED_COLUMNS, SHIPPED_ROWS)
+    return SyntheticMapData(*parse_size(name))
+
+
+def spawn_battle(mapData):
+    """Returns an engine with both parties placed on their spawn tiles"""
+    participants = [CombatCharacterData(unit_id, unit, 3, False) for unit_id, unit in enumerate(PLAYER_PARTY)]
+    participants += [CombatCharacterData(len(PLAYER_PARTY) + unit_id, unit, 3, True)
+                     for unit_id, unit in enumerate(ENEMY_PARTY)]
+    engine = CombatEngine(mapData, participants)
+    engine.spawn_participants()
+    return engine
+
+
+def tile_xy(tile):
+    return tile.x_coord // MAP_TILE_W, tile.y_coord // MAP_TILE_H
+
+
+###############################################
+#                  Benchmarks                 #
+###############################################
+# each benchmark takes the map name and returns the function to time, setup work is done before returning. None
+# skips the map
+
+def bench_map_load(name):
+    return lambda: load_map(name)
+
+
+def bench_node_tree(name):
+    mapData = load_map(name)
+    return lambda: CombatAINodeTree(mapData.columns, mapData.rows, mapData)
+
+
+def bench_move_list(name):
+    # path across the empty map, from the first player spawn to the last enemy spawn
+    mapData = load_map(name)
+    nodeTree = CombatAINodeTree(mapData.columns, mapData.rows, mapData)
+    start = mapData.playerspawn[0]
+    end = mapData.enemyspawn[-1]
+    startX, startY = tile_xy(start)
+    endX, endY = tile_xy(end)
+    if not combat_move_list(startX, startY, endX, endY, nodeTree, mapData):
+        raise ValueError("no path between the spawns of " + name)
+    return lambda: combat_move_list(startX, startY, endX, endY, nodeTree, mapData)
+
+
+def bench_ai_decision(name):
+    # first enemy deciding its move at the start of a battle, the enemies are the furthest from their targets then
+    engine = spawn_battle(load_map(name))
+    nodeTree = CombatAINodeTree(engine.map_data.columns, engine.map_data.rows, engine.map_data)
+    unit = next(unit for unit in engine.participants if unit.get_is_enemy())
+    return lambda: CombatAISystem(engine.participants, unit, nodeTree, engine.map_data).decide_ai_action()
+
+
+def bench_battle(name):
+    # whole ai-vs-ai battle with the same seed every call. Catches slowdowns the per call benchmarks miss, like
+    # caches that are rebuilt every turn because the units moved
+    mapData = load_map(name)
+    if mapData.columns * mapData.rows > BATTLE_MAX_TILES:
+        return None
+
+    def battle():
+        for index in range(len(mapData.occupied)):
+            if mapData.occupied[index]:
+                mapData.unoccupy(index % mapData.columns, index // mapData.columns)
+        random.seed(0)
+        spawn_battle(mapData).run_battle(BATTLE_MAX_TURNS)
+    return battle
+
+
+def bench_movement_tiles(name):
+    # a new reachability per call so every call searches the map instead of reading the cache
+    engine = spawn_battle(load_map(name))
+    unit = engine.participants[0]
+    x, y = engine.tile_of(unit)
+    return lambda: CombatReachability(engine.map_data).movement_tiles(unit.get_id(), x, y, unit.move_range)
+
+
+def bench_attack_tiles(name):
+    engine = spawn_battle(load_map(name))
+    unit = next(unit for unit in engine.participants if unit.get_type() == "archer")
+    x, y = engine.tile_of(unit)
+    enemy_ids = {other.get_id() for other in engine.participants if other.get_is_enemy()}
+    return lambda: CombatReachability(engine.map_data).attack_tiles(unit.get_id(), x, y, unit.attack_range, enemy_ids)
+
+
+BENCHMARKS = {
+    "map_load": bench_map_load,
+    "node_tree": bench_node_tree,
+    "move_list": bench_move_list,
+    "ai_decision": bench_ai_decision,
+    "battle": bench_battle,
+    "movement_tiles": bench_movement_tiles,
+    "attack_tiles": bench_attack_tiles,
+}
+
+
+def time_function(function, repeat=DEFAULT_REPEAT, min_time=MIN_TIME):
+    """Times the function and returns the seconds per call of each repeat, the number of calls per repeat is picked
+    so one repeat takes at least min_time
+    """
+    timer = timeit.Timer(function)
+    loops = 1
+    while True:
+        if timer.timeit(loops) >= min_time:
+            break
+        loops *= 2 if loops < 8 else 4
+    return [total / loops for total in timer.repeat(repeat, loops)], loops
+
+
+def run_benchmarks(maps, names=None, repeat=DEFAULT_REPEAT, min_time=MIN_TIME, log=None):
+    """Runs the benchmarks on every map and returns the results keyed by benchmark/map"""
+    results = {}
+    for name in names or BENCHMARKS:
+        for map_name in maps:
+            key = "{}/{}".format(name, map_name)
+            function = BENCHMARKS[name](map_name)
+            if function is None:
+                continue
+            times, loops = time_function(function, repeat, min_time)
+            results[key] = {
+                "min": min(times),
+                "median": statistics.median(times),
+                "mean": statistics.mean(times),
+                "loops": loops,
+                "repeat": repeat,
+            }
+            if log:
+                print("{:40} {:>12}".format(key, format_seconds(results[key]["min"])), file=log, flush=True)
+    return results
+
+
+def format_seconds(seconds):
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return "{:.3f} {}".format(seconds / scale, unit)
+    return "{:.1f} ns".format(seconds / 1e-9)
+
+
+def compare_results(old, new, threshold=DEFAULT_THRESHOLD):
+    """Compares the min time of the benchmarks found in both result sets. Returns a list of
+    (key, old seconds, new seconds, ratio, status) where status is "regression", "improvement" or "ok".
+    """
+    rows = []
+    for key in sorted(old.keys() & new.keys()):
+        old_time = old[key]["min"]
+        new_time = new[key]["min"]
+        ratio = new_time / old_time
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 - threshold:
+            status = "improvement"
+        else:
+            status = "ok"
+        rows.append((key, old_time, new_time, ratio, status))
+    return rows
+
+
+###############################################
+#                Command line                 #
+###############################################
+def command_run(args):
+    maps = [] if args.no_shipped else list(SHIPPED_MAPS)
+    maps += args.sizes
+    results = run_benchmarks(maps, args.benchmarks, args.repeat, args.min_time, log=sys.stderr)
+    output = {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as out_file:
+        json.dump(output, out_file, indent=2, sort_keys=True)
+    return 0
+
+
+def command_compare(args):
+    with open(args.old) as old_file, open(args.new) as new_file:
+        old = json.load(old_file)["results"]
+        new = json.load(new_file)["results"]
+
+    rows = compare_results(old, new, args.threshold)
+    for key, old_time, new_time, ratio, status in rows:
+        print("{:40} {:>12} {:>12} {:>7.2f}x  {}".format(key, format_seconds(old_time), format_seconds(new_time),
+                                                         ratio, "" if status == "ok" else status.upper()))
+    regressions = sum(1 for row in rows if row[4] == "regression")
+    print("{} compared, {} regressions over {:.0%}".format(len(rows), regressions, args.threshold))
+    return 1 if regressions else 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m fenrir.tools.benchmark")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="time the benchmarks and write the results to a json file")
+    run.add_argument("-o", "--output", default="benchmark.json")
+    run.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), help="benchmarks to run (default: all)")
+    run.add_argument("--sizes", nargs="*", default=list(DEFAULT_SIZES), metavar="COLUMNSxROWS",
+                     help="generated map sizes (default: %(default)s)")
+    run.add_argument("--no-shipped", action="store_true", help="skip the maps shipped with the game")
+    run.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    run.add_argument("--min-time", type=float, default=MIN_TIME, help="seconds each repeat runs for at least")
+    run.set_defaults(function=command_run)
+
+    compare = commands.add_parser("compare", help="compare two result files, exits with 1 if anything got slower")
+    compare.add_argument("old")
+    compare.add_argument("new")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                         help="allowed slow down as a fraction (default: %(default)s)")
+    compare.set_defaults(function=command_compare)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    return args.function(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
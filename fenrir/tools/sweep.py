@@ -0,0 +1,181 @@
+"""
+.. module:: sweep
+  :synopsis: simulates battles for every party composition, level and combat map on all cores and writes the win
+             rates and turn counts to a csv file. Used to tune the stats in character_class_setup_by_type.
+
+Run from the project folder with ``python -m fenrir.tools.sweep`` (``--help`` lists the options).
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from fenrir.common.config import GameConstants
+from fenrir.game.combat.combat_character_data import CombatCharacterData
+from fenrir.game.combat.combat_engine import CombatEngine, DEFAULT_MAX_TURNS
+from fenrir.game.combat.combat_map_data import MapData
+
+UNIT_TYPES = ("knight", "archer", "mage")
+PARTY_SIZE = 4
+COMBAT_MAPS = ("combat_hub_world", "combat_ashlands", "combat_atlantis", "combat_dark_dimension_boss")
+# size of the combat maps in tiles
+MAP_COLUMNS = 16
+MAP_ROWS = 9
+
+CSV_FIELDS = ("map", "player_party", "enemy_party", "player_level", "enemy_level", "battles", "wins", "losses",
+              "unfinished", "win_rate", "mean_turns", "min_turns", "max_turns", "failed_turns")
+
+# maps are only read from disk once per worker process, battles get a fresh copy of the tile data
+_maps = {}
+
+
+def party_compositions(size=PARTY_SIZE):
+    """Returns every party of the given size, order inside the party doesn't matter so each mix is listed once"""
+    return [list(party) for party in itertools.combinations_with_replacement(UNIT_TYPES, size)]
+
+
+def build_tasks(player_parties, enemy_parties, levels, maps, level_offsets=(0,), battles=1, max_turns=DEFAULT_MAX_TURNS,
+                seed=0, strict=True):
+    """Returns one task per combination. Each task gets its own seed so a sweep can be repeated exactly, no matter
+    which worker ends up running it. With strict an error raised by the ai stops the sweep, otherwise the turn is
+    skipped and counted in the failed_turns column.
+    """
+    tasks = []
+    for map_name, player_level, offset, player_party, enemy_party in itertools.product(maps, levels, level_offsets,
+                                                                                       player_parties, enemy_parties):
+        enemy_level = min(max(player_level + offset, 1), GameConstants.MAX_LEVEL.value)
+        tasks.append({
+            "map": map_name,
+            "player_party": player_party,
+            "enemy_party": enemy_party,
+            "player_level": player_level,
+            "enemy_level": enemy_level,
+            "battles": battles,
+            "max_turns": max_turns,
+            "seed": seed + len(tasks),
+            "strict": strict,
+        })
+    return tasks
+
+
+def simulate_battle(map_name, player_party, enemy_party, player_level, enemy_level, max_turns=DEFAULT_MAX_TURNS,
+                    strict=True):
+    """Plays one battle with the ai controlling both sides. Returns the engine so callers can read the result"""
+    if map_name not in _maps:
+        _maps[map_name] = MapData(map_name, MAP_COLUMNS, MAP_ROWS)
+    mapData = _maps[map_name]
+    # clear the units of the last battle off the map
+    for index in range(len(mapData.occupied)):
+        if mapData.occupied[index]:
+            mapData.unoccupy(index % mapData.columns, index // mapData.columns)
+
+    participants = [CombatCharacterData(unit_id, unit, player_level, False) for unit_id, unit in enumerate(player_party)]
+    participants += [CombatCharacterData(len(player_party) + unit_id, unit, enemy_level, True)
+                     for unit_id, unit in enumerate(enemy_party)]
+
+    engine = CombatEngine(mapData, participants)
+    engine.spawn_participants()
+    engine.run_battle(max_turns, strict)
+    return engine
+
+
+def run_task(task):
+    """Plays every battle of a task and returns its csv row"""
+    rng = random.Random(task["seed"])
+    wins = losses = unfinished = failed_turns = 0
+    turns = []
+    for _ in range(task["battles"]):
+        # combat rolls use the random module, give every battle its own seed taken from the task
+        random.seed(rng.getrandbits(64))
+        engine = simulate_battle(task["map"], task["player_party"], task["enemy_party"], task["player_level"],
+                                 task["enemy_level"], task["max_turns"], task["strict"])
+        if not engine.game_over:
+            unfinished += 1
+        elif engine.player_won:
+            wins += 1
+        else:
+            losses += 1
+        turns.append(engine.turn_counter)
+        failed_turns += engine.failed_turns
+
+    return {
+        "map": task["map"],
+        "player_party": "/".join(task["player_party"]),
+        "enemy_party": "/".join(task["enemy_party"]),
+        "player_level": task["player_level"],
+        "enemy_level": task["enemy_level"],
+        "battles": task["battles"],
+        "wins": wins,
+        "losses": losses,
+        "unfinished": unfinished,
+        "win_rate": round(wins / task["battles"], 4),
+        "mean_turns": round(sum(turns) / len(turns), 2),
+        "min_turns": min(turns),
+        "max_turns": max(turns),
+        "failed_turns": failed_turns,
+    }
+
+
+def run_sweep(tasks, out_file, workers=None, chunksize=None):
+    """Runs the tasks on a process pool and writes each row to out_file as soon as it is done. Rows are written in
+    task order. Returns the number of rows written.
+    """
+    workers = workers or os.cpu_count() or 1
+    if chunksize is None:
+        # a few chunks per worker keeps every core busy without sending tasks one by one
+        chunksize = max(1, len(tasks) // (workers * 8))
+
+    writer = csv.DictWriter(out_file, fieldnames=CSV_FIELDS)
+    writer.writeheader()
+    rows = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for row in executor.map(run_task, tasks, chunksize=chunksize):
+            writer.writerow(row)
+            out_file.flush()
+            rows += 1
+    return rows
+
+
+def parse_args(argv=None):
+    max_level = GameConstants.MAX_LEVEL.value
+    parser = argparse.ArgumentParser(prog="python -m fenrir.tools.sweep", description=__doc__.split("\n")[2].strip())
+    parser.add_argument("-o", "--output", default="sweep.csv", help="csv file to write, - for stdout")
+    parser.add_argument("--maps", nargs="+", default=list(COMBAT_MAPS), choices=COMBAT_MAPS)
+    parser.add_argument("--levels", nargs="+", type=int, default=list(range(1, max_level + 1)),
+                        choices=range(1, max_level + 1), metavar="LEVEL")
+    parser.add_argument("--level-offsets", nargs="+", type=int, default=[0], metavar="OFFSET",
+                        help="enemy level minus player level, capped to the valid levels (default: 0)")
+    parser.add_argument("--enemy-party", nargs=PARTY_SIZE, choices=UNIT_TYPES, metavar="UNIT",
+                        help="fight every player party against this party instead of every composition")
+    parser.add_argument("--battles", type=int, default=1, help="battles per combination (default: 1)")
+    parser.add_argument("--max-turns", type=int, default=DEFAULT_MAX_TURNS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-failed-turns", action="store_true",
+                        help="skip the turn of an ai that raises and count it instead of stopping the sweep")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: cpu count)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    compositions = party_compositions()
+    enemy_parties = [args.enemy_party] if args.enemy_party else compositions
+    tasks = build_tasks(compositions, enemy_parties, args.levels, args.maps, args.level_offsets, args.battles,
+                        args.max_turns, args.seed, not args.skip_failed_turns)
+
+    start = time.perf_counter()
+    if args.output == "-":
+        rows = run_sweep(tasks, sys.stdout, args.workers)
+    else:
+        with open(args.output, "w", newline="") as out_file:
+            rows = run_sweep(tasks, out_file, args.workers)
+    print("{} combinations, {} battles in {:.1f}s".format(rows, rows * args.battles, time.perf_counter() - start),
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()